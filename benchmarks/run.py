@@ -0,0 +1,327 @@
+"""
+Benchmarks for the wrapper's hot paths.
+
+Measures beatmap loading, difficulty and performance calculation, mod and mods
+collection construction and native handle churn for every ruleset, using the
+beatmaps in tests/resources plus synthetic long versions of them.
+
+Usage:
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --compare baseline.json --threshold 0.10
+
+In comparison mode the process exits with status 1 if any benchmark is slower
+than the baseline by more than the threshold.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from synthetic import make_long_map
+
+from osu_native_py.wrapper.calculators import create_difficulty_calculator
+from osu_native_py.wrapper.calculators import create_performance_calculator
+from osu_native_py.wrapper.objects import Beatmap
+from osu_native_py.wrapper.objects import Mod
+from osu_native_py.wrapper.objects import ModsCollection
+from osu_native_py.wrapper.objects import Ruleset
+from osu_native_py.wrapper.objects import ScoreInfo
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+RESOURCES_DIR = ROOT_DIR / "tests" / "resources"
+
+BEATMAPS: Dict[str, str] = {
+    "osu": "5438072.osu",
+    "taiko": "221923.osu",
+    "catch": "4289411.osu",
+    "mania": "5107047.osu",
+}
+RULESET_IDS: Dict[str, int] = {"osu": 0, "taiko": 1, "catch": 2, "mania": 3}
+MODS: Dict[str, List[str]] = {
+    "osu": ["HD", "DT"],
+    "taiko": ["DT"],
+    "catch": ["HR"],
+    "mania": ["DT"],
+}
+
+
+class Result:
+    def __init__(self, name: str, samples: Sequence[float], unit_ops: int):
+        per_op = [sample / unit_ops for sample in samples]
+        self.name = name
+        self.median = statistics.median(per_op)
+        self.best = min(per_op)
+        self.stdev = statistics.stdev(per_op) if len(per_op) > 1 else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "median_s": self.median,
+            "best_s": self.best,
+            "stdev_s": self.stdev,
+            "ops_per_s": 1.0 / self.median if self.median > 0 else float("inf"),
+        }
+
+
+class Runner:
+    """Collects benchmark results, skipping benchmarks not matching ``name_filter``."""
+
+    def __init__(self, repeat: int, min_time: float, name_filter: Optional[str] = None):
+        self.repeat = repeat
+        self.min_time = min_time
+        self.name_filter = name_filter
+        self.results: List[Result] = []
+
+    def measure(self, name: str, func: Callable[[], Any], unit_ops: int = 1) -> None:
+        """Time ``func``, calibrating the loop count so each sample takes ``min_time``.
+
+        Args:
+            name: The benchmark name.
+            func: The operation to time.
+            unit_ops: How many operations a single call of ``func`` performs.
+        """
+        if self.name_filter and self.name_filter not in name:
+            return
+
+        func()
+
+        number = 1
+        while True:
+            elapsed = self._sample(func, number)
+            if elapsed >= self.min_time or number >= 1 << 20:
+                break
+            number *= 2
+
+        samples = [elapsed] + [self._sample(func, number) for _ in range(self.repeat - 1)]
+        self.results.append(Result(name, samples, number * unit_ops))
+
+    @staticmethod
+    def _sample(func: Callable[[], Any], number: int) -> float:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        return time.perf_counter() - start
+
+
+def _create_mods(acronyms: Sequence[str]) -> ModsCollection:
+    mods = ModsCollection.create()
+    for acronym in acronyms:
+        mods.add(Mod.create(acronym))
+    return mods
+
+
+def _score_for(ruleset: str, max_combo: int) -> ScoreInfo:
+    if ruleset == "mania":
+        return ScoreInfo(accuracy=0.98, max_combo=max_combo, count_perfect=max_combo)
+    return ScoreInfo(accuracy=0.98, max_combo=max_combo, count_great=max_combo)
+
+
+def ruleset_benchmarks(
+    runner: Runner,
+    ruleset_name: str,
+    beatmap_text: str,
+    beatmap_path: Optional[Path],
+    label: str,
+) -> None:
+    prefix = f"{ruleset_name}.{label}"
+
+    if beatmap_path is not None:
+        path = str(beatmap_path)
+        runner.measure(f"{prefix}.from_file", lambda: Beatmap.from_file(path).close())
+    runner.measure(f"{prefix}.from_text", lambda: Beatmap.from_text(beatmap_text).close())
+
+    beatmap = Beatmap.from_text(beatmap_text)
+    ruleset = Ruleset.from_id(RULESET_IDS[ruleset_name])
+    mods = _create_mods(MODS[ruleset_name])
+    difficulty_calculator = create_difficulty_calculator(ruleset, beatmap)
+    performance_calculator = create_performance_calculator(ruleset)
+
+    try:
+        runner.measure(f"{prefix}.difficulty", lambda: difficulty_calculator.calculate(mods))
+
+        attributes = difficulty_calculator.calculate(mods)
+        score = _score_for(ruleset_name, attributes.max_combo)
+        runner.measure(
+            f"{prefix}.performance",
+            lambda: performance_calculator.calculate(ruleset, beatmap, mods, score, attributes),
+        )
+
+        scores = [score] * 100
+        runner.measure(
+            f"{prefix}.performance_many",
+            lambda: performance_calculator.calculate_many(
+                ruleset,
+                beatmap,
+                mods,
+                scores,
+                attributes,
+            ),
+            unit_ops=len(scores),
+        )
+
+        runner.measure(
+            f"{prefix}.difficulty_calculator_lifecycle",
+            lambda: create_difficulty_calculator(ruleset, beatmap).close(),
+        )
+    finally:
+        performance_calculator.close()
+        difficulty_calculator.close()
+        mods.close()
+        ruleset.close()
+        beatmap.close()
+
+
+def object_benchmarks(runner: Runner) -> None:
+    runner.measure("mod.create", lambda: Mod.create("DT").close())
+    runner.measure(
+        "mod.set_setting_float",
+        _with_mod(lambda mod: mod.set_setting_float("speed_change", 1.25)),
+    )
+    runner.measure("mods_collection.create", lambda: ModsCollection.create().close())
+    runner.measure(
+        "mods_collection.create_with_3_mods",
+        lambda: _create_mods(["HD", "HR", "DT"]).close(),
+    )
+    runner.measure("ruleset.lifecycle", lambda: Ruleset.from_id(0).close())
+    runner.measure(
+        "performance_calculator.lifecycle",
+        _with_ruleset(lambda ruleset: create_performance_calculator(ruleset).close()),
+    )
+
+
+def _with_mod(func: Callable[[Mod], Any]) -> Callable[[], Any]:
+    mod = Mod.create("DT")
+    return lambda: func(mod)
+
+
+def _with_ruleset(func: Callable[[Ruleset], Any]) -> Callable[[], Any]:
+    ruleset = Ruleset.from_id(0)
+    return lambda: func(ruleset)
+
+
+def run(
+    repeat: int,
+    min_time: float,
+    long_repeats: int,
+    name_filter: Optional[str] = None,
+) -> Dict[str, Any]:
+    runner = Runner(repeat, min_time, name_filter)
+
+    for ruleset_name, file_name in BEATMAPS.items():
+        path = RESOURCES_DIR / file_name
+        text = path.read_text(encoding="utf-8-sig")
+
+        variants: List[Tuple[str, str, Optional[Path]]] = [("resource", text, path)]
+        if long_repeats > 1:
+            variants.append((f"long_x{long_repeats}", make_long_map(text, long_repeats), None))
+
+        for label, beatmap_text, beatmap_path in variants:
+            ruleset_benchmarks(runner, ruleset_name, beatmap_text, beatmap_path, label)
+
+    object_benchmarks(runner)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "timestamp": time.time(),
+            "repeat": repeat,
+            "min_time": min_time,
+        },
+        "results": {result.name: result.to_dict() for result in runner.results},
+    }
+
+
+def compare(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float,
+) -> List[Tuple[str, float, float, float]]:
+    """Return the benchmarks slower than the baseline by more than ``threshold``.
+
+    Each entry is ``(name, baseline_median_s, current_median_s, relative_change)``.
+    Benchmarks missing from either side are ignored.
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        reference = baseline["results"].get(name)
+        if reference is None or reference["median_s"] <= 0:
+            continue
+
+        change = result["median_s"] / reference["median_s"] - 1.0
+        if change > threshold:
+            regressions.append((name, reference["median_s"], result["median_s"], change))
+
+    return regressions
+
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.3f} {unit}"
+    return f"{seconds / 1e-9:8.1f} ns"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--output", "-o", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="allowed relative slowdown before a benchmark counts as a regression",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="samples per benchmark")
+    parser.add_argument("--min-time", type=float, default=0.2, help="minimum seconds per sample")
+    parser.add_argument(
+        "--long-repeats",
+        type=int,
+        default=20,
+        help="how many times to tile hit objects for the synthetic long maps (1 disables)",
+    )
+    parser.add_argument("--filter", help="only run benchmarks whose name contains this string")
+    args = parser.parse_args(argv)
+
+    current = run(args.repeat, args.min_time, args.long_repeats, args.filter)
+
+    for name, result in current["results"].items():
+        print(f"{name:55} {_format_time(result['median_s'])}  {result['ops_per_s']:12.1f} ops/s")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(current, indent=2) + "\n", encoding="utf-8")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for name, before, after, change in regressions:
+                print(
+                    f"  {name:53} {_format_time(before)} -> {_format_time(after)} (+{change:.1%})"
+                )
+            return 1
+
+        print(f"\nNo regressions beyond {args.threshold:.0%}.")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
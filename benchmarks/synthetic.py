@@ -0,0 +1,107 @@
+"""
+Synthetic long beatmaps for benchmarking.
+
+Long maps are built by tiling the [HitObjects] section of an existing beatmap,
+shifting every repetition past the end of the previous one. The result keeps
+the original ruleset, timing and object mix, just much longer.
+"""
+
+from __future__ import annotations
+
+from typing import List
+from typing import Tuple
+
+_SLIDER = 1 << 1
+_SPINNER = 1 << 3
+_MANIA_HOLD = 1 << 7
+
+
+def _shift_hit_object(line: str, offset: int) -> str:
+    fields = line.split(",")
+    fields[2] = str(int(float(fields[2])) + offset)
+
+    object_type = int(fields[3])
+    if object_type & _SPINNER:
+        fields[5] = str(int(float(fields[5])) + offset)
+    elif object_type & _MANIA_HOLD:
+        end_time, _, rest = fields[5].partition(":")
+        fields[5] = f"{int(float(end_time)) + offset}:{rest}"
+
+    return ",".join(fields)
+
+
+def _slowest_slider_timing(head: str) -> Tuple[float, float]:
+    """Return the longest beat length and the smallest slider velocity of a beatmap.
+
+    Only the hit objects are tiled, so a copied slider can fall under any timing
+    point. Using the slowest combination bounds every slider's duration.
+    """
+    multiplier = 1.4
+    beat_lengths: List[float] = []
+    velocities = [1.0]
+
+    section = ""
+    for line in head.splitlines():
+        line = line.strip()
+        if line.startswith("["):
+            section = line
+        elif section == "[Difficulty]" and line.startswith("SliderMultiplier:"):
+            multiplier = float(line.partition(":")[2])
+        elif section == "[TimingPoints]" and line:
+            fields = line.split(",")
+            beat_length = float(fields[1])
+            uninherited = fields[6] == "1" if len(fields) > 6 else beat_length > 0
+            if uninherited:
+                beat_lengths.append(beat_length)
+            elif beat_length < 0:
+                velocities.append(-100.0 / beat_length)
+
+    return max(beat_lengths, default=1000.0), multiplier * min(velocities)
+
+
+def _end_time(line: str, beat_length: float, velocity: float) -> float:
+    fields = line.split(",")
+    start = float(fields[2])
+    object_type = int(fields[3])
+
+    if object_type & _SLIDER and len(fields) > 7:
+        spans = int(fields[6])
+        return start + float(fields[7]) * spans / (velocity * 100.0) * beat_length
+    if object_type & _SPINNER:
+        return float(fields[5])
+    if object_type & _MANIA_HOLD:
+        return float(fields[5].partition(":")[0])
+    return start
+
+
+def make_long_map(beatmap_text: str, repeats: int, gap: int = 1000) -> str:
+    """Tile the hit objects of a beatmap ``repeats`` times.
+
+    Args:
+        beatmap_text: The content of a .osu file.
+        repeats: How many copies of the hit objects the result should contain.
+        gap: Milliseconds of silence between the end of the last object of one
+            copy, including slider, spinner and hold ends, and the next copy.
+
+    Returns:
+        The content of a .osu file with ``repeats`` times as many hit objects.
+    """
+    head, marker, body = beatmap_text.partition("[HitObjects]")
+    if not marker:
+        raise ValueError("Beatmap has no [HitObjects] section")
+
+    objects = [line.strip() for line in body.splitlines() if line.strip()]
+    if not objects:
+        return beatmap_text
+
+    beat_length, velocity = _slowest_slider_timing(head)
+    first = int(float(objects[0].split(",")[2]))
+    last = max(_end_time(line, beat_length, velocity) for line in objects)
+    period = int(last) + 1 - first + gap
+
+    lines: List[str] = []
+    for repeat in range(repeats):
+        offset = repeat * period
+        lines.extend(_shift_hit_object(line, offset) for line in objects)
+
+    return head + marker + "\n" + "\n".join(lines) + "\n"
@@ -0,0 +1,264 @@
+"""Hit counts that reach a target accuracy.
+
+Performance calculations need judgement counts, but "pp at 98%" displays only
+have an accuracy. The solvers here distribute a beatmap's judgements the same way
+the osu-tools ``simulate`` commands do:
+
+- osu!: 300s, then 100s, then 50s, with Great=6, Ok=2, Meh=1 weights. Every
+  slider tail is hit.
+- osu!taiko: greats and oks, with Great=2, Ok=1 weights.
+- osu!catch: misses are fruits and droplets. The remaining accuracy comes from
+  missed tiny droplets, so their total has to be passed as ``small_ticks``.
+- osu!mania: perfects, then goods, then oks, then mehs, with Perfect=6, Good=4,
+  Ok=2, Meh=1 weights.
+
+The object counts come from the difficulty attributes. For osu!taiko, osu!catch
+and osu!mania that is ``max_combo``. The accuracy in the result is recomputed from
+the chosen counts, so it may differ slightly from the target when the target
+cannot be reached exactly.
+
+Example::
+
+    from osu_native_py.accuracy import scores_for_accuracies
+
+    scores = scores_for_accuracies(diff_attrs, [0.95, 0.98, 1.0])
+    results = perf_calc.calculate_many(ruleset, beatmap, mods, scores, diff_attrs)
+"""
+
+from __future__ import annotations
+
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Type
+
+from .wrapper.attributes import CatchDifficultyAttributes
+from .wrapper.attributes import DifficultyAttributes
+from .wrapper.attributes import ManiaDifficultyAttributes
+from .wrapper.attributes import OsuDifficultyAttributes
+from .wrapper.attributes import TaikoDifficultyAttributes
+from .wrapper.objects import ScoreInfo
+from .wrapper.utils.columnar import import_numpy
+
+
+class _ScalarOps:
+    rint = staticmethod(round)
+    minimum = staticmethod(min)
+    maximum = staticmethod(max)
+
+
+class _ArrayOps:
+    def __init__(self, np: Any):
+        self.np = np
+        self.minimum = np.minimum
+        self.maximum = np.maximum
+
+    def rint(self, value: Any) -> Any:
+        return self.np.rint(value).astype(self.np.int64)
+
+
+def _clip(ops: Any, value: Any, low: Any, high: Any) -> Any:
+    return ops.minimum(ops.maximum(value, low), high)
+
+
+def _solve_osu(ops, attributes: OsuDifficultyAttributes, accuracy, misses, small_ticks):
+    total = judgement_count(attributes)
+    misses = _clip(ops, misses, 0, total)
+    remaining = total - misses
+
+    # Start with every hit as a 50, then upgrade to 300s (+5) and 100s (+1).
+    delta = _clip(ops, ops.rint(accuracy * total * 6) - remaining, 0, remaining * 5)
+    great = delta // 5
+    ok = ops.minimum(delta - great * 5, remaining - great)
+    meh = remaining - great - ok
+
+    counts = {
+        "count_great": great,
+        "count_ok": ok,
+        "count_meh": meh,
+        "count_miss": misses,
+        "count_slider_tail_hit": attributes.slider_count,
+    }
+    return counts, (great * 6 + ok * 2 + meh) / max(total * 6, 1)
+
+
+def _solve_taiko(ops, attributes: TaikoDifficultyAttributes, accuracy, misses, small_ticks):
+    total = judgement_count(attributes)
+    misses = _clip(ops, misses, 0, total)
+    remaining = total - misses
+
+    great = _clip(ops, ops.rint(accuracy * total * 2) - remaining, 0, remaining)
+    ok = remaining - great
+
+    counts = {"count_great": great, "count_ok": ok, "count_miss": misses}
+    return counts, (great * 2 + ok) / max(total * 2, 1)
+
+
+def _solve_catch(ops, attributes: CatchDifficultyAttributes, accuracy, misses, small_ticks):
+    total = judgement_count(attributes)
+    misses = _clip(ops, misses, 0, total)
+    remaining = total - misses
+
+    small_tick_hit = _clip(
+        ops,
+        ops.rint(accuracy * (total + small_ticks)) - remaining,
+        0,
+        small_ticks,
+    )
+
+    counts = {
+        "count_great": remaining,
+        "count_miss": misses,
+        "count_small_tick_hit": small_tick_hit,
+        "count_small_tick_miss": small_ticks - small_tick_hit,
+    }
+    return counts, (remaining + small_tick_hit) / max(total + small_ticks, 1)
+
+
+def _solve_mania(ops, attributes: ManiaDifficultyAttributes, accuracy, misses, small_ticks):
+    total = judgement_count(attributes)
+    misses = _clip(ops, misses, 0, total)
+    remaining = total - misses
+
+    # Start with every hit as a meh, then upgrade to perfects (+5), goods (+3) and oks (+1).
+    delta = _clip(ops, ops.rint(accuracy * total * 6) - remaining, 0, remaining * 5)
+    perfect = delta // 5
+    delta = delta - perfect * 5
+    good = ops.minimum(delta // 3, remaining - perfect)
+    ok = ops.minimum(delta - good * 3, remaining - perfect - good)
+    meh = remaining - perfect - good - ok
+
+    counts = {
+        "count_perfect": perfect,
+        "count_good": good,
+        "count_ok": ok,
+        "count_meh": meh,
+        "count_miss": misses,
+    }
+    return counts, (perfect * 6 + good * 4 + ok * 2 + meh) / max(total * 6, 1)
+
+
+_SOLVERS: List[Tuple[Type[DifficultyAttributes], Callable]] = [
+    (OsuDifficultyAttributes, _solve_osu),
+    (TaikoDifficultyAttributes, _solve_taiko),
+    (CatchDifficultyAttributes, _solve_catch),
+    (ManiaDifficultyAttributes, _solve_mania),
+]
+
+
+def _solver(difficulty_attributes: DifficultyAttributes) -> Callable:
+    for attributes_type, solver in _SOLVERS:
+        if isinstance(difficulty_attributes, attributes_type):
+            return solver
+
+    raise TypeError(f"Unsupported difficulty attributes: {type(difficulty_attributes).__name__}")
+
+
+def judgement_count(difficulty_attributes: DifficultyAttributes) -> int:
+    """Return the number of judgements that can be hit or missed on a beatmap.
+
+    This is the object count for osu! and the max combo for the other rulesets,
+    which excludes osu!catch tiny droplets.
+    """
+    if isinstance(difficulty_attributes, OsuDifficultyAttributes):
+        return (
+            difficulty_attributes.hit_circle_count
+            + difficulty_attributes.slider_count
+            + difficulty_attributes.spinner_count
+        )
+
+    return difficulty_attributes.max_combo
+
+
+def score_for_accuracy(
+    difficulty_attributes: DifficultyAttributes,
+    accuracy: float,
+    misses: int = 0,
+    combo: Optional[int] = None,
+    small_ticks: int = 0,
+) -> ScoreInfo:
+    """Build a score that reaches ``accuracy`` on a beatmap.
+
+    Args:
+        difficulty_attributes: The difficulty attributes of the beatmap.
+        accuracy: The target accuracy (0.0 to 1.0).
+        misses: The number of misses.
+        combo: The maximum combo of the score. Defaults to the beatmap's max combo.
+        small_ticks: The number of tiny droplets in the beatmap (osu!catch only).
+
+    Raises:
+        TypeError: If the difficulty attributes are of an unknown ruleset.
+    """
+    counts, achieved = _solver(difficulty_attributes)(
+        _ScalarOps,
+        difficulty_attributes,
+        min(max(accuracy, 0.0), 1.0),
+        misses,
+        small_ticks,
+    )
+
+    return ScoreInfo(
+        max_combo=difficulty_attributes.max_combo if combo is None else combo,
+        accuracy=achieved,
+        **counts,
+    )
+
+
+def scores_for_accuracies(
+    difficulty_attributes: DifficultyAttributes,
+    accuracies: Iterable[float],
+    misses: int = 0,
+    combo: Optional[int] = None,
+    small_ticks: int = 0,
+) -> List[ScoreInfo]:
+    """Build one score per target accuracy. See :func:`score_for_accuracy`."""
+    return [
+        score_for_accuracy(difficulty_attributes, accuracy, misses, combo, small_ticks)
+        for accuracy in accuracies
+    ]
+
+
+def score_columns_for_accuracies(
+    difficulty_attributes: DifficultyAttributes,
+    accuracies: Any,
+    misses: Any = 0,
+    combo: Any = None,
+    small_ticks: int = 0,
+) -> Dict[str, Any]:
+    """Build scores for many target accuracies at once, as NumPy columns.
+
+    ``accuracies``, ``misses`` and ``combo`` may be arrays or scalars and are
+    broadcast against each other. The result can be passed straight to
+    :meth:`~osu_native_py.wrapper.calculators.PerformanceCalculator.calculate_columns`.
+
+    Returns:
+        An array per ``ScoreInfo`` field that the ruleset uses, plus ``max_combo``
+        and ``accuracy``.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+        TypeError: If the difficulty attributes are of an unknown ruleset.
+    """
+    np = import_numpy()
+    solver = _solver(difficulty_attributes)
+
+    if combo is None:
+        combo = difficulty_attributes.max_combo
+
+    accuracies, misses, combo = np.broadcast_arrays(
+        np.clip(np.asarray(accuracies, dtype=np.float64), 0.0, 1.0),
+        np.asarray(misses, dtype=np.int64),
+        np.asarray(combo, dtype=np.int64),
+    )
+
+    counts, achieved = solver(_ArrayOps(np), difficulty_attributes, accuracies, misses, small_ticks)
+
+    columns = {"max_combo": combo.copy(), "accuracy": np.asarray(achieved, dtype=np.float64)}
+    for name, value in counts.items():
+        columns[name] = np.broadcast_to(np.asarray(value, dtype=np.int64), accuracies.shape).copy()
+
+    return columns
@@ -0,0 +1,132 @@
+"""Difficulty of a beatmap in every ruleset it converts to.
+
+:func:`calculate_all_rulesets` calculates converted star ratings from a single
+parsed :class:`Beatmap`, with one ruleset and difficulty calculator per target
+ruleset. Each ruleset gets its own mods, and a failure in one ruleset, such as a
+mod that does not exist there, is reported for that ruleset without affecting
+the others.
+
+Example::
+
+    from osu_native_py.converts import calculate_all_rulesets
+
+    with Beatmap.from_file("map.osu") as beatmap:
+        results = calculate_all_rulesets(beatmap, {0: ["HD", "DT"], 1: ["DT"], 3: ["4K"]})
+
+    for ruleset_id, result in results.items():
+        print(ruleset_id, result.attributes.star_rating if result.ok else result.error)
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+from typing import Mapping
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+
+from .wrapper.attributes import DifficultyAttributes
+from .wrapper.calculators import create_difficulty_calculator
+from .wrapper.objects import Beatmap
+from .wrapper.objects import Mod
+from .wrapper.objects import ModsCollection
+from .wrapper.objects import Ruleset
+
+ALL_RULESETS = (0, 1, 2, 3)
+
+
+class RulesetResult(NamedTuple):
+    """The difficulty of a beatmap in one ruleset.
+
+    Attributes:
+        ruleset_id: The ruleset calculated in.
+        attributes: The difficulty attributes, or None if the calculation failed.
+        error: Why the calculation failed, or None if it succeeded.
+    """
+
+    ruleset_id: int
+    attributes: Optional[DifficultyAttributes]
+    error: Optional[str]
+
+    @property
+    def ok(self) -> bool:
+        """Whether the calculation succeeded."""
+        return self.error is None
+
+
+def calculate_all_rulesets(
+    beatmap: Beatmap,
+    mods_by_ruleset: Optional[Mapping[int, Sequence[str]]] = None,
+    max_workers: int = 1,
+) -> Dict[int, RulesetResult]:
+    """Calculate the difficulty of a beatmap in several rulesets.
+
+    Args:
+        beatmap: The beatmap, parsed once and shared by every calculator.
+        mods_by_ruleset: The mod acronyms to calculate with, keyed by ruleset ID.
+            Its keys select the rulesets. Defaults to no mods in every ruleset the
+            beatmap can be played in: all four for osu! beatmaps, otherwise only
+            the beatmap's own ruleset.
+        max_workers: The number of rulesets calculated at once on separate
+            threads. Every ruleset has its own native calculator; only the beatmap
+            is shared.
+
+    Returns:
+        One result per ruleset, in ascending ruleset order. Beatmaps that are not
+        osu! beatmaps only convert to their own ruleset, so other rulesets are
+        reported as failed without a native call.
+
+    Raises:
+        RuntimeError: If the beatmap is closed.
+        ValueError: If a ruleset ID is not 0-3 or ``max_workers`` is not positive.
+    """
+    beatmap_ruleset = beatmap.ruleset_id
+
+    if mods_by_ruleset is None:
+        rulesets = ALL_RULESETS if beatmap_ruleset == 0 else (beatmap_ruleset,)
+        mods_by_ruleset = {ruleset_id: () for ruleset_id in rulesets}
+
+    unknown = sorted(set(mods_by_ruleset) - set(ALL_RULESETS))
+    if unknown:
+        raise ValueError(f"Unsupported ruleset IDs: {unknown}")
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+
+    def calculate(ruleset_id: int) -> RulesetResult:
+        if beatmap_ruleset != 0 and ruleset_id != beatmap_ruleset:
+            return RulesetResult(
+                ruleset_id,
+                None,
+                f"ruleset {beatmap_ruleset} beatmaps cannot be converted to ruleset {ruleset_id}",
+            )
+
+        try:
+            return RulesetResult(
+                ruleset_id,
+                _calculate(beatmap, ruleset_id, mods_by_ruleset[ruleset_id]),
+                None,
+            )
+        except RuntimeError as e:
+            return RulesetResult(ruleset_id, None, str(e))
+
+    ruleset_ids = sorted(mods_by_ruleset)
+    if max_workers == 1 or len(ruleset_ids) == 1:
+        results = [calculate(ruleset_id) for ruleset_id in ruleset_ids]
+    else:
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(ruleset_ids)),
+            thread_name_prefix="osu-native-convert",
+        ) as executor:
+            results = list(executor.map(calculate, ruleset_ids))
+
+    return {result.ruleset_id: result for result in results}
+
+
+def _calculate(beatmap: Beatmap, ruleset_id: int, acronyms: Sequence[str]) -> DifficultyAttributes:
+    with Ruleset.from_id(ruleset_id) as ruleset, ModsCollection.create() as mods:
+        for acronym in acronyms:
+            mods.add(Mod.create(acronym))
+
+        with create_difficulty_calculator(ruleset, beatmap) as calculator:
+            return calculator.calculate(mods)
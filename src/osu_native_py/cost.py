@@ -0,0 +1,179 @@
+"""Cheap estimates of how expensive a beatmap is to calculate.
+
+Difficulty calculation time grows with the number of hit objects, the nested
+objects of sliders (repeats and ticks) and the number of strain sections, which
+follows the drain length. None of these are exposed by the native beatmap, so
+they are read with a single streaming scan of the .osu text that only looks at
+``[Events]`` breaks and ``[HitObjects]``, without parsing anything natively.
+
+The resulting :attr:`BeatmapCost.cost` is in rough "hit object" units: a typical
+ranked map is a few thousand, marathons and aspire maps go far beyond
+:data:`DEFAULT_HEAVY_COST`. Use it to route work, not to predict timings.
+
+Example::
+
+    from osu_native_py.cost import estimate_file_cost
+
+    cost = estimate_file_cost("map.osu")
+    if cost.is_heavy():
+        ...
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterable
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from .wrapper.objects import Beatmap
+
+DEFAULT_HEAVY_COST = 20000.0
+
+# Weights of the cost model.
+SPAN_WEIGHT = 1.0
+TICK_DISTANCE = 100.0
+SECTION_LENGTH = 400.0
+
+_SLIDER = 1 << 1
+_SPINNER = 1 << 3
+_HOLD = 1 << 7
+
+
+class BeatmapCost(NamedTuple):
+    """The size of a beatmap and its estimated calculation cost.
+
+    Attributes:
+        hit_objects: The number of hit objects.
+        sliders: The number of sliders.
+        spinners: The number of spinners.
+        holds: The number of osu!mania hold notes.
+        slider_spans: The total number of slider spans (one plus the repeats).
+        slider_length: The total path length of all slider spans in osu! pixels.
+        drain_length: The time from the first to the last hit object, minus
+            breaks, in milliseconds.
+        cost: The estimated calculation cost.
+    """
+
+    hit_objects: int
+    sliders: int
+    spinners: int
+    holds: int
+    slider_spans: int
+    slider_length: float
+    drain_length: float
+    cost: float
+
+    @property
+    def slider_density(self) -> float:
+        """The fraction of hit objects that are sliders."""
+        return self.sliders / self.hit_objects if self.hit_objects else 0.0
+
+    def is_heavy(self, threshold: float = DEFAULT_HEAVY_COST) -> bool:
+        """Whether the cost reaches ``threshold``."""
+        return self.cost >= threshold
+
+
+def scan_cost(lines: Iterable[str]) -> BeatmapCost:
+    """Estimate the cost of a beatmap from the lines of its .osu text.
+
+    Lines that cannot be parsed are skipped.
+    """
+    section = ""
+    breaks: List[Tuple[float, float]] = []
+    hit_objects = sliders = spinners = holds = spans = 0
+    slider_length = 0.0
+    first: Optional[float] = None
+    last: Optional[float] = None
+
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("//"):
+            continue
+        if line.startswith("["):
+            section = line
+            continue
+
+        if section == "[HitObjects]":
+            parts = line.split(",", 8)
+            if len(parts) < 4:
+                continue
+
+            try:
+                time = float(parts[2])
+                kind = int(parts[3])
+                if kind & _SLIDER and len(parts) >= 8:
+                    slides = int(parts[6])
+                    length = float(parts[7])
+            except ValueError:
+                continue
+
+            hit_objects += 1
+            first = time if first is None else min(first, time)
+            last = time if last is None else max(last, time)
+
+            if kind & _SLIDER and len(parts) >= 8:
+                sliders += 1
+                spans += slides
+                slider_length += length * slides
+            elif kind & _SPINNER:
+                spinners += 1
+            elif kind & _HOLD:
+                holds += 1
+        elif section == "[Events]" and (line.startswith("2,") or line.startswith("Break,")):
+            parts = line.split(",")
+            if len(parts) >= 3:
+                try:
+                    breaks.append((float(parts[1]), float(parts[2])))
+                except ValueError:
+                    continue
+
+    drain_length = 0.0
+    if first is not None and last is not None:
+        drain_length = last - first
+        drain_length -= sum(max(min(end, last) - max(start, first), 0.0) for start, end in breaks)
+
+    cost = (
+        hit_objects
+        + SPAN_WEIGHT * spans
+        + slider_length / TICK_DISTANCE
+        + max(drain_length, 0.0) / SECTION_LENGTH
+    )
+    return BeatmapCost(
+        hit_objects,
+        sliders,
+        spinners,
+        holds,
+        spans,
+        slider_length,
+        max(drain_length, 0.0),
+        cost,
+    )
+
+
+def estimate_text_cost(text: str) -> BeatmapCost:
+    """Estimate the cost of a beatmap from its .osu content."""
+    return scan_cost(text.splitlines())
+
+
+def estimate_file_cost(path: Union[str, Path]) -> BeatmapCost:
+    """Estimate the cost of a .osu file, streaming it line by line.
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    with open(path, encoding="utf-8-sig", errors="replace") as f:
+        return scan_cost(f)
+
+
+def estimate_cost(beatmap: Beatmap) -> BeatmapCost:
+    """Estimate the cost of a beatmap from the text it was loaded from.
+
+    Raises:
+        OSError: If the beatmap's file can no longer be read.
+        RuntimeError: If the beatmap was not loaded through from_file or from_text.
+    """
+    return estimate_text_cost(beatmap.text())
@@ -0,0 +1,355 @@
+"""Performance as a function of accuracy and miss count.
+
+:func:`performance_curve` evaluates a grid of accuracies and miss counts.
+:func:`accuracy_for_performance` and :func:`misses_for_performance` go the other
+way and search for the accuracy or miss count that reaches a target pp.
+
+Example::
+
+    from osu_native_py.curve import accuracy_for_performance
+    from osu_native_py.curve import performance_curve
+
+    curve = performance_curve(ruleset, beatmap, mods, diff_attrs, misses=(0, 1))
+    for accuracy, misses, pp in curve.rows():
+        print(f"{accuracy:.0%} {misses}x: {pp:.2f}pp")
+
+    needed = accuracy_for_performance(ruleset, beatmap, mods, diff_attrs, 300.0)
+    print(needed.value, needed.evaluations)
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import astuple
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from .accuracy import judgement_count
+from .accuracy import score_for_accuracy
+from .wrapper.attributes import DifficultyAttributes
+from .wrapper.attributes import PerformanceAttributes
+from .wrapper.calculators import PerformanceCalculator
+from .wrapper.calculators import create_performance_calculator
+from .wrapper.objects import Beatmap
+from .wrapper.objects import ModsCollection
+from .wrapper.objects import Ruleset
+from .wrapper.objects import ScoreInfo
+
+DEFAULT_ACCURACIES = (0.95, 0.97, 0.98, 0.99, 1.0)
+
+
+class PerformanceCurve:
+    """Performance results for every (misses, accuracy) pair of a grid.
+
+    Attributes:
+        accuracies: The target accuracies, in the order given.
+        misses: The miss counts, in the order given.
+        results: The performance attributes, ordered by miss count and then by accuracy.
+    """
+
+    __slots__ = ("accuracies", "misses", "results")
+
+    def __init__(
+        self,
+        accuracies: Tuple[float, ...],
+        misses: Tuple[int, ...],
+        results: List[PerformanceAttributes],
+    ):
+        self.accuracies = accuracies
+        self.misses = misses
+        self.results = results
+
+    def get(self, accuracy: float, misses: int = 0) -> PerformanceAttributes:
+        """Return the performance attributes at a grid point.
+
+        Raises:
+            KeyError: If the accuracy or miss count is not part of the grid.
+        """
+        try:
+            column = self.accuracies.index(accuracy)
+            row = self.misses.index(misses)
+        except ValueError:
+            raise KeyError((accuracy, misses)) from None
+
+        return self.results[row * len(self.accuracies) + column]
+
+    def total(self, accuracy: float, misses: int = 0) -> float:
+        """Return the total pp at a grid point. See :meth:`get`."""
+        return self.get(accuracy, misses).total
+
+    def totals(self) -> List[List[float]]:
+        """Return the total pp as one row per miss count."""
+        width = len(self.accuracies)
+        return [
+            [attributes.total for attributes in self.results[start : start + width]]
+            for start in range(0, len(self.results), width)
+        ]
+
+    def rows(self) -> Iterator[Tuple[float, int, float]]:
+        """Yield ``(accuracy, misses, total pp)`` for each grid point."""
+        results = iter(self.results)
+        for misses in self.misses:
+            for accuracy in self.accuracies:
+                yield accuracy, misses, next(results).total
+
+    def to_dict(self) -> Dict[str, list]:
+        """Return the grid as ``accuracies``, ``misses`` and a ``total`` row per miss count."""
+        return {
+            "accuracies": list(self.accuracies),
+            "misses": list(self.misses),
+            "total": self.totals(),
+        }
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def __repr__(self) -> str:
+        return f"<PerformanceCurve accuracies={len(self.accuracies)} misses={len(self.misses)}>"
+
+
+def performance_curve(
+    ruleset: Ruleset,
+    beatmap: Beatmap,
+    mods: ModsCollection,
+    difficulty_attributes: DifficultyAttributes,
+    accuracies: Sequence[float] = DEFAULT_ACCURACIES,
+    misses: Sequence[int] = (0,),
+    combo: Optional[int] = None,
+    small_ticks: int = 0,
+    calculator: Optional[PerformanceCalculator] = None,
+) -> PerformanceCurve:
+    """Calculate performance for every combination of accuracy and miss count.
+
+    Hit counts are derived with :func:`osu_native_py.accuracy.score_for_accuracy`,
+    and the whole grid is evaluated in a single ``calculate_many`` pass, so the
+    native difficulty structure is built once.
+
+    Args:
+        ruleset: The ruleset for the beatmap.
+        beatmap: The beatmap.
+        mods: The mods to apply to the beatmap.
+        difficulty_attributes: The difficulty attributes for the beatmap and mods.
+        accuracies: The target accuracies (0.0 to 1.0).
+        misses: The miss counts.
+        combo: The maximum combo of every score. Defaults to the beatmap's max combo.
+        small_ticks: The number of tiny droplets in the beatmap (osu!catch only).
+        calculator: A performance calculator to reuse. One is created for the call
+            when not given.
+
+    Returns:
+        The results of the grid.
+
+    Raises:
+        TypeError: If the difficulty attributes do not match the ruleset.
+        RuntimeError: If a calculation fails.
+    """
+    accuracies = tuple(accuracies)
+    misses = tuple(misses)
+    scores = [
+        score_for_accuracy(difficulty_attributes, accuracy, miss_count, combo, small_ticks)
+        for miss_count in misses
+        for accuracy in accuracies
+    ]
+
+    with _calculator(ruleset, calculator) as active:
+        results = active.calculate_many(ruleset, beatmap, mods, scores, difficulty_attributes)
+
+    return PerformanceCurve(accuracies, misses, results)
+
+
+class InverseSolution(NamedTuple):
+    """The result of an inverse performance search.
+
+    Attributes:
+        value: The accuracy or miss count found, or None if the target cannot be
+            reached.
+        score: The score at ``value``, or the best score tried if the target cannot
+            be reached.
+        performance: The performance of ``score``.
+        evaluations: The number of performance calculations run.
+        converged: Whether the search reached its tolerance within the iteration cap.
+    """
+
+    value: Optional[float]
+    score: ScoreInfo
+    performance: PerformanceAttributes
+    evaluations: int
+    converged: bool
+
+
+def accuracy_for_performance(
+    ruleset: Ruleset,
+    beatmap: Beatmap,
+    mods: ModsCollection,
+    difficulty_attributes: DifficultyAttributes,
+    target: float,
+    misses: int = 0,
+    combo: Optional[int] = None,
+    small_ticks: int = 0,
+    tolerance: float = 1e-4,
+    max_iterations: int = 30,
+    calculator: Optional[PerformanceCalculator] = None,
+) -> InverseSolution:
+    """Find the lowest accuracy that reaches ``target`` pp.
+
+    Performance does not decrease with accuracy, so the accuracy is bisected
+    between 0 and 1. Accuracies that map to the same hit counts are only
+    calculated once.
+
+    Args:
+        ruleset: The ruleset for the beatmap.
+        beatmap: The beatmap.
+        mods: The mods to apply to the beatmap.
+        difficulty_attributes: The difficulty attributes for the beatmap and mods.
+        target: The performance to reach, in pp.
+        misses: The number of misses.
+        combo: The maximum combo. Defaults to the beatmap's max combo.
+        small_ticks: The number of tiny droplets in the beatmap (osu!catch only).
+        tolerance: Stop once the bracket is narrower than this accuracy.
+        max_iterations: The maximum number of bisection steps.
+        calculator: A performance calculator to reuse. One is created for the call
+            when not given.
+
+    Returns:
+        The accuracy found (as achieved by the hit counts), or a solution with a
+        ``value`` of None if even 100% accuracy does not reach ``target``.
+
+    Raises:
+        TypeError: If the difficulty attributes do not match the ruleset.
+        RuntimeError: If a calculation fails.
+    """
+    with _calculator(ruleset, calculator) as active:
+        evaluate = _Evaluator(active.prepare(ruleset, beatmap, mods, difficulty_attributes))
+
+        def score_at(accuracy: float) -> ScoreInfo:
+            return score_for_accuracy(difficulty_attributes, accuracy, misses, combo, small_ticks)
+
+        high, low = 1.0, 0.0
+        high_score = score_at(high)
+        high_perf = evaluate(high_score)
+        if high_perf.total < target:
+            return InverseSolution(None, high_score, high_perf, evaluate.count, True)
+
+        low_score = score_at(low)
+        low_perf = evaluate(low_score)
+        if low_perf.total >= target:
+            return InverseSolution(low_score.accuracy, low_score, low_perf, evaluate.count, True)
+
+        iterations = 0
+        while high - low > tolerance and iterations < max_iterations:
+            middle = (low + high) / 2
+            score = score_at(middle)
+            performance = evaluate(score)
+            if performance.total >= target:
+                high, high_score, high_perf = middle, score, performance
+            else:
+                low = middle
+            iterations += 1
+
+    return InverseSolution(
+        high_score.accuracy,
+        high_score,
+        high_perf,
+        evaluate.count,
+        high - low <= tolerance,
+    )
+
+
+def misses_for_performance(
+    ruleset: Ruleset,
+    beatmap: Beatmap,
+    mods: ModsCollection,
+    difficulty_attributes: DifficultyAttributes,
+    target: float,
+    accuracy: float = 1.0,
+    combo: Optional[int] = None,
+    small_ticks: int = 0,
+    max_iterations: int = 30,
+    calculator: Optional[PerformanceCalculator] = None,
+) -> InverseSolution:
+    """Find the most misses that still reach ``target`` pp at an accuracy.
+
+    Performance does not increase with misses, so the miss count is binary
+    searched between 0 and the number of judgements on the beatmap.
+
+    Args:
+        ruleset: The ruleset for the beatmap.
+        beatmap: The beatmap.
+        mods: The mods to apply to the beatmap.
+        difficulty_attributes: The difficulty attributes for the beatmap and mods.
+        target: The performance to reach, in pp.
+        accuracy: The target accuracy of every score tried.
+        combo: The maximum combo. Defaults to the beatmap's max combo.
+        small_ticks: The number of tiny droplets in the beatmap (osu!catch only).
+        max_iterations: The maximum number of search steps.
+        calculator: A performance calculator to reuse. One is created for the call
+            when not given.
+
+    Returns:
+        The miss count found, or a solution with a ``value`` of None if even a
+        score without misses does not reach ``target``.
+
+    Raises:
+        TypeError: If the difficulty attributes do not match the ruleset.
+        RuntimeError: If a calculation fails.
+    """
+    with _calculator(ruleset, calculator) as active:
+        evaluate = _Evaluator(active.prepare(ruleset, beatmap, mods, difficulty_attributes))
+
+        def score_at(misses: int) -> ScoreInfo:
+            return score_for_accuracy(difficulty_attributes, accuracy, misses, combo, small_ticks)
+
+        low, high = 0, judgement_count(difficulty_attributes)
+        low_score = score_at(low)
+        low_perf = evaluate(low_score)
+        if low_perf.total < target:
+            return InverseSolution(None, low_score, low_perf, evaluate.count, True)
+
+        iterations = 0
+        while low < high and iterations < max_iterations:
+            middle = (low + high + 1) // 2
+            score = score_at(middle)
+            performance = evaluate(score)
+            if performance.total >= target:
+                low, low_score, low_perf = middle, score, performance
+            else:
+                high = middle - 1
+            iterations += 1
+
+    return InverseSolution(low, low_score, low_perf, evaluate.count, low == high)
+
+
+class _Evaluator:
+    """Calculates performance, skipping scores that were already calculated."""
+
+    def __init__(self, calculate: Callable[[ScoreInfo], PerformanceAttributes]):
+        self.calculate = calculate
+        self.count = 0
+        self._results: Dict[tuple, PerformanceAttributes] = {}
+
+    def __call__(self, score: ScoreInfo) -> PerformanceAttributes:
+        key = astuple(score)
+        result = self._results.get(key)
+        if result is None:
+            result = self._results[key] = self.calculate(score)
+            self.count += 1
+        return result
+
+
+@contextmanager
+def _calculator(
+    ruleset: Ruleset,
+    calculator: Optional[PerformanceCalculator],
+) -> Iterator[PerformanceCalculator]:
+    if calculator is not None:
+        yield calculator
+        return
+
+    with create_performance_calculator(ruleset) as owned:
+        yield owned
@@ -0,0 +1,231 @@
+"""Fast pure-Python indexing of .osu files.
+
+Only the [General], [Metadata] and [Difficulty] sections are parsed, and the
+[HitObjects] section is counted without being decoded, so no native beatmap is
+ever built. Field names match the properties of
+:class:`~osu_native_py.wrapper.objects.Beatmap`.
+
+Example::
+
+    from osu_native_py import index
+
+    for entry in index.scan_directory("/path/to/songs"):
+        print(entry.beatmap_id, entry.md5, entry.hit_object_count)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+from pathlib import Path
+from typing import Dict
+from typing import Iterator
+from typing import NamedTuple
+from typing import Optional
+from typing import Union
+
+_SECTION_HEADER = re.compile(rb"^[ \t]*\[([A-Za-z]+)\][ \t]*\r?$", re.MULTILINE)
+_FORMAT_HEADER = b"osu file format v"
+
+_CIRCLE = 1 << 0
+_SLIDER = 1 << 1
+_SPINNER = 1 << 3
+_MANIA_HOLD = 1 << 7
+
+
+class BeatmapIndexEntry(NamedTuple):
+    """Header fields and object counts of a .osu file.
+
+    Attributes:
+        path: The file the entry was read from, if any.
+        md5: The MD5 checksum of the file contents, as used by osu!.
+        title: The title of the beatmap.
+        artist: The artist of the beatmap.
+        version: The difficulty name/version of the beatmap.
+        beatmap_id: The online beatmap ID, or -1 if not set.
+        beatmap_set_id: The online beatmap set ID, or -1 if not set.
+        ruleset_id: The ruleset ID (0=osu!, 1=taiko, 2=catch, 3=mania).
+        approach_rate: The approach rate (AR). Defaults to the OD for old files.
+        drain_rate: The HP drain rate.
+        overall_difficulty: The overall difficulty (OD).
+        circle_size: The circle size (CS).
+        slider_multiplier: The slider velocity multiplier.
+        slider_tick_rate: The slider tick rate.
+        hit_object_count: The number of hit objects.
+        circle_count: The number of hit circles (notes in osu!mania).
+        slider_count: The number of sliders.
+        spinner_count: The number of spinners.
+        hold_count: The number of osu!mania hold notes.
+    """
+
+    path: Optional[str]
+    md5: str
+    title: str
+    artist: str
+    version: str
+    beatmap_id: int
+    beatmap_set_id: int
+    ruleset_id: int
+    approach_rate: float
+    drain_rate: float
+    overall_difficulty: float
+    circle_size: float
+    slider_multiplier: float
+    slider_tick_rate: float
+    hit_object_count: int
+    circle_count: int
+    slider_count: int
+    spinner_count: int
+    hold_count: int
+
+
+def _sections(data: bytes) -> Dict[str, bytes]:
+    sections: Dict[str, bytes] = {}
+    matches = list(_SECTION_HEADER.finditer(data))
+
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(data)
+        sections.setdefault(match.group(1).decode("ascii"), data[match.end() : end])
+
+    return sections
+
+
+def _key_values(section: bytes) -> Dict[str, str]:
+    pairs: Dict[str, str] = {}
+
+    for raw_line in section.decode("utf-8", errors="replace").splitlines():
+        line = raw_line.strip()
+        if not line or line.startswith("//"):
+            continue
+
+        key, separator, value = line.partition(":")
+        if separator:
+            pairs[key.strip()] = value.strip()
+
+    return pairs
+
+
+def _float(pairs: Dict[str, str], key: str, default: float) -> float:
+    try:
+        return float(pairs[key])
+    except (KeyError, ValueError):
+        return default
+
+
+def _int(pairs: Dict[str, str], key: str, default: int) -> int:
+    try:
+        return int(pairs[key])
+    except (KeyError, ValueError):
+        return default
+
+
+def _count_hit_objects(section: bytes):
+    circles = sliders = spinners = holds = 0
+
+    for line in section.splitlines():
+        fields = line.split(b",", 4)
+        if len(fields) < 4:
+            continue
+
+        try:
+            object_type = int(fields[3])
+        except ValueError:
+            continue
+
+        if object_type & _CIRCLE:
+            circles += 1
+        elif object_type & _SLIDER:
+            sliders += 1
+        elif object_type & _SPINNER:
+            spinners += 1
+        elif object_type & _MANIA_HOLD:
+            holds += 1
+
+    return circles, sliders, spinners, holds
+
+
+def scan_bytes(data: bytes, path: Optional[str] = None) -> BeatmapIndexEntry:
+    """Index the contents of a .osu file.
+
+    Args:
+        data: The raw contents of the file.
+        path: The path to record in the entry.
+
+    Returns:
+        The header fields and object counts of the beatmap.
+
+    Raises:
+        ValueError: If the data is not a .osu file.
+    """
+    md5 = hashlib.md5(data).hexdigest()
+
+    header = data[:64].lstrip(b"\xef\xbb\xbf").lstrip()
+    if not header.startswith(_FORMAT_HEADER):
+        raise ValueError(f"Not a .osu file: {path or '<bytes>'}")
+
+    sections = _sections(data)
+    general = _key_values(sections.get("General", b""))
+    metadata = _key_values(sections.get("Metadata", b""))
+    difficulty = _key_values(sections.get("Difficulty", b""))
+    circles, sliders, spinners, holds = _count_hit_objects(sections.get("HitObjects", b""))
+
+    overall_difficulty = _float(difficulty, "OverallDifficulty", 5.0)
+
+    return BeatmapIndexEntry(
+        path=path,
+        md5=md5,
+        title=metadata.get("Title", ""),
+        artist=metadata.get("Artist", ""),
+        version=metadata.get("Version", ""),
+        beatmap_id=_int(metadata, "BeatmapID", -1),
+        beatmap_set_id=_int(metadata, "BeatmapSetID", -1),
+        ruleset_id=_int(general, "Mode", 0),
+        approach_rate=_float(difficulty, "ApproachRate", overall_difficulty),
+        drain_rate=_float(difficulty, "HPDrainRate", 5.0),
+        overall_difficulty=overall_difficulty,
+        circle_size=_float(difficulty, "CircleSize", 5.0),
+        slider_multiplier=_float(difficulty, "SliderMultiplier", 1.4),
+        slider_tick_rate=_float(difficulty, "SliderTickRate", 1.0),
+        hit_object_count=circles + sliders + spinners + holds,
+        circle_count=circles,
+        slider_count=sliders,
+        spinner_count=spinners,
+        hold_count=holds,
+    )
+
+
+def scan_file(path: Union[str, os.PathLike]) -> BeatmapIndexEntry:
+    """Index a .osu file.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file is not a .osu file.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    return scan_bytes(data, os.fspath(path))
+
+
+def scan_directory(
+    directory: Union[str, os.PathLike],
+    pattern: str = "**/*.osu",
+    skip_errors: bool = True,
+) -> Iterator[BeatmapIndexEntry]:
+    """Index every .osu file below a directory.
+
+    Args:
+        directory: The directory to scan.
+        pattern: The glob pattern selecting files, relative to ``directory``.
+        skip_errors: Whether to skip unreadable or invalid files instead of raising.
+
+    Yields:
+        One entry per file, in no particular order.
+    """
+    for path in Path(directory).glob(pattern):
+        try:
+            yield scan_file(path)
+        except (OSError, ValueError):
+            if not skip_errors:
+                raise
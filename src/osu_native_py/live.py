@@ -0,0 +1,281 @@
+"""Live performance of a score that is still being played.
+
+:class:`LivePerformanceSession` keeps one native score structure per play and
+updates it in place as judgements arrive. Everything that does not change
+during the play is prepared once: the difficulty attributes and their native
+structure, the ruleset, beatmap and mods handles, and the result structure. Each
+judgement then costs a few field writes and one native performance call, with
+no ``ScoreInfo`` objects or ``to_native`` conversions.
+
+Accuracy is kept as running weighted sums, and combo is tracked from the
+judgements, so both are O(1) per update. A session holds a fixed set of fields
+and no history, so its memory does not grow with the length of the play.
+
+Example::
+
+    from osu_native_py.live import LivePerformanceSession
+
+    with LivePerformanceSession(ruleset, beatmap, mods) as session:
+        for judgement in spectator_events:  # "great", "ok", "miss", ...
+            pp = session.judge(judgement)
+"""
+
+from __future__ import annotations
+
+from ctypes import byref
+from dataclasses import fields
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+from .wrapper.attributes import DifficultyAttributes
+from .wrapper.attributes import PerformanceAttributes
+from .wrapper.calculators import PerformanceCalculator
+from .wrapper.calculators import create_difficulty_calculator
+from .wrapper.calculators import create_performance_calculator
+from .wrapper.objects import Beatmap
+from .wrapper.objects import ModsCollection
+from .wrapper.objects import Ruleset
+from .wrapper.objects import ScoreInfo
+from .wrapper.utils.columnar import native_field_name
+
+_SCORE_FIELDS = tuple(
+    field.name for field in fields(ScoreInfo) if field.name != "legacy_total_score"
+)
+
+# Combo effect of a judgement.
+_KEEP, _INCREASE, _BREAK = 0, 1, 2
+
+# Per ruleset: judgement -> (accuracy weight, accuracy maximum, combo effect). The
+# weights follow the ScoreInfo accuracy used elsewhere in the package.
+_RULES: Dict[int, Dict[str, Tuple[int, int, int]]] = {
+    0: {
+        "great": (6, 6, _INCREASE),
+        "ok": (2, 6, _INCREASE),
+        "meh": (1, 6, _INCREASE),
+        "miss": (0, 6, _BREAK),
+        "large_tick_hit": (0, 0, _INCREASE),
+        "large_tick_miss": (0, 0, _BREAK),
+        "slider_tail_hit": (0, 0, _INCREASE),
+    },
+    1: {
+        "great": (2, 2, _INCREASE),
+        "ok": (1, 2, _INCREASE),
+        "miss": (0, 2, _BREAK),
+    },
+    2: {
+        "great": (1, 1, _INCREASE),
+        "large_tick_hit": (1, 1, _INCREASE),
+        "small_tick_hit": (1, 1, _KEEP),
+        "miss": (0, 1, _BREAK),
+        "large_tick_miss": (0, 1, _BREAK),
+        "small_tick_miss": (0, 1, _KEEP),
+    },
+    3: {
+        "perfect": (6, 6, _INCREASE),
+        "great": (6, 6, _INCREASE),
+        "good": (4, 6, _INCREASE),
+        "ok": (2, 6, _INCREASE),
+        "meh": (1, 6, _INCREASE),
+        "miss": (0, 6, _BREAK),
+    },
+}
+
+
+class LivePerformanceSession:
+    """The running performance of one score, updated judgement by judgement.
+
+    Sessions on the same beatmap and mods can share ``difficulty_attributes``,
+    and sessions used from the same thread can share a ``calculator``.
+
+    Args:
+        ruleset: The ruleset the score is played in.
+        beatmap: The beatmap being played.
+        mods: The mods of the score.
+        difficulty_attributes: The difficulty attributes for the beatmap and mods.
+            Calculated once when not given.
+        calculator: The performance calculator to use. One is created and owned
+            by the session when not given.
+
+    Raises:
+        TypeError: If the difficulty attributes do not match the ruleset.
+        ValueError: If the ruleset is not supported.
+        RuntimeError: If a native object cannot be created.
+    """
+
+    __slots__ = (
+        "ruleset",
+        "beatmap",
+        "mods",
+        "difficulty_attributes",
+        "combo",
+        "_rules",
+        "_calculator",
+        "_owns_calculator",
+        "_native_score",
+        "_native_diff",
+        "_native_perf",
+        "_perf_ref",
+        "_hits",
+        "_maximum",
+        "_closed",
+    )
+
+    def __init__(
+        self,
+        ruleset: Ruleset,
+        beatmap: Beatmap,
+        mods: ModsCollection,
+        difficulty_attributes: Optional[DifficultyAttributes] = None,
+        calculator: Optional[PerformanceCalculator] = None,
+    ):
+        rules = _RULES.get(ruleset.ruleset_id)
+        if rules is None:
+            raise ValueError(f"Unsupported ruleset ID: {ruleset.ruleset_id}")
+
+        if difficulty_attributes is None:
+            with create_difficulty_calculator(ruleset, beatmap) as difficulty_calculator:
+                difficulty_attributes = difficulty_calculator.calculate(mods)
+
+        self._owns_calculator = calculator is None
+        if calculator is None:
+            calculator = create_performance_calculator(ruleset)
+
+        self.ruleset = ruleset
+        self.beatmap = beatmap
+        self.mods = mods
+        self.difficulty_attributes = difficulty_attributes
+        self._rules = {
+            name: (native_field_name(f"count_{name}"), *rule) for name, rule in rules.items()
+        }
+        self._calculator = calculator
+        self.combo: int = 0
+        self._hits: int = 0
+        self._maximum: int = 0
+        self._closed = False
+
+        try:
+            self._native_diff = calculator._difficulty_to_native(difficulty_attributes)
+        except TypeError:
+            self.close()
+            raise
+
+        self._native_score = ScoreInfo().to_native(ruleset.handle, beatmap.handle, mods.handle)
+        self._native_perf = calculator._native_performance_type()
+        self._perf_ref = byref(self._native_perf)
+        self.reset()
+
+    @property
+    def max_combo(self) -> int:
+        """The highest combo reached so far."""
+        return self._native_score.maxCombo
+
+    @property
+    def accuracy(self) -> float:
+        """The accuracy of the judgements so far, 1.0 before the first one."""
+        return self._native_score.accuracy
+
+    def judge(self, judgement: str, count: int = 1) -> float:
+        """Record ``count`` judgements of one kind and return the new total pp.
+
+        Args:
+            judgement: The judgement, named after the ``ScoreInfo`` count it
+                increments without the ``count_`` prefix: ``great``, ``ok``,
+                ``meh``, ``miss``, ``good`` and ``perfect`` (osu!mania),
+                ``large_tick_hit``/``large_tick_miss``, ``small_tick_hit``/
+                ``small_tick_miss`` (osu!catch) or ``slider_tail_hit`` (osu!).
+            count: How many judgements to record.
+
+        Raises:
+            ValueError: If the judgement does not exist in the ruleset.
+            RuntimeError: If the session is closed or the calculation fails.
+        """
+        self.add(judgement, count)
+        return self.performance_total()
+
+    def add(self, judgement: str, count: int = 1) -> None:
+        """Record judgements without calculating performance. See :meth:`judge`."""
+        rule = self._rules.get(judgement)
+        if rule is None:
+            raise ValueError(
+                f"Unknown judgement for ruleset {self.ruleset.ruleset_id}: {judgement!r}",
+            )
+
+        field, weight, maximum, combo = rule
+        native_score = self._native_score
+        setattr(native_score, field, getattr(native_score, field) + count)
+
+        if maximum:
+            self._hits += weight * count
+            self._maximum += maximum * count
+            native_score.accuracy = self._hits / self._maximum
+
+        if combo == _INCREASE:
+            self.combo += count
+            if self.combo > native_score.maxCombo:
+                native_score.maxCombo = self.combo
+        elif combo == _BREAK:
+            self.combo = 0
+
+    def performance_total(self) -> float:
+        """Calculate the total pp of the score so far.
+
+        Raises:
+            RuntimeError: If the session is closed or the calculation fails.
+        """
+        self._check_not_closed()
+        self._calculator._calculate_into(self._native_score, self._native_diff, self._perf_ref)
+        return self._native_perf.total
+
+    def performance(self) -> PerformanceAttributes:
+        """Calculate the full performance attributes of the score so far.
+
+        Raises:
+            RuntimeError: If the session is closed or the calculation fails.
+        """
+        self.performance_total()
+        return self._calculator._performance_attributes_type.from_native(  # type: ignore
+            self._native_perf,
+        )
+
+    def score_info(self) -> ScoreInfo:
+        """Return the score so far as a ``ScoreInfo``."""
+        native_score = self._native_score
+        return ScoreInfo(
+            **{name: getattr(native_score, native_field_name(name)) for name in _SCORE_FIELDS},
+        )
+
+    def reset(self) -> None:
+        """Start over from an empty score, keeping everything prepared."""
+        native_score = self._native_score
+        for field, *_ in self._rules.values():
+            setattr(native_score, field, 0)
+        native_score.maxCombo = 0
+        native_score.accuracy = 1.0
+        self.combo = 0
+        self._hits = 0
+        self._maximum = 0
+
+    def close(self) -> None:
+        """Close the performance calculator if the session created it."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._owns_calculator:
+            self._calculator.close()
+
+    def _check_not_closed(self) -> None:
+        if self._closed:
+            raise RuntimeError("Cannot use a closed LivePerformanceSession")
+
+    def __enter__(self) -> LivePerformanceSession:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return (
+            f"<LivePerformanceSession ruleset={self.ruleset.ruleset_id} "
+            f"combo={self.combo} accuracy={self.accuracy:.4f}>"
+        )
@@ -0,0 +1,217 @@
+"""Metrics for long-running services using the wrapper.
+
+Collects live native handle counts, native call counters and latencies (while
+:mod:`osu_native_py.profiling` is enabled), and the statistics of registered
+caches and worker pools. Everything can be exported as a plain dict or in the
+Prometheus text exposition format, without any client library.
+
+Caches must provide a ``stats()`` method returning at least ``hits``,
+``misses``, ``size`` and ``capacity``. Pools must provide a ``stats()`` method
+returning at least ``workers``, ``active`` and ``queue_depth``.
+
+Example::
+
+    from osu_native_py import metrics
+
+    metrics.register_cache("beatmaps", cache)
+    print(metrics.render_prometheus())
+"""
+
+from __future__ import annotations
+
+import threading
+import weakref
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+from . import profiling
+from .wrapper.utils.native_handler import NativeHandler
+
+_lock = threading.Lock()
+_caches: Dict[str, weakref.ReferenceType] = {}
+_pools: Dict[str, weakref.ReferenceType] = {}
+
+
+def _register(registry: Dict[str, weakref.ReferenceType], name: str, obj: Any) -> str:
+    with _lock:
+        unique = name
+        suffix = 2
+        while unique in registry and registry[unique]() is not None:
+            unique = f"{name}-{suffix}"
+            suffix += 1
+
+        registry[unique] = weakref.ref(obj)
+        return unique
+
+
+def register_cache(name: str, cache: Any) -> str:
+    """Report the statistics of a cache under ``name``.
+
+    Only a weak reference is kept; the cache disappears from the metrics once it
+    is garbage collected.
+
+    Returns:
+        The name the cache was registered under, made unique if needed.
+    """
+    return _register(_caches, name, cache)
+
+
+def register_pool(name: str, pool: Any) -> str:
+    """Report the statistics of a worker pool under ``name``.
+
+    Only a weak reference is kept; the pool disappears from the metrics once it
+    is garbage collected.
+
+    Returns:
+        The name the pool was registered under, made unique if needed.
+    """
+    return _register(_pools, name, pool)
+
+
+def unregister(name: str) -> None:
+    """Stop reporting the cache or pool registered under ``name``."""
+    with _lock:
+        _caches.pop(name, None)
+        _pools.pop(name, None)
+
+
+def _live(registry: Dict[str, weakref.ReferenceType]) -> List[Tuple[str, Any]]:
+    with _lock:
+        entries = [(name, ref()) for name, ref in registry.items()]
+        for name, obj in entries:
+            if obj is None:
+                del registry[name]
+
+    return [(name, obj) for name, obj in entries if obj is not None]
+
+
+def _cache_stats(stats: Dict[str, Any]) -> Dict[str, Any]:
+    lookups = stats["hits"] + stats["misses"]
+    return dict(stats, hit_ratio=stats["hits"] / lookups if lookups else 0.0)
+
+
+def _pool_stats(stats: Dict[str, Any]) -> Dict[str, Any]:
+    workers = stats["workers"]
+    return dict(stats, utilisation=stats["active"] / workers if workers else 0.0)
+
+
+def collect() -> Dict[str, Any]:
+    """Return all metrics as a plain dict.
+
+    Returns:
+        A dict with the keys ``handles`` (created, closed and live counts per
+        handle type), ``native_calls`` (per native function, empty unless
+        profiling is enabled), ``caches`` and ``pools``.
+    """
+    native_calls = {
+        name: {
+            "calls": stats.calls,
+            "total_time": stats.total_time,
+            "mean_time": stats.mean_time,
+            "max_time": stats.max_time,
+            "string_bytes": stats.string_bytes,
+        }
+        for name, stats in profiling.snapshot().items()
+    }
+
+    return {
+        "handles": NativeHandler.handle_counts(),
+        "native_calls": native_calls,
+        "caches": {name: _cache_stats(cache.stats()) for name, cache in _live(_caches)},
+        "pools": {name: _pool_stats(pool.stats()) for name, pool in _live(_pools)},
+    }
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Exposition:
+    def __init__(self) -> None:
+        self.lines: List[str] = []
+
+    def family(self, name: str, kind: str, help_text: str) -> None:
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+
+    def sample(self, name: str, labels: Dict[str, str], value: float) -> None:
+        label_text = ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels.items())
+        self.lines.append(f"{name}{{{label_text}}} {_format_value(value)}")
+
+    def render(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def render_prometheus(prefix: str = "osu_native") -> str:
+    """Return all metrics in the Prometheus text exposition format.
+
+    Args:
+        prefix: The prefix of every metric name.
+    """
+    out = _Exposition()
+
+    handles = NativeHandler.handle_counts()
+    out.family(f"{prefix}_handles_live", "gauge", "Native handles currently open.")
+    for type_name, counts in sorted(handles.items()):
+        out.sample(f"{prefix}_handles_live", {"type": type_name}, counts["live"])
+    out.family(f"{prefix}_handles_created_total", "counter", "Native handles created.")
+    for type_name, counts in sorted(handles.items()):
+        out.sample(f"{prefix}_handles_created_total", {"type": type_name}, counts["created"])
+
+    calls = profiling.snapshot()
+    if calls:
+        out.family(f"{prefix}_calls_total", "counter", "Native function calls.")
+        for function, stats in sorted(calls.items()):
+            out.sample(f"{prefix}_calls_total", {"function": function}, stats.calls)
+
+        out.family(f"{prefix}_string_bytes_total", "counter", "String bytes marshalled.")
+        for function, stats in sorted(calls.items()):
+            out.sample(f"{prefix}_string_bytes_total", {"function": function}, stats.string_bytes)
+
+        histogram = f"{prefix}_call_duration_seconds"
+        out.family(histogram, "histogram", "Native function call latency.")
+        for function, stats in sorted(calls.items()):
+            cumulative = 0
+            for bound, count in zip(profiling.LATENCY_BUCKETS, stats.buckets):
+                cumulative += count
+                out.sample(
+                    f"{histogram}_bucket", {"function": function, "le": repr(bound)}, cumulative
+                )
+            out.sample(f"{histogram}_bucket", {"function": function, "le": "+Inf"}, stats.calls)
+            out.sample(f"{histogram}_sum", {"function": function}, stats.total_time)
+            out.sample(f"{histogram}_count", {"function": function}, stats.calls)
+
+    caches = [(name, _cache_stats(cache.stats())) for name, cache in _live(_caches)]
+    if caches:
+        for metric, kind, key, help_text in (
+            ("cache_hits_total", "counter", "hits", "Cache lookups that found an entry."),
+            ("cache_misses_total", "counter", "misses", "Cache lookups that missed."),
+            ("cache_hit_ratio", "gauge", "hit_ratio", "Fraction of cache lookups that hit."),
+            ("cache_size", "gauge", "size", "Entries currently cached."),
+            ("cache_capacity", "gauge", "capacity", "Maximum number of cached entries."),
+        ):
+            out.family(f"{prefix}_{metric}", kind, help_text)
+            for name, cache_stats in caches:
+                out.sample(f"{prefix}_{metric}", {"cache": name}, cache_stats[key])
+
+    pools = [(name, _pool_stats(pool.stats())) for name, pool in _live(_pools)]
+    if pools:
+        for metric, key, help_text in (
+            ("pool_workers", "workers", "Workers in the pool."),
+            ("pool_active", "active", "Workers currently busy."),
+            ("pool_utilisation", "utilisation", "Fraction of workers currently busy."),
+            ("pool_queue_depth", "queue_depth", "Work items waiting for a worker."),
+        ):
+            out.family(f"{prefix}_{metric}", "gauge", help_text)
+            for name, pool_stats in pools:
+                out.sample(f"{prefix}_{metric}", {"pool": name}, pool_stats[key])
+
+    return out.render()
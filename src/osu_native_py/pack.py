@@ -0,0 +1,334 @@
+"""Packed beatmap libraries with an index for random access.
+
+A pack concatenates many .osu files into a single file, optionally compressing
+each entry with zlib, and ends with an index keyed by beatmap ID and MD5
+checksum. Packs are read through a memory map, so fetching a beatmap costs no
+per-file system calls.
+
+File layout (all integers little-endian)::
+
+    header   magic "OSUPACK1", u32 version, u32 reserved,
+             u64 index offset, u64 index entry count
+    data     entry payloads, back to back
+    index    one fixed-size record per entry, see ``_INDEX_RECORD``
+
+Appending writes new payloads and a new index after the old one, then updates
+the header last, so an interrupted append leaves the previous contents intact.
+
+Example::
+
+    from osu_native_py.pack import PackBuilder, open_pack
+
+    with PackBuilder("library.pack", compress=True) as builder:
+        builder.add_file("/path/to/1234.osu")
+
+    with open_pack("library.pack") as pack:
+        beatmap = pack.get(1234)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import struct
+import zlib
+from typing import BinaryIO
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Union
+
+from .index import scan_bytes
+from .wrapper.objects import Beatmap
+
+MAGIC = b"OSUPACK1"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sIIQQ")
+_INDEX_RECORD = struct.Struct("<q16sQQQI4x")
+
+_FLAG_ZLIB = 1 << 0
+
+_Buffer = Union[bytes, mmap.mmap]
+
+
+class PackEntry(NamedTuple):
+    """Index record of one beatmap in a pack.
+
+    Attributes:
+        beatmap_id: The online beatmap ID, or -1 if not set.
+        md5: The MD5 checksum of the uncompressed .osu file, as hex.
+        offset: The position of the payload in the pack.
+        stored_size: The size of the payload in the pack.
+        size: The size of the uncompressed .osu file.
+        compressed: Whether the payload is zlib-compressed.
+    """
+
+    beatmap_id: int
+    md5: str
+    offset: int
+    stored_size: int
+    size: int
+    compressed: bool
+
+    def _pack(self) -> bytes:
+        return _INDEX_RECORD.pack(
+            self.beatmap_id,
+            bytes.fromhex(self.md5),
+            self.offset,
+            self.stored_size,
+            self.size,
+            _FLAG_ZLIB if self.compressed else 0,
+        )
+
+    @classmethod
+    def _unpack(cls, data: _Buffer, offset: int) -> PackEntry:
+        beatmap_id, md5, data_offset, stored_size, size, flags = _INDEX_RECORD.unpack_from(
+            data,
+            offset,
+        )
+        return cls(beatmap_id, md5.hex(), data_offset, stored_size, size, bool(flags & _FLAG_ZLIB))
+
+
+def _read_header(data: _Buffer, path: str):
+    if len(data) < _HEADER.size:
+        raise ValueError(f"Not a beatmap pack: {path}")
+
+    magic, version, _, index_offset, count = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError(f"Not a beatmap pack: {path}")
+    if version != VERSION:
+        raise ValueError(f"Unsupported beatmap pack version {version}: {path}")
+
+    return index_offset, count
+
+
+class BeatmapPack:
+    """Read-only view of a pack file.
+
+    When several entries share a beatmap ID or checksum, the most recently added
+    one wins.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        self.path = os.fspath(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+
+        try:
+            index_offset, count = _read_header(self._map, self.path)
+            self._entries: List[PackEntry] = [
+                PackEntry._unpack(self._map, index_offset + i * _INDEX_RECORD.size)
+                for i in range(count)
+            ]
+        except BaseException:
+            self._map.close()
+            self._file.close()
+            raise
+        self._by_id: Dict[int, PackEntry] = {
+            entry.beatmap_id: entry for entry in self._entries if entry.beatmap_id >= 0
+        }
+        self._by_md5: Dict[str, PackEntry] = {entry.md5: entry for entry in self._entries}
+
+    def entries(self) -> List[PackEntry]:
+        """Return every index record, in the order they were added."""
+        return list(self._entries)
+
+    def entry(self, beatmap_id: int) -> PackEntry:
+        """Return the index record of a beatmap.
+
+        Raises:
+            KeyError: If the beatmap is not in the pack.
+        """
+        return self._by_id[beatmap_id]
+
+    def read_bytes(self, entry: PackEntry) -> bytes:
+        """Return the uncompressed .osu file contents of an entry."""
+        payload = self._map[entry.offset : entry.offset + entry.stored_size]
+        return zlib.decompress(payload) if entry.compressed else payload
+
+    def read_text(self, beatmap_id: int) -> str:
+        """Return the .osu file contents of a beatmap.
+
+        Raises:
+            KeyError: If the beatmap is not in the pack.
+        """
+        return self.read_bytes(self._by_id[beatmap_id]).decode("utf-8-sig")
+
+    def get(self, beatmap_id: int) -> Beatmap:
+        """Parse a beatmap from the pack.
+
+        Raises:
+            KeyError: If the beatmap is not in the pack.
+            RuntimeError: If the beatmap cannot be parsed.
+        """
+        return Beatmap.from_text(self.read_text(beatmap_id))
+
+    def get_by_checksum(self, md5: str) -> Beatmap:
+        """Parse the beatmap with the given MD5 checksum from the pack.
+
+        Raises:
+            KeyError: If no beatmap with the checksum is in the pack.
+            RuntimeError: If the beatmap cannot be parsed.
+        """
+        entry = self._by_md5[md5.lower()]
+        return Beatmap.from_text(self.read_bytes(entry).decode("utf-8-sig"))
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+    def __contains__(self, beatmap_id: object) -> bool:
+        return beatmap_id in self._by_id
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._by_id)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"<BeatmapPack '{self.path}' beatmaps={len(self._by_id)}>"
+
+
+def open_pack(path: Union[str, os.PathLike]) -> BeatmapPack:
+    """Open a pack file for reading.
+
+    Raises:
+        OSError: If the file cannot be opened.
+        ValueError: If the file is not a pack.
+    """
+    return BeatmapPack(path)
+
+
+class PackBuilder:
+    """Creates a pack file or appends to an existing one.
+
+    Entries are written as they are added; the index is written by :meth:`close`.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], compress: bool = False, level: int = 6):
+        self.path = os.fspath(path)
+        self.compress = compress
+        self.level = level
+        self._entries: List[PackEntry] = []
+
+        self._file: BinaryIO
+        if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            self._file = open(self.path, "r+b")
+            try:
+                with mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    index_offset, count = _read_header(data, self.path)
+                    self._entries = [
+                        PackEntry._unpack(data, index_offset + i * _INDEX_RECORD.size)
+                        for i in range(count)
+                    ]
+            except BaseException:
+                self._file.close()
+                raise
+            self._file.seek(0, os.SEEK_END)
+        else:
+            self._file = open(self.path, "w+b")
+            self._file.write(_HEADER.pack(MAGIC, VERSION, 0, _HEADER.size, 0))
+
+    def add(
+        self,
+        data: Union[bytes, str],
+        beatmap_id: Optional[int] = None,
+        compress: Optional[bool] = None,
+    ) -> PackEntry:
+        """Append a beatmap to the pack.
+
+        Args:
+            data: The contents of the .osu file.
+            beatmap_id: The beatmap ID to index the entry under. Read from the
+                file's header when not given.
+            compress: Whether to zlib-compress the entry. Defaults to the builder's
+                ``compress`` setting.
+
+        Returns:
+            The index record of the new entry.
+
+        Raises:
+            ValueError: If ``beatmap_id`` is not given and the data is not a .osu file.
+        """
+        raw = data.encode("utf-8") if isinstance(data, str) else data
+        if beatmap_id is None:
+            beatmap_id = scan_bytes(raw).beatmap_id
+
+        should_compress = self.compress if compress is None else compress
+        payload = zlib.compress(raw, self.level) if should_compress else raw
+
+        offset = self._file.seek(0, os.SEEK_END)
+        self._file.write(payload)
+
+        entry = PackEntry(
+            beatmap_id=beatmap_id,
+            md5=hashlib.md5(raw).hexdigest(),
+            offset=offset,
+            stored_size=len(payload),
+            size=len(raw),
+            compressed=should_compress,
+        )
+        self._entries.append(entry)
+        return entry
+
+    def add_file(
+        self, path: Union[str, os.PathLike], beatmap_id: Optional[int] = None
+    ) -> PackEntry:
+        """Append a .osu file to the pack. See :meth:`add`."""
+        with open(path, "rb") as f:
+            return self.add(f.read(), beatmap_id)
+
+    def close(self) -> None:
+        """Write the index and header, then close the file."""
+        if self._file.closed:
+            return
+
+        index_offset = self._file.seek(0, os.SEEK_END)
+        self._file.write(b"".join(entry._pack() for entry in self._entries))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(MAGIC, VERSION, 0, index_offset, len(self._entries)))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+def build_pack(
+    paths: Iterable[Union[str, os.PathLike]],
+    output: Union[str, os.PathLike],
+    compress: bool = False,
+) -> int:
+    """Pack .osu files into ``output``, appending if it already exists.
+
+    Returns:
+        The number of files added.
+    """
+    count = 0
+    with PackBuilder(output, compress=compress) as builder:
+        for path in paths:
+            builder.add_file(path)
+            count += 1
+
+    return count
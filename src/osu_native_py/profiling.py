@@ -0,0 +1,280 @@
+"""Opt-in instrumentation of the native calls made by the wrapper.
+
+The wrapper classes look up every native function on the ``bindings`` module at
+call time. While profiling is enabled, those module attributes are replaced by
+timing wrappers; disabling restores the original functions, so there is no
+overhead at all when profiling is off.
+
+Example::
+
+    from osu_native_py import profiling
+
+    with profiling.profile() as scope:
+        diff_attrs = diff_calc.calculate(mods)
+
+    print(scope.native_time, scope.python_time)
+    print(scope.stats["OsuDifficultyCalculator_Calculate"].calls)
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from ctypes import Array
+from ctypes import sizeof
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from .native import bindings
+
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    1e-6,
+    2.5e-6,
+    5e-6,
+    1e-5,
+    2.5e-5,
+    5e-5,
+    1e-4,
+    2.5e-4,
+    5e-4,
+    1e-3,
+    2.5e-3,
+    5e-3,
+    1e-2,
+    2.5e-2,
+    5e-2,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+"""Upper bounds, in seconds, of the latency histogram buckets.
+
+Histograms have one more bucket than there are bounds, counting calls slower
+than the last bound.
+"""
+
+_NATIVE_FUNCTION_NAME = re.compile(r"^[A-Z][A-Za-z0-9]*_[A-Za-z0-9]+$")
+
+
+@dataclass
+class CallStats:
+    """Accumulated statistics for one native function.
+
+    Attributes:
+        calls: The number of calls.
+        total_time: The cumulative time spent in the function, in seconds.
+        min_time: The fastest call, in seconds.
+        max_time: The slowest call, in seconds.
+        string_bytes: The size of the string buffers passed to the function.
+        buckets: Call counts per latency bucket, see ``LATENCY_BUCKETS``.
+    """
+
+    calls: int = 0
+    total_time: float = 0.0
+    min_time: float = float("inf")
+    max_time: float = 0.0
+    string_bytes: int = 0
+    buckets: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+
+    @property
+    def mean_time(self) -> float:
+        """The mean call duration in seconds."""
+        return self.total_time / self.calls if self.calls else 0.0
+
+    def copy(self) -> CallStats:
+        return CallStats(
+            calls=self.calls,
+            total_time=self.total_time,
+            min_time=self.min_time,
+            max_time=self.max_time,
+            string_bytes=self.string_bytes,
+            buckets=list(self.buckets),
+        )
+
+    def since(self, earlier: CallStats) -> CallStats:
+        """Return the statistics accumulated after ``earlier`` was taken.
+
+        Minimum and maximum cannot be separated and are kept as they are.
+        """
+        return CallStats(
+            calls=self.calls - earlier.calls,
+            total_time=self.total_time - earlier.total_time,
+            min_time=self.min_time,
+            max_time=self.max_time,
+            string_bytes=self.string_bytes - earlier.string_bytes,
+            buckets=[now - before for now, before in zip(self.buckets, earlier.buckets)],
+        )
+
+
+_lock = threading.RLock()
+_stats: Dict[str, CallStats] = {}
+_originals: Dict[str, Callable[..., Any]] = {}
+
+
+def _string_bytes(args: Tuple[Any, ...]) -> int:
+    return sum(sizeof(arg) for arg in args if isinstance(arg, Array))
+
+
+def _instrument(name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    perf_counter = time.perf_counter
+
+    def instrumented(*args: Any) -> Any:
+        start = perf_counter()
+        try:
+            return func(*args)
+        finally:
+            elapsed = perf_counter() - start
+            marshalled = _string_bytes(args)
+
+            with _lock:
+                stats = _stats.get(name)
+                if stats is None:
+                    stats = _stats[name] = CallStats()
+                stats.calls += 1
+                stats.total_time += elapsed
+                stats.string_bytes += marshalled
+                if elapsed < stats.min_time:
+                    stats.min_time = elapsed
+                if elapsed > stats.max_time:
+                    stats.max_time = elapsed
+                stats.buckets[bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+
+    instrumented.__name__ = name
+    instrumented.__wrapped__ = func  # type: ignore[attr-defined]
+    return instrumented
+
+
+def native_functions() -> List[str]:
+    """Return the names of the native functions that can be instrumented."""
+    return sorted(
+        name
+        for name, value in vars(bindings).items()
+        if _NATIVE_FUNCTION_NAME.match(name) and callable(value) and not isinstance(value, type)
+    )
+
+
+def enable() -> None:
+    """Start instrumenting native calls. Calling it again has no effect."""
+    with _lock:
+        if _originals:
+            return
+
+        for name in native_functions():
+            func = getattr(bindings, name)
+            _originals[name] = func
+            setattr(bindings, name, _instrument(name, func))
+
+
+def disable() -> None:
+    """Stop instrumenting native calls. Collected statistics are kept."""
+    with _lock:
+        for name, func in _originals.items():
+            setattr(bindings, name, func)
+        _originals.clear()
+
+
+def is_enabled() -> bool:
+    """Whether native calls are currently being instrumented."""
+    return bool(_originals)
+
+
+def snapshot() -> Dict[str, CallStats]:
+    """Return a copy of the statistics collected so far, keyed by native function name."""
+    with _lock:
+        return {name: stats.copy() for name, stats in _stats.items()}
+
+
+def reset() -> None:
+    """Discard all collected statistics."""
+    with _lock:
+        _stats.clear()
+
+
+class ProfileScope:
+    """Measurements taken within a :func:`profile` block.
+
+    Attributes:
+        stats: Per-function statistics for calls made inside the block.
+        wall_time: The duration of the block in seconds.
+    """
+
+    def __init__(self) -> None:
+        self.stats: Dict[str, CallStats] = {}
+        self.wall_time = 0.0
+
+    @property
+    def native_time(self) -> float:
+        """Seconds spent inside native functions."""
+        return sum(stats.total_time for stats in self.stats.values())
+
+    @property
+    def python_time(self) -> float:
+        """Seconds spent outside native functions, e.g. marshalling in the wrapper."""
+        return max(0.0, self.wall_time - self.native_time)
+
+    @property
+    def calls(self) -> int:
+        """The number of native calls made."""
+        return sum(stats.calls for stats in self.stats.values())
+
+
+@contextmanager
+def profile() -> Iterator[ProfileScope]:
+    """Instrument native calls for the duration of a ``with`` block.
+
+    Statistics are process-wide, so calls made by other threads while the block
+    runs are included in the scope as well. Profiling stays enabled afterwards if
+    it already was before entering the block.
+    """
+    was_enabled = is_enabled()
+    enable()
+
+    scope = ProfileScope()
+    before = snapshot()
+    start = time.perf_counter()
+    try:
+        yield scope
+    finally:
+        scope.wall_time = time.perf_counter() - start
+        after = snapshot()
+        if not was_enabled:
+            disable()
+
+        empty = CallStats()
+        for name, stats in after.items():
+            delta = stats.since(before.get(name, empty))
+            if delta.calls:
+                scope.stats[name] = delta
+
+
+def format_stats(stats: Optional[Dict[str, CallStats]] = None) -> str:
+    """Render statistics as a table sorted by cumulative time.
+
+    Args:
+        stats: The statistics to render. Defaults to the current snapshot.
+    """
+    if stats is None:
+        stats = snapshot()
+
+    lines = [f"{'function':45} {'calls':>10} {'total ms':>12} {'mean us':>10} {'bytes':>12}"]
+    for name, entry in sorted(stats.items(), key=lambda item: -item[1].total_time):
+        lines.append(
+            f"{name:45} {entry.calls:>10} {entry.total_time * 1e3:>12.3f} "
+            f"{entry.mean_time * 1e6:>10.2f} {entry.string_bytes:>12}",
+        )
+
+    return "\n".join(lines)
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from .app import CalculationServer
+from .app import CalculationService
+from .app import serve
+from .batcher import MicroBatcher
+from .batcher import QueueFullError
+from .cache import BeatmapContext
+from .cache import BeatmapContextCache
+from .client import CalculationClient
+from .client import run_load
+from .isolation import IsolatedWorkerPool
+from .isolation import QuarantinedError
+from .isolation import WorkerCrashedError
+from .isolation import WorkerError
+from .isolation import WorkerTimeoutError
+
+__all__ = [
+    "CalculationServer",
+    "CalculationService",
+    "serve",
+    "MicroBatcher",
+    "QueueFullError",
+    "BeatmapContext",
+    "BeatmapContextCache",
+    "CalculationClient",
+    "run_load",
+    "IsolatedWorkerPool",
+    "WorkerError",
+    "WorkerTimeoutError",
+    "WorkerCrashedError",
+    "QuarantinedError",
+]
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+
+from ..cost import DEFAULT_HEAVY_COST
+from .app import DEFAULT_HOST
+from .app import DEFAULT_PORT
+from .app import serve
+from .client import CalculationClient
+from .client import run_load
+
+
+def _load_requests(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    beatmap_ids = [
+        int(path.stem) for path in Path(args.beatmap_dir).glob("*.osu") if path.stem.isdigit()
+    ]
+    if not beatmap_ids:
+        raise SystemExit(f"No <beatmap_id>.osu files found in {args.beatmap_dir}")
+
+    rng = random.Random(args.seed)
+    requests: List[Dict[str, Any]] = []
+    for _ in range(args.requests):
+        payload: Dict[str, Any] = {"beatmap_id": rng.choice(beatmap_ids), "mods": args.mods}
+        if args.kind == "performance":
+            payload["score"] = {"accuracy": rng.uniform(0.9, 1.0), "count_miss": rng.randint(0, 5)}
+        requests.append(payload)
+
+    return requests
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m osu_native_py.server")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="run the calculation server")
+    serve_parser.add_argument("beatmap_dir", help="directory of <beatmap_id>.osu files")
+    serve_parser.add_argument("--cache-size", type=int, default=128)
+    serve_parser.add_argument("--max-batch-size", type=int, default=64)
+    serve_parser.add_argument("--max-delay-ms", type=float, default=2.0)
+    serve_parser.add_argument("--workers", type=int, default=4)
+    serve_parser.add_argument(
+        "--heavy-threshold",
+        type=float,
+        default=DEFAULT_HEAVY_COST,
+        help="estimated cost from which beatmaps use the heavy lane (negative to disable)",
+    )
+    serve_parser.add_argument("--heavy-workers", type=int, default=1)
+    serve_parser.add_argument("--max-heavy-batches", type=int, default=8)
+    serve_parser.add_argument(
+        "--isolated",
+        action="store_true",
+        help="run calculations in worker processes that are killed on timeout or crash",
+    )
+    serve_parser.add_argument("--job-timeout", type=float, default=30.0)
+    serve_parser.add_argument("--verbose", action="store_true")
+
+    load_parser = subparsers.add_parser("load", help="generate load against a running server")
+    load_parser.add_argument("beatmap_dir", help="directory of <beatmap_id>.osu files to request")
+    load_parser.add_argument("--kind", choices=["difficulty", "performance"], default="performance")
+    load_parser.add_argument("--requests", type=int, default=1000)
+    load_parser.add_argument("--concurrency", type=int, default=8)
+    load_parser.add_argument("--mods", nargs="*", default=[])
+    load_parser.add_argument("--seed", type=int, default=0)
+
+    subparsers.add_parser("stats", help="print the statistics of a running server")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        serve(
+            args.beatmap_dir,
+            host=args.host,
+            port=args.port,
+            verbose=args.verbose,
+            cache_size=args.cache_size,
+            max_batch_size=args.max_batch_size,
+            max_delay=args.max_delay_ms / 1000.0,
+            workers=args.workers,
+            heavy_threshold=args.heavy_threshold if args.heavy_threshold >= 0 else None,
+            heavy_workers=args.heavy_workers,
+            max_heavy_batches=args.max_heavy_batches,
+            isolated=args.isolated,
+            job_timeout=args.job_timeout,
+        )
+    elif args.command == "load":
+        report = run_load(_load_requests(args), args.concurrency, args.host, args.port)
+        print(json.dumps(report, indent=2))
+    else:
+        with CalculationClient(args.host, args.port) as client:
+            print(json.dumps(client.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import Hashable
+from typing import List
+from typing import Optional
+from typing import Union
+from typing import cast
+
+from .. import metrics
+from ..cost import DEFAULT_HEAVY_COST
+from ..wrapper.objects import ScoreInfo
+from .batcher import MicroBatcher
+from .batcher import QueueFullError
+from .cache import BatchKey
+from .cache import BeatmapContextCache
+from .cache import calculate_batch
+from .cache import mods_key
+from .isolation import IsolatedWorkerPool
+from .isolation import QuarantinedError
+from .isolation import WorkerTimeoutError
+from .stats import LatencyRecorder
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8727
+
+_PROMETHEUS_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class CalculationService:
+    """Difficulty and performance calculation with micro-batching and resident beatmaps.
+
+    Concurrent requests for the same beatmap, ruleset and mods are grouped into a
+    single batch: difficulty requests share one calculation, and performance
+    requests are evaluated with one ``calculate_many`` pass.
+
+    Beatmaps whose estimated cost (see :mod:`osu_native_py.cost`) reaches
+    ``heavy_threshold`` are calculated on a separate heavy lane with its own
+    ``heavy_workers``, so a marathon cannot occupy every worker and starve the
+    regular maps queued behind it. The heavy lane accepts at most
+    ``max_heavy_batches`` open or running batches; requests beyond that are
+    rejected with :class:`QueueFullError` (HTTP 503) instead of queueing without
+    bound.
+
+    With ``isolated`` set, batches run in an :class:`IsolatedWorkerPool` of
+    ``workers + heavy_workers`` processes, so a native crash or hang costs one
+    worker process and one ``job_timeout`` instead of the service. Beatmaps that
+    crash or time out are quarantined and answered with HTTP 503 from then on.
+    """
+
+    def __init__(
+        self,
+        beatmap_dir: Union[str, Path],
+        cache_size: int = 128,
+        max_batch_size: int = 64,
+        max_delay: float = 0.002,
+        workers: int = 4,
+        heavy_threshold: Optional[float] = DEFAULT_HEAVY_COST,
+        heavy_workers: int = 1,
+        max_heavy_batches: Optional[int] = 8,
+        isolated: bool = False,
+        job_timeout: Optional[float] = 30.0,
+    ):
+        self.cache = BeatmapContextCache(beatmap_dir, capacity=cache_size)
+        self.pool: Optional[IsolatedWorkerPool] = None
+        if isolated:
+            self.pool = IsolatedWorkerPool(
+                beatmap_dir,
+                workers=workers + heavy_workers,
+                timeout=job_timeout,
+                cache_size=cache_size,
+            )
+        self.heavy_threshold = heavy_threshold
+        self.batcher = MicroBatcher(
+            self._handle_batch,
+            max_batch_size=max_batch_size,
+            max_delay=max_delay,
+            workers=workers,
+        )
+        self.heavy_batcher = MicroBatcher(
+            self._handle_batch,
+            max_batch_size=max_batch_size,
+            max_delay=max_delay,
+            workers=heavy_workers,
+            name="heavy_micro_batcher",
+            max_batches=max_heavy_batches,
+        )
+        self._latency: Dict[str, LatencyRecorder] = {
+            "difficulty": LatencyRecorder(),
+            "performance": LatencyRecorder(),
+        }
+
+    def difficulty(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Calculate difficulty attributes.
+
+        Args:
+            payload: ``beatmap_id``, and optionally ``ruleset_id`` and ``mods``
+                (a list of acronyms).
+        """
+        start = time.perf_counter()
+        key = self._batch_key("difficulty", payload)
+        attributes = self._batcher(key).submit(key, None).result()
+        self._latency["difficulty"].record(time.perf_counter() - start)
+
+        return {"attributes": asdict(attributes)}
+
+    def performance(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Calculate performance attributes for a score.
+
+        Args:
+            payload: ``beatmap_id``, ``score`` (the fields of :class:`ScoreInfo`),
+                and optionally ``ruleset_id`` and ``mods``.
+        """
+        start = time.perf_counter()
+        key = self._batch_key("performance", payload)
+
+        score = payload.get("score")
+        if not isinstance(score, dict):
+            raise ValueError("'score' must be an object")
+
+        attributes = self._batcher(key).submit(key, ScoreInfo(**score)).result()
+        self._latency["performance"].record(time.perf_counter() - start)
+
+        return {"attributes": asdict(attributes)}
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth, latency and cache statistics."""
+        stats = {
+            "batcher": self.batcher.stats(),
+            "heavy_batcher": self.heavy_batcher.stats(),
+            "cache": self.cache.stats(),
+            "latency": {name: recorder.summary() for name, recorder in self._latency.items()},
+        }
+        if self.pool is not None:
+            stats["isolation"] = self.pool.stats()
+
+        return stats
+
+    def close(self) -> None:
+        self.batcher.close()
+        self.heavy_batcher.close()
+        if self.pool is not None:
+            self.pool.close()
+        self.cache.clear()
+        metrics.unregister(self.cache.metrics_name)
+
+    @staticmethod
+    def _batch_key(kind: str, payload: Dict[str, Any]) -> BatchKey:
+        if "beatmap_id" not in payload:
+            raise ValueError("'beatmap_id' is required")
+
+        ruleset_id = payload.get("ruleset_id")
+        mods = payload.get("mods", [])
+        if not isinstance(mods, list) or not all(isinstance(m, str) for m in mods):
+            raise ValueError("'mods' must be a list of acronyms")
+
+        return (
+            kind,
+            int(payload["beatmap_id"]),
+            None if ruleset_id is None else int(ruleset_id),
+            mods_key(mods),
+        )
+
+    def _batcher(self, key: BatchKey) -> MicroBatcher:
+        if self.heavy_threshold is None:
+            return self.batcher
+
+        cost = self.cache.cost(key[1])
+        return self.heavy_batcher if cost.is_heavy(self.heavy_threshold) else self.batcher
+
+    def _handle_batch(self, key: Hashable, items: List[Any]) -> List[Any]:
+        # Every key submitted to the batchers comes from _batch_key.
+        batch_key = cast(BatchKey, key)
+        if self.pool is not None:
+            return self.pool.run(batch_key, items)
+
+        return calculate_batch(self.cache, batch_key, items)
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: CalculationServer
+
+    def do_GET(self) -> None:
+        if self.path == "/stats":
+            self._send(200, self.server.service.stats())
+        elif self.path == "/metrics":
+            self._send_bytes(200, metrics.render_prometheus().encode("utf-8"), _PROMETHEUS_TYPE)
+        elif self.path == "/health":
+            self._send(200, {"status": "ok"})
+        else:
+            self._send(404, {"error": f"Unknown endpoint: {self.path}"})
+
+    def do_POST(self) -> None:
+        endpoints = {
+            "/difficulty": self.server.service.difficulty,
+            "/performance": self.server.service.performance,
+        }
+        endpoint = endpoints.get(self.path)
+        if endpoint is None:
+            self._send(404, {"error": f"Unknown endpoint: {self.path}"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(payload, dict):
+                raise ValueError("Request body must be a JSON object")
+            self._send(200, endpoint(payload))
+        except FileNotFoundError as e:
+            self._send(404, {"error": str(e)})
+        except (QueueFullError, QuarantinedError) as e:
+            self._send(503, {"error": str(e)})
+        except WorkerTimeoutError as e:
+            self._send(504, {"error": str(e)})
+        except (ValueError, TypeError) as e:
+            self._send(400, {"error": str(e)})
+        except Exception as e:
+            self._send(500, {"error": str(e)})
+
+    def _send(self, status: int, body: Dict[str, Any]) -> None:
+        self._send_bytes(status, json.dumps(body).encode("utf-8"), "application/json")
+
+    def _send_bytes(self, status: int, data: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class CalculationServer(ThreadingHTTPServer):
+    """Local HTTP server exposing a :class:`CalculationService`.
+
+    Endpoints:
+        POST /difficulty: Difficulty attributes for a beatmap and mods.
+        POST /performance: Performance attributes for a score.
+        GET /stats: Queue depth, latency and cache statistics.
+        GET /metrics: Library metrics in the Prometheus text format.
+        GET /health: Liveness check.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        service: CalculationService,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        verbose: bool = False,
+    ):
+        self.service = service
+        self.verbose = verbose
+        super().__init__((host, port), _RequestHandler)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.service.close()
+
+
+def serve(
+    beatmap_dir: Union[str, Path],
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    verbose: bool = False,
+    **service_options: Any,
+) -> None:
+    """Run a calculation server until interrupted.
+
+    Args:
+        beatmap_dir: Directory containing ``<beatmap_id>.osu`` files.
+        host: The address to bind to.
+        port: The port to bind to.
+        verbose: Whether to log every request.
+        **service_options: Passed on to :class:`CalculationService`.
+    """
+    service = CalculationService(beatmap_dir, **service_options)
+    with CalculationServer(service, host, port, verbose) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Hashable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from .. import metrics
+from .stats import LatencyRecorder
+
+BatchHandler = Callable[[Hashable, List[Any]], List[Any]]
+
+_Pending = Tuple[Any, "Future[Any]", float]
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a batcher refuses new work because its queue is full."""
+
+
+class MicroBatcher:
+    """Groups concurrent requests sharing a key into a single handler call.
+
+    The first request for a key opens a batch which is flushed once it holds
+    ``max_batch_size`` items or ``max_delay`` seconds have passed, whichever comes
+    first. Flushed batches run on a small worker pool.
+
+    With ``max_batches`` set, a request that would open a new batch while that
+    many batches are already open or executing is rejected with
+    :class:`QueueFullError`. Requests joining an open batch are always accepted,
+    since they add no calculation of their own.
+    """
+
+    def __init__(
+        self,
+        handler: BatchHandler,
+        max_batch_size: int = 64,
+        max_delay: float = 0.002,
+        workers: int = 4,
+        name: str = "micro_batcher",
+        max_batches: Optional[int] = None,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_batches is not None and max_batches < 1:
+            raise ValueError("max_batches must be at least 1")
+
+        self._handler = handler
+        self._max_batch_size = max_batch_size
+        self._max_delay = max_delay
+        self._workers = workers
+        self._max_batches = max_batches
+
+        self._pending: Dict[Hashable, List[_Pending]] = {}
+        self._deadlines: Dict[Hashable, float] = {}
+        self._cond = threading.Condition()
+        self._closed = False
+
+        self._queued = 0
+        self._running = 0
+        self._active_batches = 0
+        self._scheduled_batches = 0
+        self._batches = 0
+        self._items = 0
+        self._rejected = 0
+        self._latency = LatencyRecorder()
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="osu-native-batch",
+        )
+        self._dispatcher = threading.Thread(
+            target=self._dispatch,
+            name="osu-native-batch-dispatcher",
+            daemon=True,
+        )
+        self._dispatcher.start()
+
+        self.metrics_name = metrics.register_pool(name, self)
+
+    def submit(self, key: Hashable, item: Any) -> Future[Any]:
+        """Queue an item for the batch identified by ``key``.
+
+        Returns:
+            A future resolved with the handler's result for this item.
+
+        Raises:
+            QueueFullError: If the item would open a batch beyond ``max_batches``.
+            RuntimeError: If the batcher has been closed.
+        """
+        future: Future[Any] = Future()
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("MicroBatcher has been closed")
+
+            if (
+                self._max_batches is not None
+                and key not in self._pending
+                and len(self._pending) + self._scheduled_batches >= self._max_batches
+            ):
+                self._rejected += 1
+                raise QueueFullError(
+                    f"Too many batches queued ({self._max_batches}); try again later",
+                )
+
+            batch = self._pending.setdefault(key, [])
+            batch.append((item, future, time.perf_counter()))
+            self._queued += 1
+
+            if len(batch) == 1:
+                self._deadlines[key] = time.monotonic() + self._max_delay
+                self._cond.notify()
+            elif len(batch) >= self._max_batch_size:
+                self._deadlines[key] = 0.0
+                self._cond.notify()
+
+        return future
+
+    def stats(self) -> Dict[str, Any]:
+        """Return worker utilisation, queue depth, batch sizes and request latency statistics.
+
+        ``active`` counts batches currently executing, so ``active / workers`` is the
+        utilisation of the worker pool. ``queue_depth`` and ``running`` count items.
+        """
+        with self._cond:
+            queued = self._queued
+            running = self._running
+            active_batches = self._active_batches
+            batches = self._batches
+            items = self._items
+            open_batches = len(self._pending)
+            rejected = self._rejected
+
+        return {
+            "workers": self._workers,
+            "active": active_batches,
+            "queue_depth": queued,
+            "running": running,
+            "open_batches": open_batches,
+            "batches": batches,
+            "items": items,
+            "rejected": rejected,
+            "mean_batch_size": items / batches if batches else 0.0,
+            "latency": self._latency.summary(),
+        }
+
+    def close(self) -> None:
+        """Flush outstanding batches and stop the worker pool."""
+        with self._cond:
+            if self._closed:
+                return
+
+            self._closed = True
+            for key in self._deadlines:
+                self._deadlines[key] = 0.0
+            self._cond.notify()
+
+        self._dispatcher.join()
+        self._executor.shutdown(wait=True)
+        metrics.unregister(self.metrics_name)
+
+    def _dispatch(self) -> None:
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                ready = [key for key, deadline in self._deadlines.items() if deadline <= now]
+
+                for key in ready:
+                    del self._deadlines[key]
+                    batch = self._pending.pop(key)
+                    self._scheduled_batches += 1
+                    self._executor.submit(self._execute, key, batch)
+
+                if self._closed and not self._deadlines:
+                    return
+
+                timeout = min(self._deadlines.values()) - now if self._deadlines else None
+                self._cond.wait(timeout)
+
+    def _execute(self, key: Hashable, batch: List[_Pending]) -> None:
+        with self._cond:
+            self._queued -= len(batch)
+            self._running += len(batch)
+            self._active_batches += 1
+
+        try:
+            results = self._handler(key, [item for item, _, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(
+                    f"Batch handler returned {len(results)} results for {len(batch)} items",
+                )
+        except BaseException as e:
+            for _, future, _ in batch:
+                future.set_exception(e)
+        else:
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
+        finally:
+            finished = time.perf_counter()
+            for _, _, enqueued in batch:
+                self._latency.record(finished - enqueued)
+
+            with self._cond:
+                self._running -= len(batch)
+                self._active_batches -= 1
+                self._scheduled_batches -= 1
+                self._batches += 1
+                self._items += len(batch)
@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+from .. import metrics
+from ..cost import BeatmapCost
+from ..cost import estimate_file_cost
+from ..wrapper.attributes.difficulty import DifficultyAttributes
+from ..wrapper.calculators import DifficultyCalculator
+from ..wrapper.calculators import PerformanceCalculator
+from ..wrapper.calculators import create_difficulty_calculator
+from ..wrapper.calculators import create_performance_calculator
+from ..wrapper.objects import Beatmap
+from ..wrapper.objects import Mod
+from ..wrapper.objects import ModsCollection
+from ..wrapper.objects import Ruleset
+
+ModsKey = Tuple[str, ...]
+ContextKey = Tuple[int, int]
+# (kind, beatmap_id, ruleset_id, mods_key) of a batch of requests.
+BatchKey = Tuple[str, int, Optional[int], ModsKey]
+
+# Cost estimates kept by a BeatmapContextCache per unit of its capacity.
+COSTS_PER_CONTEXT = 16
+
+
+def mods_key(acronyms: Sequence[str]) -> ModsKey:
+    """Normalise a list of mod acronyms into a hashable cache key."""
+    return tuple(acronym.upper() for acronym in acronyms)
+
+
+class BeatmapContext:
+    """Native objects kept resident for one beatmap in one ruleset.
+
+    Holds the parsed beatmap, its ruleset, both calculators, and the mods
+    collections and difficulty attributes computed so far. Native calls on a
+    context must be made while holding ``lock``.
+    """
+
+    def __init__(self, beatmap: Beatmap, ruleset: Ruleset):
+        self.beatmap = beatmap
+        self.ruleset = ruleset
+        self.difficulty_calculator: DifficultyCalculator = create_difficulty_calculator(
+            ruleset,
+            beatmap,
+        )
+        self.performance_calculator: PerformanceCalculator = create_performance_calculator(
+            ruleset,
+        )
+        self.lock = threading.RLock()
+
+        self._mods: Dict[ModsKey, ModsCollection] = {}
+        self._difficulty: Dict[ModsKey, DifficultyAttributes] = {}
+
+    def mods(self, key: ModsKey) -> ModsCollection:
+        """Return the mods collection for ``key``, creating it on first use.
+
+        Raises:
+            ValueError: If an acronym is not a mod.
+            RuntimeError: If the collection cannot be created.
+        """
+        mods = self._mods.get(key)
+        if mods is None:
+            mods = ModsCollection.create()
+            try:
+                for acronym in key:
+                    try:
+                        mod = Mod.create(acronym)
+                    except RuntimeError as e:
+                        raise ValueError(f"Invalid mod {acronym!r}: {e}") from None
+                    mods.add(mod)
+            except Exception:
+                mods.close()
+                raise
+            self._mods[key] = mods
+
+        return mods
+
+    def difficulty(self, key: ModsKey) -> DifficultyAttributes:
+        """Return the difficulty attributes for ``key``, calculating them on first use."""
+        attributes = self._difficulty.get(key)
+        if attributes is None:
+            attributes = self.difficulty_calculator.calculate(self.mods(key))
+            self._difficulty[key] = attributes
+
+        return attributes
+
+    def close(self) -> None:
+        with self.lock:
+            for mods in self._mods.values():
+                mods.close()
+            self._mods.clear()
+            self._difficulty.clear()
+
+            self.performance_calculator.close()
+            self.difficulty_calculator.close()
+            self.ruleset.close()
+            self.beatmap.close()
+
+
+class BeatmapContextCache:
+    """LRU cache of :class:`BeatmapContext` objects loaded from a directory.
+
+    Beatmaps are looked up as ``<beatmap_dir>/<beatmap_id>.osu``.
+    """
+
+    def __init__(
+        self,
+        beatmap_dir: Union[str, Path],
+        capacity: int = 128,
+        name: str = "beatmap_contexts",
+    ):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.beatmap_dir = Path(beatmap_dir)
+        self.capacity = capacity
+
+        self._contexts: OrderedDict[ContextKey, BeatmapContext] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        # Estimates are small, so far more are kept than resident contexts.
+        self._costs: OrderedDict[int, BeatmapCost] = OrderedDict()
+        self._costs_capacity = capacity * COSTS_PER_CONTEXT
+
+        self.metrics_name = metrics.register_cache(name, self)
+
+    def get(self, beatmap_id: int, ruleset_id: Optional[int] = None) -> BeatmapContext:
+        """Return the context for a beatmap, loading it if it is not resident.
+
+        Args:
+            beatmap_id: The beatmap ID, used as the file name in ``beatmap_dir``.
+            ruleset_id: The ruleset to calculate in. Defaults to the beatmap's own
+                ruleset; other values request a convert.
+
+        Raises:
+            FileNotFoundError: If there is no file for the beatmap.
+            RuntimeError: If the beatmap cannot be parsed.
+        """
+        beatmap_id = int(beatmap_id)
+
+        with self._lock:
+            for key in self._candidate_keys(beatmap_id, ruleset_id):
+                context = self._contexts.get(key)
+                if context is not None:
+                    self._contexts.move_to_end(key)
+                    self._hits += 1
+                    return context
+
+            self._misses += 1
+
+        context = self._load(beatmap_id, ruleset_id)
+        key = (beatmap_id, context.ruleset.ruleset_id)
+
+        with self._lock:
+            existing = self._contexts.get(key)
+            if existing is not None:
+                # Another thread loaded the same beatmap while we were parsing.
+                context.close()
+                self._contexts.move_to_end(key)
+                return existing
+
+            self._contexts[key] = context
+            evicted = []
+            while len(self._contexts) > self.capacity:
+                evicted.append(self._contexts.popitem(last=False)[1])
+                self._evictions += 1
+
+        for old in evicted:
+            old.close()
+
+        return context
+
+    def acquire(self, beatmap_id: int, ruleset_id: Optional[int] = None) -> BeatmapContext:
+        """Like :meth:`get`, but return the context with its lock held.
+
+        The caller must release ``context.lock`` when done. A context evicted
+        between lookup and locking is loaded again.
+        """
+        while True:
+            context = self.get(beatmap_id, ruleset_id)
+            context.lock.acquire()
+            if not context.beatmap.is_closed:
+                return context
+
+            context.lock.release()
+
+    def cost(self, beatmap_id: int) -> BeatmapCost:
+        """Return the estimated calculation cost of a beatmap without loading it.
+
+        The file is scanned once; the estimate is remembered even after the
+        beatmap's context is evicted, for up to ``COSTS_PER_CONTEXT`` times
+        ``capacity`` beatmaps.
+
+        Raises:
+            FileNotFoundError: If there is no file for the beatmap.
+        """
+        beatmap_id = int(beatmap_id)
+
+        with self._lock:
+            cost = self._costs.get(beatmap_id)
+            if cost is not None:
+                self._costs.move_to_end(beatmap_id)
+                return cost
+
+        path = self.beatmap_dir / f"{beatmap_id}.osu"
+        if not path.is_file():
+            raise FileNotFoundError(f"No beatmap file for ID {beatmap_id}: {path}")
+
+        cost = estimate_file_cost(path)
+        with self._lock:
+            self._costs[beatmap_id] = cost
+            self._costs.move_to_end(beatmap_id)
+            while len(self._costs) > self._costs_capacity:
+                self._costs.popitem(last=False)
+        return cost
+
+    def stats(self) -> Dict[str, Any]:
+        """Return residency and hit ratio statistics."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._contexts),
+                "capacity": self.capacity,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        """Close and drop every resident context."""
+        with self._lock:
+            contexts = list(self._contexts.values())
+            self._contexts.clear()
+
+        for context in contexts:
+            context.close()
+
+    def _candidate_keys(self, beatmap_id: int, ruleset_id: Optional[int]):
+        if ruleset_id is not None:
+            return [(beatmap_id, ruleset_id)]
+
+        # Without an explicit ruleset any resident context for the beatmap's own
+        # ruleset will do; converts are only returned when asked for.
+        return [
+            key
+            for key, context in self._contexts.items()
+            if key[0] == beatmap_id and key[1] == context.beatmap.ruleset_id
+        ]
+
+    def _load(self, beatmap_id: int, ruleset_id: Optional[int]) -> BeatmapContext:
+        path = self.beatmap_dir / f"{beatmap_id}.osu"
+        if not path.is_file():
+            raise FileNotFoundError(f"No beatmap file for ID {beatmap_id}: {path}")
+
+        beatmap = Beatmap.from_file(str(path))
+        try:
+            ruleset = Ruleset.from_id(beatmap.ruleset_id if ruleset_id is None else ruleset_id)
+        except Exception:
+            beatmap.close()
+            raise
+
+        try:
+            return BeatmapContext(beatmap, ruleset)
+        except Exception:
+            ruleset.close()
+            beatmap.close()
+            raise
+
+
+def calculate_batch(cache: BeatmapContextCache, key: BatchKey, items: List[Any]) -> List[Any]:
+    """Calculate one batch of requests sharing a beatmap, ruleset and mods.
+
+    Args:
+        cache: The cache to take the beatmap's context from.
+        key: ``(kind, beatmap_id, ruleset_id, mods_key)``, where ``kind`` is
+            ``"difficulty"`` or ``"performance"``.
+        items: None for each difficulty request, or the ``ScoreInfo`` of each
+            performance request.
+
+    Returns:
+        One difficulty or performance attributes object per item.
+    """
+    kind, beatmap_id, ruleset_id, mods = key
+    context = cache.acquire(beatmap_id, ruleset_id)
+
+    try:
+        difficulty = context.difficulty(mods)
+        if kind == "difficulty":
+            return [difficulty] * len(items)
+
+        return context.performance_calculator.calculate_many(
+            context.ruleset,
+            context.beatmap,
+            context.mods(mods),
+            items,
+            difficulty,
+        )
+    finally:
+        context.lock.release()
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import http.client
+import json
+import threading
+import time
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+
+from .app import DEFAULT_HOST
+from .app import DEFAULT_PORT
+from .stats import LatencyRecorder
+
+
+class CalculationClient:
+    """Minimal keep-alive client for a :class:`CalculationServer`.
+
+    A client holds a single connection and is not thread-safe; use one client per
+    thread.
+    """
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, timeout: float = 30.0):
+        self._connection = http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def difficulty(
+        self,
+        beatmap_id: int,
+        mods: Sequence[str] = (),
+        ruleset_id: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {"beatmap_id": beatmap_id, "mods": list(mods)}
+        if ruleset_id is not None:
+            payload["ruleset_id"] = ruleset_id
+        return self.request("POST", "/difficulty", payload)["attributes"]
+
+    def performance(
+        self,
+        beatmap_id: int,
+        score: Dict[str, Any],
+        mods: Sequence[str] = (),
+        ruleset_id: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {"beatmap_id": beatmap_id, "mods": list(mods), "score": score}
+        if ruleset_id is not None:
+            payload["ruleset_id"] = ruleset_id
+        return self.request("POST", "/performance", payload)["attributes"]
+
+    def stats(self) -> Dict[str, Any]:
+        return self.request("GET", "/stats")
+
+    def request(self, method: str, path: str, payload: Optional[Dict[str, Any]] = None):
+        """Send a request and return the decoded JSON response.
+
+        Raises:
+            RuntimeError: If the server responds with an error status.
+        """
+        body = None if payload is None else json.dumps(payload).encode("utf-8")
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+
+        self._connection.request(method, path, body=body, headers=headers)
+        response = self._connection.getresponse()
+        data = json.loads(response.read() or b"{}")
+
+        if response.status != 200:
+            raise RuntimeError(f"{method} {path} failed ({response.status}): {data.get('error')}")
+
+        return data
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+def run_load(
+    requests: Sequence[Dict[str, Any]],
+    concurrency: int = 8,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+) -> Dict[str, Any]:
+    """Replay requests against a server from several threads and report throughput.
+
+    Args:
+        requests: Request payloads. A payload containing a ``score`` is sent to
+            ``/performance``, anything else to ``/difficulty``.
+        concurrency: The number of client threads.
+        host: The server address.
+        port: The server port.
+
+    Returns:
+        Request counts, wall time, requests per second and client-side latencies.
+    """
+    latency = LatencyRecorder(window=max(1, len(requests)))
+    errors: List[str] = []
+    lock = threading.Lock()
+    next_index = [0]
+
+    def worker() -> None:
+        with CalculationClient(host, port) as client:
+            while True:
+                with lock:
+                    index = next_index[0]
+                    next_index[0] += 1
+                if index >= len(requests):
+                    return
+
+                payload = requests[index]
+                path = "/performance" if "score" in payload else "/difficulty"
+                start = time.perf_counter()
+                try:
+                    client.request("POST", path, payload)
+                except Exception as e:
+                    with lock:
+                        errors.append(str(e))
+                latency.record(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "requests": len(requests),
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "seconds": elapsed,
+        "requests_per_second": len(requests) / elapsed if elapsed > 0 else 0.0,
+        "latency": latency.summary(),
+    }
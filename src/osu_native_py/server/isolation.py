@@ -0,0 +1,297 @@
+"""Calculation in subprocess workers that can be killed.
+
+A crash inside the native library takes the whole process with it, and a ctypes
+call cannot be interrupted, so a beatmap that makes the native code loop forever
+holds its thread for good. :class:`IsolatedWorkerPool` runs calculation batches
+in spawned worker processes instead. Each worker keeps its own
+:class:`BeatmapContextCache` between jobs, so resident beatmaps and cached
+difficulty attributes are not lost, while the parent only sends keys and scores
+and receives attributes.
+
+A job that outlives its timeout gets its worker killed and replaced and raises
+:class:`WorkerTimeoutError`; a worker that dies during a job raises
+:class:`WorkerCrashedError`. Either way the beatmap is quarantined: further jobs
+for it fail fast with :class:`QuarantinedError` until it is released.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import queue
+import threading
+import time
+from multiprocessing.connection import Connection
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from .. import metrics
+from .cache import BatchKey
+from .cache import BeatmapContextCache
+from .cache import calculate_batch
+
+
+class WorkerError(RuntimeError):
+    """Base class for failures of an isolated worker rather than of the calculation."""
+
+
+class WorkerTimeoutError(WorkerError):
+    """Raised when a job does not finish within the pool's timeout."""
+
+
+class WorkerCrashedError(WorkerError):
+    """Raised when a worker process dies while running a job.
+
+    Attributes:
+        exitcode: The worker's exit code, negative for the signal that killed it.
+    """
+
+    def __init__(self, message: str, exitcode: Optional[int] = None):
+        super().__init__(message)
+        self.exitcode = exitcode
+
+
+class QuarantinedError(WorkerError):
+    """Raised for jobs on a beatmap that previously crashed or hung a worker."""
+
+
+class _Worker:
+    def __init__(self, context: Any, beatmap_dir: Path, cache_size: int):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, str(beatmap_dir), cache_size),
+            name="osu-native-isolated-worker",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        if self.process.is_alive():
+            try:
+                self.conn.send(None)
+            except OSError:
+                pass
+            self.process.join(timeout)
+        self.kill()
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class IsolatedWorkerPool:
+    """A pool of worker processes running :func:`calculate_batch` jobs.
+
+    :meth:`run` takes the same keys and items as a :class:`MicroBatcher` handler,
+    so it can back a :class:`CalculationService` directly. It blocks until a
+    worker is free, and is safe to call from several threads.
+
+    Args:
+        beatmap_dir: Directory containing ``<beatmap_id>.osu`` files.
+        workers: The number of worker processes.
+        timeout: The wall-clock limit of one job in seconds, or None for no limit.
+        cache_size: The capacity of each worker's beatmap context cache.
+        quarantine: Beatmap IDs to start out quarantined, for example the
+            :attr:`quarantined` list saved by a previous run.
+        name: The name the pool is reported under in :mod:`osu_native_py.metrics`.
+    """
+
+    def __init__(
+        self,
+        beatmap_dir: Union[str, Path],
+        workers: int = 4,
+        timeout: Optional[float] = 30.0,
+        cache_size: int = 32,
+        quarantine: Iterable[int] = (),
+        name: str = "isolated_workers",
+    ):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if timeout is not None and timeout <= 0:
+            raise ValueError("timeout must be positive")
+
+        self.beatmap_dir = Path(beatmap_dir)
+        self.timeout = timeout
+        self._workers = workers
+        self._cache_size = cache_size
+        # Workers start their own native runtime rather than inheriting ours.
+        self._context = multiprocessing.get_context("spawn")
+
+        self._lock = threading.Lock()
+        self._quarantine: Dict[int, str] = {
+            int(beatmap_id): "quarantined at startup" for beatmap_id in quarantine
+        }
+        self._closed = False
+        self._jobs = 0
+        self._timeouts = 0
+        self._crashes = 0
+        self._respawns = 0
+        self._rejected = 0
+
+        self._idle: queue.Queue[_Worker] = queue.Queue()
+        for _ in range(workers):
+            self._idle.put(self._spawn())
+
+        self.metrics_name = metrics.register_pool(name, self)
+
+    @property
+    def quarantined(self) -> Dict[int, str]:
+        """The quarantined beatmap IDs and why they were quarantined."""
+        with self._lock:
+            return dict(self._quarantine)
+
+    def release(self, beatmap_id: int) -> None:
+        """Take a beatmap out of quarantine."""
+        with self._lock:
+            self._quarantine.pop(int(beatmap_id), None)
+
+    def run(self, key: BatchKey, items: List[Any]) -> List[Any]:
+        """Run one batch in a worker and return its results.
+
+        Args:
+            key: ``(kind, beatmap_id, ruleset_id, mods_key)`` as for
+                :func:`calculate_batch`.
+            items: The batch's items.
+
+        Raises:
+            QuarantinedError: If the beatmap is quarantined.
+            WorkerTimeoutError: If the job exceeds the timeout.
+            WorkerCrashedError: If the worker dies during the job.
+            RuntimeError: If the pool is closed, or as raised by the calculation,
+                along with its other exceptions.
+        """
+        beatmap_id = key[1]
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("IsolatedWorkerPool has been closed")
+            reason = self._quarantine.get(beatmap_id)
+            if reason is not None:
+                self._rejected += 1
+                raise QuarantinedError(f"Beatmap {beatmap_id} is quarantined: {reason}")
+
+        worker = self._idle.get()
+        try:
+            if not worker.process.is_alive():
+                worker = self._replace(worker)
+
+            start = time.monotonic()
+            try:
+                worker.conn.send((key, items))
+                finished = worker.conn.poll(self.timeout)
+                if finished:
+                    ok, result = worker.conn.recv()
+            except (EOFError, OSError):
+                exitcode = self._exitcode(worker)
+                worker = self._replace(worker)
+                message = (
+                    f"Worker crashed with exit code {exitcode} after "
+                    f"{time.monotonic() - start:.3f}s calculating beatmap {beatmap_id}"
+                )
+                self._quarantine_for(beatmap_id, message, crashed=True)
+                raise WorkerCrashedError(message, exitcode) from None
+
+            if not finished:
+                worker = self._replace(worker)
+                message = (
+                    f"Calculation for beatmap {beatmap_id} did not finish within {self.timeout}s"
+                )
+                self._quarantine_for(beatmap_id, message, crashed=False)
+                raise WorkerTimeoutError(message)
+        finally:
+            self._idle.put(worker)
+
+        with self._lock:
+            self._jobs += 1
+
+        if not ok:
+            raise result
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Return job, failure and quarantine counts."""
+        with self._lock:
+            return {
+                "workers": self._workers,
+                "idle": self._idle.qsize(),
+                "jobs": self._jobs,
+                "timeouts": self._timeouts,
+                "crashes": self._crashes,
+                "respawns": self._respawns,
+                "rejected": self._rejected,
+                "quarantined": len(self._quarantine),
+            }
+
+    def close(self) -> None:
+        """Stop every worker once its current job has finished."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+
+        for _ in range(self._workers):
+            self._idle.get().stop()
+        metrics.unregister(self.metrics_name)
+
+    def _spawn(self) -> _Worker:
+        return _Worker(self._context, self.beatmap_dir, self._cache_size)
+
+    def _replace(self, worker: _Worker) -> _Worker:
+        worker.kill()
+        with self._lock:
+            self._respawns += 1
+        return self._spawn()
+
+    def _quarantine_for(self, beatmap_id: int, message: str, crashed: bool) -> None:
+        with self._lock:
+            if crashed:
+                self._crashes += 1
+            else:
+                self._timeouts += 1
+            self._quarantine[beatmap_id] = message
+
+    @staticmethod
+    def _exitcode(worker: _Worker) -> Optional[int]:
+        worker.process.join(1.0)
+        return worker.process.exitcode
+
+    def __enter__(self) -> IsolatedWorkerPool:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+def _worker_main(conn: Connection, beatmap_dir: str, cache_size: int) -> None:
+    cache = BeatmapContextCache(beatmap_dir, capacity=cache_size)
+
+    try:
+        while True:
+            job = conn.recv()
+            if job is None:
+                return
+
+            result: Tuple[bool, Any]
+            try:
+                result = (True, calculate_batch(cache, *job))
+            except Exception as e:
+                result = (False, e)
+
+            try:
+                conn.send(result)
+            except Exception as e:
+                # The exception or result could not be pickled.
+                conn.send((False, RuntimeError(f"{type(e).__name__}: {e}")))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        cache.clear()
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Deque
+from typing import Dict
+from typing import Sequence
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of already sorted values.
+
+    Args:
+        sorted_values: The values, sorted in ascending order.
+        fraction: The percentile as a fraction between 0.0 and 1.0.
+
+    Returns:
+        The percentile value, or 0.0 if there are no values.
+    """
+    if not sorted_values:
+        return 0.0
+
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+class LatencyRecorder:
+    """Thread-safe rolling window of latency samples, in seconds."""
+
+    def __init__(self, window: int = 4096):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._count = 0
+        self._total = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+            self._count += 1
+            self._total += seconds
+
+    def summary(self) -> Dict[str, float]:
+        """Summarise the recorded latencies in milliseconds.
+
+        Percentiles cover the rolling window; ``count`` and ``mean_ms`` cover every
+        sample recorded so far.
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+            count = self._count
+            total = self._total
+
+        return {
+            "count": count,
+            "mean_ms": (total / count) * 1000.0 if count else 0.0,
+            "p50_ms": percentile(samples, 0.50) * 1000.0,
+            "p95_ms": percentile(samples, 0.95) * 1000.0,
+            "p99_ms": percentile(samples, 0.99) * 1000.0,
+            "max_ms": (samples[-1] if samples else 0.0) * 1000.0,
+        }
@@ -0,0 +1,428 @@
+"""Shared-memory transport of scores and results between processes. Requires NumPy.
+
+Returning millions of attributes objects from worker processes through pipes
+spends most of the time pickling. Here both directions go through
+``multiprocessing.shared_memory`` instead, as fixed-width records that NumPy views
+in place:
+
+* :func:`share_scores` copies score statistics into a :class:`SharedRecords`
+  block with one field per ``ScoreInfo`` attribute, which
+  :meth:`PerformanceCalculator.calculate_columns` and
+  :meth:`PerformanceCalculator.calculate_records` accept as is.
+* :class:`ResultRing` is a block of native performance records split into slots.
+  The parent hands a slot to each task, the worker calculates straight into it
+  with :func:`calculate_into_slot`, and the parent reads the results as a view and
+  releases the slot for the next task.
+
+Only the small, picklable :class:`SharedRecordsHandle` and :class:`RingSlot` go
+through the pipe.
+
+Example::
+
+    from osu_native_py.shared import ResultRing
+    from osu_native_py.shared import SharedRecords
+    from osu_native_py.shared import calculate_into_slot
+    from osu_native_py.shared import share_scores
+
+    def worker(scores_handle, slot):
+        # ruleset, beatmap, mods, calculator and diff_attrs are set up per process.
+        with SharedRecords.attach(scores_handle) as scores:
+            return calculate_into_slot(
+                calculator, ruleset, beatmap, mods, scores.array, diff_attrs, slot
+            )
+
+    with share_scores(columns) as scores, ResultRing(
+        OsuPerformanceAttributes, slots=8, slot_capacity=len(scores)
+    ) as ring:
+        slot = ring.acquire()
+        count = pool.submit(worker, scores.handle, slot).result()
+        total = ring.view(slot, count)["total"].sum()
+        ring.release(slot)
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from dataclasses import fields
+from multiprocessing import resource_tracker
+from multiprocessing import shared_memory
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+from typing import Type
+
+from .wrapper.attributes import CatchPerformanceAttributes
+from .wrapper.attributes import ManiaPerformanceAttributes
+from .wrapper.attributes import OsuPerformanceAttributes
+from .wrapper.attributes import PerformanceAttributes
+from .wrapper.attributes import TaikoPerformanceAttributes
+from .wrapper.calculators import CatchPerformanceCalculator
+from .wrapper.calculators import ManiaPerformanceCalculator
+from .wrapper.calculators import OsuPerformanceCalculator
+from .wrapper.calculators import PerformanceCalculator
+from .wrapper.calculators import TaikoPerformanceCalculator
+from .wrapper.objects import Beatmap
+from .wrapper.objects import ModsCollection
+from .wrapper.objects import Ruleset
+from .wrapper.objects import ScoreInfo
+from .wrapper.utils.columnar import import_numpy
+from .wrapper.utils.columnar import native_field_name
+from .wrapper.utils.columnar import nullable_column
+
+_CALCULATOR_TYPES: Dict[type, Type[PerformanceCalculator]] = {
+    OsuPerformanceAttributes: OsuPerformanceCalculator,
+    TaikoPerformanceAttributes: TaikoPerformanceCalculator,
+    CatchPerformanceAttributes: CatchPerformanceCalculator,
+    ManiaPerformanceAttributes: ManiaPerformanceCalculator,
+}
+
+
+def score_dtype() -> Any:
+    """Return the record dtype of shared score blocks.
+
+    There is one field per ``ScoreInfo`` attribute. ``legacy_total_score`` is an
+    int64 that is negative when the score has no legacy total score.
+    """
+    np = import_numpy()
+    types = {"accuracy": np.float64, "legacy_total_score": np.int64}
+    return np.dtype([(field.name, types.get(field.name, np.int32)) for field in fields(ScoreInfo)])
+
+
+def result_dtype(attributes_type: Type[PerformanceAttributes]) -> Any:
+    """Return the record dtype of a ruleset's results, the layout of its native struct.
+
+    Raises:
+        TypeError: If ``attributes_type`` is not a ruleset's performance attributes class.
+    """
+    return _calculator_type(attributes_type).record_dtype()
+
+
+class SharedRecordsHandle(NamedTuple):
+    """A picklable reference to a :class:`SharedRecords` block.
+
+    Attributes:
+        name: The name of the shared memory segment.
+        dtype: The record dtype.
+        capacity: The number of records in the block.
+        tracker: Identifies the resource tracker the segment was registered with
+            by its creator, or None where segments are not tracked.
+    """
+
+    name: str
+    dtype: Any
+    capacity: int
+    tracker: Optional[Tuple[int, int]] = None
+
+
+def _tracker_id() -> Optional[Tuple[int, int]]:
+    # Processes share a resource tracker through an inherited pipe, so the pipe's
+    # inode identifies the tracker across fork and spawn.
+    fd = getattr(resource_tracker._resource_tracker, "_fd", None)
+    if fd is None:
+        return None
+    try:
+        stat = os.fstat(fd)
+    except OSError:
+        return None
+    return stat.st_dev, stat.st_ino
+
+
+class SharedRecords:
+    """Fixed-width records in a shared memory segment, viewed as a NumPy structured array.
+
+    The process that calls :meth:`create` owns the segment, and closing the block
+    there also frees it. Other processes :meth:`attach` through :attr:`handle`, and
+    closing the block there only unmaps it.
+
+    Attributes:
+        array: The records, backed by the shared memory without a copy.
+    """
+
+    def __init__(
+        self,
+        memory: shared_memory.SharedMemory,
+        dtype: Any,
+        capacity: int,
+        owner: bool,
+        tracker: Optional[Tuple[int, int]] = None,
+    ):
+        np = import_numpy()
+        self._memory: Optional[shared_memory.SharedMemory] = memory
+        self._owner = owner
+        self._tracker = tracker
+        self.array = np.ndarray((capacity,), dtype=dtype, buffer=memory.buf)
+
+    @classmethod
+    def create(cls, dtype: Any, capacity: int) -> SharedRecords:
+        """Allocate a zeroed block of ``capacity`` records."""
+        np = import_numpy()
+        dtype = np.dtype(dtype)
+        memory = shared_memory.SharedMemory(create=True, size=max(dtype.itemsize * capacity, 1))
+        return cls(memory, dtype, capacity, owner=True, tracker=_tracker_id())
+
+    @classmethod
+    def attach(cls, handle: SharedRecordsHandle) -> SharedRecords:
+        """Open a block created by another process."""
+        if sys.version_info >= (3, 13):
+            memory = shared_memory.SharedMemory(handle.name, track=False)
+        else:
+            memory = shared_memory.SharedMemory(handle.name)
+            # Attaching registers the segment with this process's resource tracker.
+            # A tracker of its own would unlink the segment when this process
+            # exits, so drop the registration there. Forked and spawned children
+            # usually share the creator's tracker, where unregistering would drop
+            # the creator's own registration instead.
+            tracker = _tracker_id()
+            if handle.tracker is not None and tracker != handle.tracker:
+                resource_tracker.unregister(
+                    memory._name, "shared_memory"  # type: ignore[attr-defined]
+                )
+        return cls(memory, handle.dtype, handle.capacity, owner=False, tracker=handle.tracker)
+
+    @property
+    def handle(self) -> SharedRecordsHandle:
+        """The picklable reference other processes attach with."""
+        if self._memory is None:
+            raise RuntimeError("SharedRecords has been closed")
+        return SharedRecordsHandle(
+            self._memory.name, self.array.dtype, len(self.array), self._tracker
+        )
+
+    def close(self) -> None:
+        """Unmap the block in this process.
+
+        Raises:
+            BufferError: If views of :attr:`array` are still alive.
+        """
+        if self._memory is None:
+            return
+        self.array = None
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+        self._memory = None
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+    def __enter__(self) -> SharedRecords:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+def share_scores(scores: Any) -> SharedRecords:
+    """Copy score statistics into a new shared block with :func:`score_dtype` records.
+
+    Args:
+        scores: A mapping of ``ScoreInfo`` field names to arrays or scalars, or a
+            structured array with those field names. Missing fields take the
+            ``ScoreInfo`` defaults and scalars are broadcast. Masked, negative or NaN
+            ``legacy_total_score`` rows are stored as having no legacy score.
+
+    Returns:
+        The block, owned by the calling process.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+        ValueError: If a field is unknown or the column lengths do not match.
+    """
+    np = import_numpy()
+    dtype = score_dtype()
+    names = scores.dtype.names if hasattr(scores, "dtype") else tuple(scores)
+    unknown = set(names) - set(dtype.names)
+    if unknown:
+        raise ValueError(f"Unknown score columns: {', '.join(sorted(unknown))}")
+
+    columns = {name: np.asarray(scores[name]) for name in names}
+    size = max((column.size for column in columns.values() if column.ndim), default=1)
+
+    block = SharedRecords.create(dtype, size)
+    try:
+        defaults = ScoreInfo()
+        for name in dtype.names:
+            if name == "legacy_total_score":
+                continue
+            value = columns[name] if name in columns else getattr(defaults, name)
+            block.array[name] = np.broadcast_to(value, (size,))
+
+        legacy = block.array["legacy_total_score"]
+        if "legacy_total_score" in names:
+            values = np.broadcast_to(np.ma.getdata(scores["legacy_total_score"]), (size,))
+            missing = np.broadcast_to(np.ma.getmaskarray(scores["legacy_total_score"]), (size,))
+            missing = missing | ~(values >= 0)
+            legacy[:] = np.where(missing, -1, values)
+        else:
+            legacy[:] = -1
+    except BaseException:
+        block.close()
+        raise
+
+    return block
+
+
+class RingSlot(NamedTuple):
+    """A picklable reference to one slot of a :class:`ResultRing`.
+
+    Attributes:
+        records: The handle of the ring's records.
+        number: The slot number.
+        start: The index of the slot's first record.
+        capacity: The number of records in the slot.
+    """
+
+    records: SharedRecordsHandle
+    number: int
+    start: int
+    capacity: int
+
+
+class ResultRing:
+    """A shared block of performance records, split into reusable fixed-size slots.
+
+    Slots are handed out and released by the owning process only, so workers
+    need no locking: each writes to the slot of its task.
+
+    Args:
+        attributes_type: The ruleset's performance attributes class.
+        slots: The number of slots, typically about twice the number of workers.
+        slot_capacity: The maximum number of results per task.
+
+    Raises:
+        TypeError: If ``attributes_type`` is not a ruleset's performance attributes class.
+    """
+
+    def __init__(
+        self,
+        attributes_type: Type[PerformanceAttributes],
+        slots: int,
+        slot_capacity: int,
+    ):
+        self.attributes_type = attributes_type
+        self.slot_capacity = slot_capacity
+        self._records = SharedRecords.create(result_dtype(attributes_type), slots * slot_capacity)
+        self._free: List[int] = list(range(slots - 1, -1, -1))
+        self._slots = slots
+
+    def acquire(self) -> RingSlot:
+        """Reserve a free slot.
+
+        Raises:
+            RuntimeError: If every slot is in use.
+        """
+        if not self._free:
+            raise RuntimeError(f"All {self._slots} result slots are in use")
+
+        index = self._free.pop()
+        return RingSlot(
+            self._records.handle,
+            index,
+            index * self.slot_capacity,
+            self.slot_capacity,
+        )
+
+    def release(self, slot: RingSlot) -> None:
+        """Return a slot for reuse. Views of it must not be used afterwards."""
+        if slot.number in self._free:
+            raise ValueError(f"Slot {slot.number} is not in use")
+        self._free.append(slot.number)
+
+    def view(self, slot: RingSlot, count: Optional[int] = None) -> Any:
+        """Return the first ``count`` records of a slot, without copying.
+
+        Fields have the native names and layout; see :func:`result_dtype`.
+        """
+        count = slot.capacity if count is None else count
+        return self._records.array[slot.start : slot.start + count]
+
+    def columns(self, slot: RingSlot, count: Optional[int] = None) -> Dict[str, Any]:
+        """Return the results of a slot as float64 columns keyed by attribute name.
+
+        Unlike :meth:`view` this copies, so the slot can be released right away.
+        Optional fields are NaN where the value is not available.
+        """
+        np = import_numpy()
+        records = self.view(slot, count)
+        return {
+            field.name: nullable_column(np, records[native_field_name(field.name)])
+            for field in fields(self.attributes_type)
+        }
+
+    @property
+    def free_slots(self) -> int:
+        """The number of slots that can be acquired."""
+        return len(self._free)
+
+    def close(self) -> None:
+        """Free the shared memory. Every view must have been dropped."""
+        self._records.close()
+
+    def __enter__(self) -> ResultRing:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return (
+            f"<ResultRing {self.attributes_type.__name__} slots={self._slots} "
+            f"slot_capacity={self.slot_capacity} free={len(self._free)}>"
+        )
+
+
+def calculate_into_slot(
+    calculator: PerformanceCalculator,
+    ruleset: Ruleset,
+    beatmap: Beatmap,
+    mods: ModsCollection,
+    scores: Any,
+    difficulty_attributes: Any,
+    slot: RingSlot,
+) -> int:
+    """Calculate scores in a worker process, writing the results into a ring slot.
+
+    Args:
+        calculator: The performance calculator of the ruleset.
+        ruleset: The ruleset for the beatmap.
+        beatmap: The beatmap the scores were set on.
+        mods: The mods to apply to the beatmap.
+        scores: The scores, as accepted by ``calculate_records``, such as the
+            ``array`` of an attached :func:`share_scores` block.
+        difficulty_attributes: The difficulty attributes for the beatmap.
+        slot: The slot to write into.
+
+    Returns:
+        The number of results written.
+
+    Raises:
+        ValueError: If there are more scores than the slot holds.
+        RuntimeError: If a calculation fails.
+    """
+    np = import_numpy()
+    if hasattr(scores, "dtype"):
+        size = len(scores)
+    else:
+        sizes = [np.asarray(column).size for column in scores.values() if np.ndim(column)]
+        size = max(sizes, default=1)
+
+    if size > slot.capacity:
+        raise ValueError(f"{size} scores do not fit in a slot of {slot.capacity}")
+
+    with SharedRecords.attach(slot.records) as records:
+        out = records.array[slot.start : slot.start + size]
+        calculator.calculate_records(ruleset, beatmap, mods, scores, difficulty_attributes, out)
+        del out
+
+    return size
+
+
+def _calculator_type(attributes_type: Type[PerformanceAttributes]) -> Type[PerformanceCalculator]:
+    calculator_type = _CALCULATOR_TYPES.get(attributes_type)
+    if calculator_type is None:
+        raise TypeError(f"No native results layout for {attributes_type.__name__}")
+    return calculator_type
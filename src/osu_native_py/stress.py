@@ -0,0 +1,412 @@
+"""Handle-leak and concurrency stress testing.
+
+:func:`stress` runs create/calculate/destroy cycles for every kind of native
+handle from several threads, and optionally several processes, at once. It
+then checks two things:
+
+* Live native handles, as counted by ``NativeHandler.handle_counts()``, return to
+  where they started once the cycles are done and garbage has been collected.
+  This includes the handles only released by ``__del__``, and the ``Mod``
+  instances a ``ModsCollection`` closes when it is destroyed, including mods
+  shared between collections.
+* The resident set size does not grow by more than ``max_rss_growth`` between
+  the end of the warmup and the end of the run.
+
+Every workload cycle also fails on any exception, so use-after-free bugs that
+surface as native errors are reported too.
+
+Run it from the command line before raising worker concurrency::
+
+    python -m osu_native_py.stress tests/resources/5438072.osu --cycles 1000000 --threads 8
+
+The process exits with status 1 if the run fails.
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import gc
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+
+from .accuracy import score_for_accuracy
+from .wrapper.calculators import create_difficulty_calculator
+from .wrapper.calculators import create_performance_calculator
+from .wrapper.objects import Beatmap
+from .wrapper.objects import Mod
+from .wrapper.objects import ModsCollection
+from .wrapper.objects import Ruleset
+from .wrapper.utils.native_handler import NativeHandler
+
+DEFAULT_MAX_RSS_GROWTH = 64 * 1024 * 1024
+
+_MAX_ERROR_SAMPLES = 10
+
+
+class _Workload(NamedTuple):
+    text: str
+    ruleset_id: int
+    acronyms: Sequence[str]
+
+
+def _beatmap_cycle(workload: _Workload) -> None:
+    with Beatmap.from_text(workload.text):
+        pass
+
+
+def _mods_cycle(workload: _Workload) -> None:
+    with ModsCollection.create() as mods:
+        for acronym in workload.acronyms:
+            mods.add(Mod.create(acronym))
+
+
+def _shared_mod_cycle(workload: _Workload) -> None:
+    # Destroying the first collection closes the mods it holds; the second must
+    # then skip them instead of closing them again.
+    first = ModsCollection.create()
+    second = ModsCollection.create()
+    try:
+        for acronym in workload.acronyms:
+            mod = Mod.create(acronym)
+            first.add(mod)
+            second.add(mod)
+    finally:
+        first.close()
+        second.close()
+
+
+def _calculate_cycle(workload: _Workload) -> None:
+    with Ruleset.from_id(workload.ruleset_id) as ruleset:
+        with Beatmap.from_text(workload.text) as beatmap, ModsCollection.create() as mods:
+            for acronym in workload.acronyms:
+                mods.add(Mod.create(acronym))
+
+            with create_difficulty_calculator(ruleset, beatmap) as difficulty_calculator:
+                difficulty = difficulty_calculator.calculate(mods)
+
+            with create_performance_calculator(ruleset) as performance_calculator:
+                score = score_for_accuracy(difficulty, 0.98)
+                performance_calculator.calculate(ruleset, beatmap, mods, score, difficulty)
+
+
+def _unclosed_cycle(workload: _Workload) -> None:
+    # Nothing is closed explicitly; every handle is released by __del__.
+    ruleset = Ruleset.from_id(workload.ruleset_id)
+    beatmap = Beatmap.from_text(workload.text)
+    mods = ModsCollection.create()
+    for acronym in workload.acronyms:
+        mods.add(Mod.create(acronym))
+    create_difficulty_calculator(ruleset, beatmap).calculate(mods)
+
+
+WORKLOADS: Dict[str, Callable[[_Workload], None]] = {
+    "beatmap": _beatmap_cycle,
+    "mods": _mods_cycle,
+    "shared_mod": _shared_mod_cycle,
+    "calculate": _calculate_cycle,
+    "unclosed": _unclosed_cycle,
+}
+
+
+class StressReport(NamedTuple):
+    """The outcome of a stress run.
+
+    Attributes:
+        cycles: The number of workload cycles run, excluding warmup.
+        errors: The number of cycles that raised, including warmup.
+        error_samples: The first few error messages.
+        seconds: The wall-clock time of the cycles.
+        rss_baseline: The resident set size in bytes after warmup, or None where
+            it cannot be measured.
+        rss_peak: The largest resident set size sampled during the run.
+        rss_end: The resident set size after the run and garbage collection.
+        max_rss_growth: The allowed growth from ``rss_baseline`` to ``rss_end``.
+        leaked: Per handle class, how many more handles are live than before the
+            run. Only classes with leaks are included.
+    """
+
+    cycles: int
+    errors: int
+    error_samples: List[str]
+    seconds: float
+    rss_baseline: Optional[int]
+    rss_peak: Optional[int]
+    rss_end: Optional[int]
+    max_rss_growth: int
+    leaked: Dict[str, int]
+
+    @property
+    def rss_growth(self) -> Optional[int]:
+        """The resident set size growth in bytes over the run."""
+        if self.rss_baseline is None or self.rss_end is None:
+            return None
+        return self.rss_end - self.rss_baseline
+
+    @property
+    def ok(self) -> bool:
+        """Whether the run had no errors, no leaked handles and bounded memory growth."""
+        growth = self.rss_growth
+        return (
+            not self.errors
+            and not self.leaked
+            and (growth is None or growth <= self.max_rss_growth)
+        )
+
+    def failures(self) -> List[str]:
+        """Describe every way the run failed."""
+        failures = []
+        if self.errors:
+            first = self.error_samples[0] if self.error_samples else "unknown error"
+            failures.append(f"{self.errors} cycle(s) raised, first: {first}")
+        for name, count in sorted(self.leaked.items()):
+            failures.append(f"{count} {name} handle(s) still live")
+
+        growth = self.rss_growth
+        if growth is not None and growth > self.max_rss_growth:
+            failures.append(
+                f"RSS grew by {growth / 2**20:.1f} MiB, more than "
+                f"{self.max_rss_growth / 2**20:.1f} MiB",
+            )
+        return failures
+
+
+def rss() -> Optional[int]:
+    """Return the resident set size of this process in bytes, or None if unknown.
+
+    Reads ``/proc/self/statm`` where available. Elsewhere the peak resident set
+    size is used, which never decreases and so can only overstate growth.
+    """
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def live_handles() -> Dict[str, int]:
+    """Return the number of live native handles per handle class."""
+    return {name: counts["live"] for name, counts in NativeHandler.handle_counts().items()}
+
+
+def stress(
+    beatmap_text: str,
+    cycles: int = 10000,
+    threads: int = 4,
+    processes: int = 1,
+    workloads: Optional[Sequence[str]] = None,
+    acronyms: Sequence[str] = ("DT",),
+    warmup: int = 100,
+    max_rss_growth: int = DEFAULT_MAX_RSS_GROWTH,
+) -> StressReport:
+    """Run create/calculate/destroy cycles concurrently and check for leaks.
+
+    Cycles rotate through ``workloads`` and are split evenly across threads and
+    processes.
+
+    Args:
+        beatmap_text: The content of the .osu file to load in every cycle.
+        cycles: The total number of cycles, excluding warmup.
+        threads: The number of threads running cycles in each process.
+        processes: The number of processes. Each is spawned with its own native
+            runtime and checked on its own; the report adds up cycles, errors and
+            leaks, and keeps the largest memory growth.
+        workloads: Names from :data:`WORKLOADS`. Defaults to all of them.
+        acronyms: The mods used by every cycle.
+        warmup: Cycles run on one thread before measuring the baseline, so that
+            native runtime and allocator start-up does not count as growth.
+        max_rss_growth: The allowed resident set size growth in bytes.
+
+    Raises:
+        ValueError: If a workload is unknown or a count is not positive.
+        RuntimeError: If the beatmap cannot be parsed.
+    """
+    names = list(WORKLOADS) if workloads is None else list(workloads)
+    unknown = [name for name in names if name not in WORKLOADS]
+    if unknown:
+        raise ValueError(f"Unknown workloads: {', '.join(unknown)}")
+    if not names or cycles < 1 or threads < 1 or processes < 1:
+        raise ValueError("workloads, cycles, threads and processes must not be empty or zero")
+
+    run = functools.partial(
+        _stress,
+        beatmap_text=beatmap_text,
+        threads=threads,
+        workloads=names,
+        acronyms=tuple(acronyms),
+        warmup=warmup,
+        max_rss_growth=max_rss_growth,
+    )
+    if processes == 1:
+        return run(cycles=cycles)
+
+    shares = [cycles // processes + (index < cycles % processes) for index in range(processes)]
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(processes, mp_context=context) as executor:
+        futures = [executor.submit(run, cycles=share) for share in shares if share]
+        reports = [future.result() for future in futures]
+
+    leaked: Dict[str, int] = {}
+    for report in reports:
+        for name, count in report.leaked.items():
+            leaked[name] = leaked.get(name, 0) + count
+
+    worst = max(reports, key=lambda report: report.rss_growth or 0)
+    return StressReport(
+        cycles=sum(report.cycles for report in reports),
+        errors=sum(report.errors for report in reports),
+        error_samples=[sample for report in reports for sample in report.error_samples][
+            :_MAX_ERROR_SAMPLES
+        ],
+        seconds=max(report.seconds for report in reports),
+        rss_baseline=worst.rss_baseline,
+        rss_peak=worst.rss_peak,
+        rss_end=worst.rss_end,
+        max_rss_growth=max_rss_growth,
+        leaked=leaked,
+    )
+
+
+def _stress(
+    beatmap_text: str,
+    cycles: int,
+    threads: int,
+    workloads: List[str],
+    acronyms: Sequence[str],
+    warmup: int,
+    max_rss_growth: int,
+) -> StressReport:
+    with Beatmap.from_text(beatmap_text) as beatmap:
+        workload = _Workload(beatmap_text, beatmap.ruleset_id, acronyms)
+    functions = [WORKLOADS[name] for name in workloads]
+
+    gc.collect()
+    handles_before = live_handles()
+
+    lock = threading.Lock()
+    errors: List[str] = []
+    error_count = 0
+    rss_peak = rss()
+
+    def run(start: int, count: int) -> None:
+        nonlocal error_count, rss_peak
+        for cycle in range(start, start + count):
+            try:
+                functions[cycle % len(functions)](workload)
+            except Exception as e:
+                with lock:
+                    error_count += 1
+                    if len(errors) < _MAX_ERROR_SAMPLES:
+                        errors.append(f"{workloads[cycle % len(functions)]}: {e!r}")
+
+            if cycle % 1000 == 0:
+                current = rss()
+                if current is not None:
+                    with lock:
+                        rss_peak = max(rss_peak or 0, current)
+
+    run(0, warmup)
+    gc.collect()
+    rss_baseline = rss()
+
+    shares = [cycles // threads + (index < cycles % threads) for index in range(threads)]
+    workers = []
+    start = warmup
+    for share in shares:
+        workers.append(threading.Thread(target=run, args=(start, share), name="osu-native-stress"))
+        start += share
+
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    seconds = time.perf_counter() - started
+
+    gc.collect()
+    rss_end = rss()
+    handles_after = live_handles()
+    leaked = {
+        name: live - handles_before.get(name, 0)
+        for name, live in handles_after.items()
+        if live > handles_before.get(name, 0)
+    }
+
+    return StressReport(
+        cycles=cycles,
+        errors=error_count,
+        error_samples=errors,
+        seconds=seconds,
+        rss_baseline=rss_baseline,
+        rss_peak=max(rss_peak or 0, rss_end or 0) if rss_end is not None else rss_peak,
+        rss_end=rss_end,
+        max_rss_growth=max_rss_growth,
+        leaked=leaked,
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m osu_native_py.stress",
+        description=__doc__,
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    parser.add_argument("beatmap", help=".osu file to load in every cycle")
+    parser.add_argument("--cycles", type=int, default=100000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--workloads", nargs="*", choices=list(WORKLOADS), default=None)
+    parser.add_argument("--mods", nargs="*", default=["DT"])
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument(
+        "--max-rss-growth-mb",
+        type=float,
+        default=DEFAULT_MAX_RSS_GROWTH / 2**20,
+        help="allowed resident set size growth in MiB",
+    )
+    args = parser.parse_args(argv)
+
+    report = stress(
+        Path(args.beatmap).read_text(encoding="utf-8-sig"),
+        cycles=args.cycles,
+        threads=args.threads,
+        processes=args.processes,
+        workloads=args.workloads,
+        acronyms=args.mods,
+        warmup=args.warmup,
+        max_rss_growth=int(args.max_rss_growth_mb * 2**20),
+    )
+
+    summary = report._asdict()
+    summary.update(rss_growth=report.rss_growth, ok=report.ok)
+    print(json.dumps(summary, indent=2))
+
+    failures = report.failures()
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
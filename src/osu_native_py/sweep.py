@@ -0,0 +1,276 @@
+"""Star rating and performance across custom rates and Difficulty Adjust settings.
+
+:func:`sweep` evaluates a beatmap over the grid of every rate and every
+combination of Difficulty Adjust overrides. One difficulty calculator and one
+performance calculator are reused for the whole grid, mods collections are
+taken from a :class:`ModsCache`, and the grid can be split across processes.
+
+Rates other than 1.0 are applied as DT or HT with a custom ``speed_change``.
+
+Example::
+
+    from osu_native_py.sweep import sweep
+
+    result = sweep(beatmap, ruleset, ["HD"], da_overrides={"approach_rate": [9.0, 10.0]})
+    for rate, ar, stars in zip(result["rate"], result["approach_rate"], result["star_rating"]):
+        print(f"{rate:.2f}x AR{ar:g}: {stars:.2f}*")
+"""
+
+from __future__ import annotations
+
+import itertools
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from .accuracy import score_for_accuracy
+from .wrapper.calculators import create_difficulty_calculator
+from .wrapper.calculators import create_performance_calculator
+from .wrapper.objects import Beatmap
+from .wrapper.objects import Mod
+from .wrapper.objects import ModsCollection
+from .wrapper.objects import Ruleset
+
+DEFAULT_RATES = tuple(round(0.5 + 0.05 * step, 2) for step in range(31))
+DIFFICULTY_ADJUST_SETTINGS = ("approach_rate", "overall_difficulty", "circle_size", "drain_rate")
+
+_RATE_ACRONYMS = {"DT", "NC", "HT", "DC"}
+
+Settings = Tuple[Tuple[str, float], ...]
+ModsCacheKey = Tuple[Tuple[str, ...], float, Settings]
+
+
+class ModsCache:
+    """A bounded LRU cache of mods collections for rate and Difficulty Adjust variants.
+
+    Keep one around to reuse the native mods objects across sweeps. Collections
+    that fall out of the cache are closed, so do not keep references to them.
+
+    A cache is not thread-safe: a lookup in one thread can evict and close a
+    collection another thread is still calculating with. Use one cache per
+    thread.
+
+    Args:
+        capacity: The maximum number of collections kept.
+    """
+
+    def __init__(self, capacity: int = 256):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.capacity = capacity
+        self._mods: OrderedDict[ModsCacheKey, ModsCollection] = OrderedDict()
+
+    def get(
+        self,
+        acronyms: Sequence[str],
+        rate: float = 1.0,
+        difficulty_adjust: Settings = (),
+    ) -> ModsCollection:
+        """Return the mods collection for base mods, a rate and Difficulty Adjust settings.
+
+        Raises:
+            RuntimeError: If a mod cannot be created or a setting cannot be applied.
+        """
+        key = (tuple(acronym.upper() for acronym in acronyms), rate, tuple(difficulty_adjust))
+
+        mods = self._mods.get(key)
+        if mods is not None:
+            self._mods.move_to_end(key)
+            return mods
+
+        mods = self._create(*key)
+        self._mods[key] = mods
+        if len(self._mods) > self.capacity:
+            _, evicted = self._mods.popitem(last=False)
+            evicted.close()
+
+        return mods
+
+    @staticmethod
+    def _create(acronyms: Tuple[str, ...], rate: float, difficulty_adjust: Settings):
+        mods = ModsCollection.create()
+        try:
+            for acronym in acronyms:
+                mods.add(Mod.create(acronym))
+
+            if rate != 1.0:
+                rate_mod = Mod.create("DT" if rate > 1.0 else "HT")
+                rate_mod.set_setting_float("speed_change", rate)
+                mods.add(rate_mod)
+
+            if difficulty_adjust:
+                adjust = Mod.create("DA")
+                for setting, value in difficulty_adjust:
+                    adjust.set_setting_float(setting, value)
+                mods.add(adjust)
+        except Exception:
+            mods.close()
+            raise
+
+        return mods
+
+    def close(self) -> None:
+        """Close every cached collection."""
+        for mods in self._mods.values():
+            mods.close()
+        self._mods.clear()
+
+    def __len__(self) -> int:
+        return len(self._mods)
+
+    def __enter__(self) -> ModsCache:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+def sweep(
+    beatmap: Beatmap,
+    ruleset: Ruleset,
+    base_mods: Sequence[str] = (),
+    rates: Sequence[float] = DEFAULT_RATES,
+    da_overrides: Optional[Mapping[str, Sequence[float]]] = None,
+    accuracies: Sequence[float] = (1.0,),
+    mods_cache: Optional[ModsCache] = None,
+    processes: Optional[int] = 1,
+) -> Dict[str, list]:
+    """Calculate star rating and performance for every rate and Difficulty Adjust override.
+
+    Args:
+        beatmap: The beatmap.
+        ruleset: The ruleset to calculate in.
+        base_mods: Acronyms of the mods applied at every grid point. Rate mods and
+            DA cannot be combined with the rates and overrides of the sweep.
+        rates: The playback rates.
+        da_overrides: Values per Difficulty Adjust setting (see
+            ``DIFFICULTY_ADJUST_SETTINGS``). Every combination is evaluated.
+        accuracies: The accuracies to calculate performance at, as in
+            :func:`osu_native_py.accuracy.score_for_accuracy`.
+        mods_cache: A cache to take mods collections from, not shared with other
+            threads. A cache is created for the call when not given.
+        processes: The number of worker processes to split the grid across, or
+            None for one per CPU. Workers are spawned for the call and the beatmap
+            is pickled to each of them, so it must have been loaded with
+            ``from_file`` or ``from_text``, and ``mods_cache`` is not used.
+
+    Returns:
+        Columns of equal length, one row per rate, override combination and
+        accuracy: ``rate``, one column per overridden setting, ``accuracy``,
+        ``star_rating``, ``max_combo`` and ``pp``.
+
+    Raises:
+        ValueError: If ``base_mods`` conflict with the grid or a setting is unknown.
+        RuntimeError: If a mod cannot be created or a calculation fails.
+    """
+    base_mods = tuple(acronym.upper() for acronym in base_mods)
+    rates = tuple(float(rate) for rate in rates)
+    overrides = dict(da_overrides or {})
+
+    unknown = set(overrides) - set(DIFFICULTY_ADJUST_SETTINGS)
+    if unknown:
+        raise ValueError(f"Unknown Difficulty Adjust settings: {', '.join(sorted(unknown))}")
+    if rates != (1.0,) and _RATE_ACRONYMS.intersection(base_mods):
+        raise ValueError("base_mods already contain a rate mod")
+    if overrides and "DA" in base_mods:
+        raise ValueError("base_mods already contain Difficulty Adjust")
+
+    names = list(overrides)
+    points = [
+        (rate, tuple(zip(names, values)))
+        for rate in rates
+        for values in itertools.product(*(overrides[name] for name in names))
+    ]
+    accuracies = tuple(accuracies)
+
+    workers = processes if processes is not None else os.cpu_count() or 1
+    if workers <= 1 or len(points) <= 1:
+        rows = _sweep_points(ruleset, beatmap, base_mods, points, accuracies, mods_cache)
+    else:
+        chunk = -(-len(points) // workers)
+        chunks = [points[start : start + chunk] for start in range(0, len(points), chunk)]
+        ruleset_id = ruleset.ruleset_id
+        rows = []
+        # Forking a process that has started the native runtime is unsafe.
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(len(chunks), mp_context=context) as executor:
+            futures = [
+                executor.submit(_sweep_worker, beatmap, ruleset_id, base_mods, part, accuracies)
+                for part in chunks
+            ]
+            for future in futures:
+                rows.extend(future.result())
+
+    columns: Dict[str, list] = {"rate": [], **{name: [] for name in names}}
+    columns.update(accuracy=[], star_rating=[], max_combo=[], pp=[])
+    for (rate, settings), accuracy, star_rating, max_combo, pp in rows:
+        columns["rate"].append(rate)
+        for name, value in settings:
+            columns[name].append(value)
+        columns["accuracy"].append(accuracy)
+        columns["star_rating"].append(star_rating)
+        columns["max_combo"].append(max_combo)
+        columns["pp"].append(pp)
+
+    return columns
+
+
+_Point = Tuple[float, Settings]
+_Row = Tuple[_Point, float, float, int, float]
+
+
+def _sweep_points(
+    ruleset: Ruleset,
+    beatmap: Beatmap,
+    base_mods: Tuple[str, ...],
+    points: List[_Point],
+    accuracies: Tuple[float, ...],
+    mods_cache: Optional[ModsCache],
+) -> List[_Row]:
+    cache = mods_cache if mods_cache is not None else ModsCache(max(len(points), 1))
+    rows: List[_Row] = []
+
+    try:
+        with create_difficulty_calculator(ruleset, beatmap) as difficulty_calculator:
+            with create_performance_calculator(ruleset) as performance_calculator:
+                for point in points:
+                    mods = cache.get(base_mods, *point)
+                    difficulty = difficulty_calculator.calculate(mods)
+                    scores = [score_for_accuracy(difficulty, accuracy) for accuracy in accuracies]
+                    results = performance_calculator.calculate_many(
+                        ruleset, beatmap, mods, scores, difficulty
+                    )
+                    for accuracy, performance in zip(accuracies, results):
+                        rows.append(
+                            (
+                                point,
+                                accuracy,
+                                difficulty.star_rating,
+                                difficulty.max_combo,
+                                performance.total,
+                            ),
+                        )
+    finally:
+        if mods_cache is None:
+            cache.close()
+
+    return rows
+
+
+def _sweep_worker(
+    beatmap: Beatmap,
+    ruleset_id: int,
+    base_mods: Tuple[str, ...],
+    points: List[_Point],
+    accuracies: Tuple[float, ...],
+) -> List[_Row]:
+    with beatmap, Ruleset.from_id(ruleset_id) as ruleset:
+        return _sweep_points(ruleset, beatmap, base_mods, points, accuracies, None)
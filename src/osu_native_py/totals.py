@@ -0,0 +1,378 @@
+"""Weighted total pp of a player's top plays.
+
+A player's total pp is the sum of their scores sorted by pp, each weighted by
+``0.95 ** rank``, plus a bonus for the number of scores set::
+
+    total = sum(pp[i] * 0.95 ** i for i in range(min(len(pp), 1000)))
+            + 416.6667 * (1 - 0.995 ** min(len(pp), 1000))
+
+:class:`TopPlays` keeps one player's plays in a treap ordered by pp. Each node
+stores the weighted sum of its subtree, so inserting, replacing or removing a play
+and reading the new total all take O(log n), with nothing re-summed.
+:class:`ProfileTotals` keeps one :class:`TopPlays` per player.
+
+Example::
+
+    from osu_native_py.totals import ProfileTotals
+
+    totals = ProfileTotals.from_arrays(user_ids, beatmap_ids, pp)
+    new_total = totals.add(user_id, beatmap_id, recalculated_pp)
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Any
+from typing import Dict
+from typing import Hashable
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+DEFAULT_WEIGHT = 0.95
+DEFAULT_LIMIT = 1000
+BONUS_MAX = 416.6667
+BONUS_DECAY = 0.995
+
+
+def bonus_pp(score_count: int) -> float:
+    """Return the bonus pp awarded for setting ``score_count`` scores."""
+    return BONUS_MAX * (1 - BONUS_DECAY ** min(score_count, DEFAULT_LIMIT))
+
+
+class _Node:
+    __slots__ = ("key", "order", "pp", "priority", "left", "right", "size", "weighted")
+
+    def __init__(self, key: Hashable, order: Tuple[float, int], pp: float, priority: float):
+        self.key = key
+        self.order = order
+        self.pp = pp
+        self.priority = priority
+        self.left: Optional[_Node] = None
+        self.right: Optional[_Node] = None
+        self.size = 1
+        self.weighted = pp
+
+
+class TopPlays:
+    """One player's plays, ordered by pp, with an incrementally maintained total.
+
+    Plays are identified by a key, typically the beatmap ID, so adding a play
+    with an existing key replaces it.
+
+    Args:
+        weight: The weight decay per rank.
+        limit: How many of the best plays count towards the weighted sum.
+        bonus: Whether ``total`` includes :func:`bonus_pp`.
+    """
+
+    def __init__(
+        self,
+        weight: float = DEFAULT_WEIGHT,
+        limit: int = DEFAULT_LIMIT,
+        bonus: bool = True,
+    ):
+        self.weight = weight
+        self.limit = limit
+        self.bonus = bonus
+        self._root: Optional[_Node] = None
+        self._nodes: Dict[Hashable, _Node] = {}
+        self._powers = [1.0]
+        self._sequence = 0
+        self._random = random.Random()
+
+    @classmethod
+    def from_arrays(cls, keys: Any, pp: Any, **kwargs: Any) -> TopPlays:
+        """Build from parallel sequences or NumPy arrays of keys and pp, sorting once.
+
+        Later duplicates of a key replace earlier ones.
+        """
+        keys = keys.tolist() if hasattr(keys, "tolist") else list(keys)
+        pp = pp.tolist() if hasattr(pp, "tolist") else list(pp)
+        if len(keys) != len(pp):
+            raise ValueError(f"Got {len(keys)} keys but {len(pp)} pp values")
+
+        plays = cls(**kwargs)
+        latest = dict(zip(keys, pp))
+        ordered = sorted(latest.items(), key=lambda item: -item[1])
+
+        nodes = []
+        for key, value in ordered:
+            node = _Node(key, (-value, plays._sequence), value, 0.0)
+            plays._sequence += 1
+            plays._nodes[key] = node
+            nodes.append(node)
+
+        plays._ensure_powers(len(nodes))
+        plays._root = plays._build(nodes, 0, len(nodes))
+        plays._assign_priorities()
+        return plays
+
+    @property
+    def weighted(self) -> float:
+        """The weighted sum of the best ``limit`` plays."""
+        if len(self._nodes) <= self.limit:
+            return self._root.weighted if self._root is not None else 0.0
+        return self._prefix(self._root, self.limit)
+
+    @property
+    def total(self) -> float:
+        """The weighted sum plus, if enabled, the bonus pp."""
+        if self.bonus:
+            return self.weighted + bonus_pp(len(self._nodes))
+        return self.weighted
+
+    def add(self, key: Hashable, pp: float) -> float:
+        """Insert a play, replacing any play with the same key.
+
+        Returns:
+            The new total.
+        """
+        existing = self._nodes.get(key)
+        if existing is not None:
+            self._root = self._delete(self._root, existing.order)
+
+        node = _Node(key, (-pp, self._sequence), pp, self._random.random())
+        self._sequence += 1
+        self._nodes[key] = node
+        self._ensure_powers(len(self._nodes))
+
+        left, right = self._split(self._root, node.order)
+        self._root = self._merge(self._merge(left, node), right)
+        return self.total
+
+    def remove(self, key: Hashable) -> float:
+        """Remove a play.
+
+        Returns:
+            The new total.
+
+        Raises:
+            KeyError: If there is no play with the key.
+        """
+        node = self._nodes.pop(key)
+        self._root = self._delete(self._root, node.order)
+        return self.total
+
+    def get(self, key: Hashable) -> Optional[float]:
+        """Return the pp of a play, or None if there is no play with the key."""
+        node = self._nodes.get(key)
+        return node.pp if node is not None else None
+
+    def top(self, count: Optional[int] = None) -> List[Tuple[Hashable, float]]:
+        """Return ``(key, pp)`` of the best plays, best first."""
+        result: List[Tuple[Hashable, float]] = []
+        limit = len(self._nodes) if count is None else count
+        stack: List[_Node] = []
+        node = self._root
+
+        while (stack or node is not None) and len(result) < limit:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            result.append((node.key, node.pp))
+            node = node.right
+
+        return result
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._nodes
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return (key for key, _ in self.top())
+
+    def __repr__(self) -> str:
+        return f"<TopPlays plays={len(self._nodes)} total={self.total:.2f}>"
+
+    def _ensure_powers(self, size: int) -> None:
+        powers = self._powers
+        while len(powers) <= size:
+            powers.append(powers[-1] * self.weight)
+
+    def _update(self, node: _Node) -> None:
+        left, right = node.left, node.right
+        left_size = left.size if left is not None else 0
+        weighted = left.weighted if left is not None else 0.0
+        tail = node.pp
+        size = left_size + 1
+
+        if right is not None:
+            tail += self.weight * right.weighted
+            size += right.size
+
+        node.size = size
+        node.weighted = weighted + self._powers[left_size] * tail
+
+    def _prefix(self, node: Optional[_Node], count: int) -> float:
+        """The weighted sum of the first ``count`` plays of a subtree."""
+        total = 0.0
+        offset = 0
+
+        while node is not None and count > 0:
+            left = node.left
+            left_size = left.size if left is not None else 0
+
+            if count <= left_size:
+                node = left
+                continue
+
+            if left is not None:
+                total += self._powers[offset] * left.weighted
+            total += self._powers[offset + left_size] * node.pp
+            offset += left_size + 1
+            count -= left_size + 1
+            node = node.right
+
+        return total
+
+    def _split(self, node: Optional[_Node], order: Tuple[float, int]):
+        """Split a subtree into the plays ordered before ``order`` and the rest."""
+        if node is None:
+            return None, None
+
+        if node.order < order:
+            node.right, right = self._split(node.right, order)
+            self._update(node)
+            return node, right
+
+        left, node.left = self._split(node.left, order)
+        self._update(node)
+        return left, node
+
+    def _merge(self, left: Optional[_Node], right: Optional[_Node]) -> Optional[_Node]:
+        if left is None:
+            return right
+        if right is None:
+            return left
+
+        if left.priority > right.priority:
+            left.right = self._merge(left.right, right)
+            self._update(left)
+            return left
+
+        right.left = self._merge(left, right.left)
+        self._update(right)
+        return right
+
+    def _delete(self, node: Optional[_Node], order: Tuple[float, int]) -> Optional[_Node]:
+        if node is None:
+            return None
+
+        if node.order == order:
+            return self._merge(node.left, node.right)
+
+        if order < node.order:
+            node.left = self._delete(node.left, order)
+        else:
+            node.right = self._delete(node.right, order)
+
+        self._update(node)
+        return node
+
+    def _build(self, nodes: List[_Node], start: int, end: int) -> Optional[_Node]:
+        if start >= end:
+            return None
+
+        middle = (start + end) // 2
+        node = nodes[middle]
+        node.left = self._build(nodes, start, middle)
+        node.right = self._build(nodes, middle + 1, end)
+        self._update(node)
+        return node
+
+    def _assign_priorities(self) -> None:
+        """Give a balanced tree random priorities that respect the heap order."""
+        priorities = sorted((self._random.random() for _ in self._nodes), reverse=True)
+        level: List[_Node] = [self._root] if self._root is not None else []
+        index = 0
+
+        while level:
+            following: List[_Node] = []
+            for node in level:
+                node.priority = priorities[index]
+                index += 1
+                following.extend(child for child in (node.left, node.right) if child is not None)
+            level = following
+
+
+class ProfileTotals:
+    """Top plays and totals for many players.
+
+    Args:
+        **kwargs: Passed to every player's :class:`TopPlays`.
+    """
+
+    def __init__(self, **kwargs: Any):
+        self._options = kwargs
+        self._players: Dict[Hashable, TopPlays] = {}
+
+    @classmethod
+    def from_arrays(cls, user_ids: Any, keys: Any, pp: Any, **kwargs: Any) -> ProfileTotals:
+        """Build from parallel sequences or NumPy arrays of user IDs, keys and pp."""
+        user_ids = user_ids.tolist() if hasattr(user_ids, "tolist") else list(user_ids)
+        keys = keys.tolist() if hasattr(keys, "tolist") else list(keys)
+        pp = pp.tolist() if hasattr(pp, "tolist") else list(pp)
+        if not len(user_ids) == len(keys) == len(pp):
+            raise ValueError("user_ids, keys and pp must have the same length")
+
+        grouped: Dict[Hashable, Tuple[list, list]] = {}
+        for user_id, key, value in zip(user_ids, keys, pp):
+            user_keys, user_pp = grouped.setdefault(user_id, ([], []))
+            user_keys.append(key)
+            user_pp.append(value)
+
+        totals = cls(**kwargs)
+        for user_id, (user_keys, user_pp) in grouped.items():
+            totals._players[user_id] = TopPlays.from_arrays(user_keys, user_pp, **kwargs)
+        return totals
+
+    def player(self, user_id: Hashable) -> TopPlays:
+        """Return a player's top plays, creating an empty entry if needed."""
+        plays = self._players.get(user_id)
+        if plays is None:
+            plays = self._players[user_id] = TopPlays(**self._options)
+        return plays
+
+    def add(self, user_id: Hashable, key: Hashable, pp: float) -> float:
+        """Insert or replace a play. Returns the player's new total."""
+        return self.player(user_id).add(key, pp)
+
+    def remove(self, user_id: Hashable, key: Hashable) -> float:
+        """Remove a play. Returns the player's new total.
+
+        Raises:
+            KeyError: If the player has no play with the key.
+        """
+        return self._players[user_id].remove(key)
+
+    def total(self, user_id: Hashable) -> float:
+        """Return a player's total, or 0 for unknown players."""
+        plays = self._players.get(user_id)
+        return plays.total if plays is not None else 0.0
+
+    def totals(self) -> Dict[Hashable, float]:
+        """Return the total of every player."""
+        return {user_id: plays.total for user_id, plays in self._players.items()}
+
+    def __len__(self) -> int:
+        return len(self._players)
+
+    def __contains__(self, user_id: object) -> bool:
+        return user_id in self._players
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._players)
+
+
+def weighted_total(
+    pp: Iterable[float], weight: float = DEFAULT_WEIGHT, limit: int = DEFAULT_LIMIT
+) -> float:
+    """Return the weighted sum of pp values by sorting them, without the bonus."""
+    ordered = sorted(pp, reverse=True)[:limit]
+    return sum(value * weight**rank for rank, value in enumerate(ordered))
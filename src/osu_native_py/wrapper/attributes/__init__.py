@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from .collector import AttributeCollector
 from .difficulty.base import DifficultyAttributes
 from .difficulty.catch import CatchDifficultyAttributes
 from .difficulty.mania import ManiaDifficultyAttributes
@@ -10,8 +11,10 @@ from .performance.catch import CatchPerformanceAttributes
 from .performance.mania import ManiaPerformanceAttributes
 from .performance.osu import OsuPerformanceAttributes
 from .performance.taiko import TaikoPerformanceAttributes
+from .windowed import WindowedDifficulty
 
 __all__ = [
+    "AttributeCollector",
     "DifficultyAttributes",
     "OsuDifficultyAttributes",
     "TaikoDifficultyAttributes",
@@ -22,4 +25,5 @@ __all__ = [
     "TaikoPerformanceAttributes",
     "CatchPerformanceAttributes",
     "ManiaPerformanceAttributes",
+    "WindowedDifficulty",
 ]
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import fields
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Type
+from typing import Union
+from typing import get_type_hints
+
+from .difficulty.base import DifficultyAttributes
+from .performance.base import PerformanceAttributes
+
+AttributesType = Union[Type[DifficultyAttributes], Type[PerformanceAttributes]]
+
+_TYPECODES = {float: ("d", "float64"), int: ("q", "int64")}
+
+
+class _Column:
+    __slots__ = ("name", "typecode", "dtype", "missing", "values", "mask")
+
+    def __init__(self, name: str, field_type: Any, capacity: int):
+        optional = getattr(field_type, "__args__", None)
+        if optional is not None:
+            field_type = next(arg for arg in optional if arg is not type(None))
+
+        self.name = name
+        self.typecode, self.dtype = _TYPECODES[field_type]
+        self.missing = float("nan") if field_type is float else 0
+        self.values = array(self.typecode, bytes(capacity * array(self.typecode).itemsize))
+        self.mask: Optional[array] = None if optional is None else array("b", bytes(capacity))
+
+    def grow(self, capacity: int) -> None:
+        self.values.extend(array(self.typecode, bytes(capacity * self.values.itemsize)))
+        if self.mask is not None:
+            self.mask.extend(bytes(capacity))
+
+    def export(self, np: Any, size: int) -> Any:
+        return np.frombuffer(self.values, dtype=self.dtype, count=size).copy()
+
+    def export_mask(self, np: Any, size: int) -> Any:
+        return np.frombuffer(self.mask, dtype=np.bool_, count=size).copy()
+
+
+class AttributeCollector:
+    """Accumulates difficulty or performance attributes into typed columns.
+
+    Each field of the attributes class is stored in a preallocated ``array.array``
+    that doubles when full, so collecting many results keeps no per-result Python
+    objects alive. Optional fields get an extra mask column that is set where the
+    value is ``None``. Exporting requires NumPy.
+
+    Example::
+
+        collector = AttributeCollector(OsuDifficultyAttributes)
+        for mods in mod_combinations:
+            collector.add(diff_calc.calculate(mods))
+
+        frame = pandas.DataFrame(collector.to_dict(masked=False))
+    """
+
+    def __init__(self, attributes_type: AttributesType, capacity: int = 1024):
+        hints = get_type_hints(attributes_type)
+        capacity = max(capacity, 1)
+
+        self.attributes_type = attributes_type
+        self._columns: List[_Column] = [
+            _Column(field.name, hints[field.name], capacity) for field in fields(attributes_type)
+        ]
+        self._capacity = capacity
+        self._size = 0
+
+    @property
+    def columns(self) -> List[str]:
+        """The field names, in declaration order."""
+        return [column.name for column in self._columns]
+
+    @property
+    def optional_columns(self) -> List[str]:
+        """The names of the fields that can be ``None``."""
+        return [column.name for column in self._columns if column.mask is not None]
+
+    def add(self, attributes: Union[DifficultyAttributes, PerformanceAttributes]) -> None:
+        """Append one result.
+
+        Raises:
+            TypeError: If ``attributes`` is not an instance of the collected type.
+        """
+        if not isinstance(attributes, self.attributes_type):
+            raise TypeError(
+                f"Expected {self.attributes_type.__name__}, got {type(attributes).__name__}",
+            )
+
+        index = self._size
+        if index == self._capacity:
+            for column in self._columns:
+                column.grow(self._capacity)
+            self._capacity *= 2
+
+        for column in self._columns:
+            value = getattr(attributes, column.name)
+            if column.mask is not None:
+                column.mask[index] = value is None
+                if value is None:
+                    value = column.missing
+            column.values[index] = value
+
+        self._size = index + 1
+
+    def extend(self, results: Iterable[Union[DifficultyAttributes, PerformanceAttributes]]) -> None:
+        """Append several results. See :meth:`add`."""
+        for attributes in results:
+            self.add(attributes)
+
+    def clear(self) -> None:
+        """Forget all results, keeping the allocated capacity."""
+        self._size = 0
+
+    def to_dict(self, masked: bool = True) -> Dict[str, Any]:
+        """Export the results as a dict of NumPy arrays keyed by field name.
+
+        Args:
+            masked: Return optional fields as ``numpy.ma.MaskedArray``. When False,
+                optional fields are plain arrays (NaN or 0 where missing) and their
+                masks are returned under ``<name>_mask``.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        from ..utils.columnar import import_numpy  # deferred to avoid an import cycle
+
+        np = import_numpy()
+        size = self._size
+        result: Dict[str, Any] = {}
+
+        for column in self._columns:
+            values = column.export(np, size)
+            if column.mask is None:
+                result[column.name] = values
+            elif masked:
+                result[column.name] = np.ma.MaskedArray(values, column.export_mask(np, size))
+            else:
+                result[column.name] = values
+                result[f"{column.name}_mask"] = column.export_mask(np, size)
+
+        return result
+
+    def to_records(self) -> Any:
+        """Export the results as a NumPy record array.
+
+        Optional fields are followed by a boolean ``<name>_mask`` field.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        from ..utils.columnar import import_numpy  # deferred to avoid an import cycle
+
+        np = import_numpy()
+        columns = self.to_dict(masked=False)
+        return np.rec.fromarrays(list(columns.values()), names=list(columns))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self) -> str:
+        return f"<AttributeCollector {self.attributes_type.__name__} size={self._size}>"
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from ...slots import slotted_dataclass
 
 
-@dataclass
+@slotted_dataclass
 class DifficultyAttributes:
     """Base class for difficulty attributes.
 
@@ -1,12 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-
 from ....native import NativeCatchDifficultyAttributes
+from ...slots import slotted_dataclass
 from .base import DifficultyAttributes
 
 
-@dataclass
+@slotted_dataclass
 class CatchDifficultyAttributes(DifficultyAttributes):
     """Difficulty attributes for osu!catch mode.
 
@@ -19,3 +18,9 @@ class CatchDifficultyAttributes(DifficultyAttributes):
             star_rating=native.starRating,
             max_combo=native.maxCombo,
         )
+
+    def to_native(self) -> NativeCatchDifficultyAttributes:
+        native = NativeCatchDifficultyAttributes()
+        native.starRating = self.star_rating
+        native.maxCombo = self.max_combo
+        return native
@@ -1,12 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-
 from ....native import NativeManiaDifficultyAttributes
+from ...slots import slotted_dataclass
 from .base import DifficultyAttributes
 
 
-@dataclass
+@slotted_dataclass
 class ManiaDifficultyAttributes(DifficultyAttributes):
     """Difficulty attributes for osu!mania mode.
 
@@ -19,3 +18,9 @@ class ManiaDifficultyAttributes(DifficultyAttributes):
             star_rating=native.starRating,
             max_combo=native.maxCombo,
         )
+
+    def to_native(self) -> NativeManiaDifficultyAttributes:
+        native = NativeManiaDifficultyAttributes()
+        native.starRating = self.star_rating
+        native.maxCombo = self.max_combo
+        return native
@@ -1,12 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-
 from ....native import NativeOsuDifficultyAttributes
+from ...slots import slotted_dataclass
 from .base import DifficultyAttributes
 
 
-@dataclass
+@slotted_dataclass
 class OsuDifficultyAttributes(DifficultyAttributes):
     """Difficulty attributes for osu!standard mode.
 
@@ -84,3 +83,27 @@ class OsuDifficultyAttributes(DifficultyAttributes):
             slider_count=native.sliderCount,
             spinner_count=native.spinnerCount,
         )
+
+    def to_native(self) -> NativeOsuDifficultyAttributes:
+        native = NativeOsuDifficultyAttributes()
+        native.starRating = self.star_rating
+        native.maxCombo = self.max_combo
+        native.aimDifficulty = self.aim_difficulty
+        native.aimDifficultSliderCount = self.aim_difficult_slider_count
+        native.speedDifficulty = self.speed_difficulty
+        native.speedNoteCount = self.speed_note_count
+        native.flashlightDifficulty = self.flashlight_difficulty
+        native.readingDifficulty = self.reading_difficulty
+        native.sliderFactor = self.slider_factor
+        native.aimTopWeightedSliderFactor = self.aim_top_weighted_slider_factor
+        native.speedTopWeightedSliderFactor = self.speed_top_weighted_slider_factor
+        native.aimDifficultStrainCount = self.aim_difficult_strain_count
+        native.speedDifficultStrainCount = self.speed_difficult_strain_count
+        native.readingDifficultNoteCount = self.reading_difficult_note_count
+        native.nestedScorePerObject = self.nested_score_per_object
+        native.legacyScoreBaseMultiplier = self.legacy_score_base_multiplier
+        native.maximumLegacyComboScore = self.maximum_legacy_combo_score
+        native.hitCircleCount = self.hit_circle_count
+        native.sliderCount = self.slider_count
+        native.spinnerCount = self.spinner_count
+        return native
@@ -1,12 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-
 from ....native import NativeTaikoDifficultyAttributes
+from ...slots import slotted_dataclass
 from .base import DifficultyAttributes
 
 
-@dataclass
+@slotted_dataclass
 class TaikoDifficultyAttributes(DifficultyAttributes):
     """Difficulty attributes for osu!taiko mode.
 
@@ -46,3 +45,17 @@ class TaikoDifficultyAttributes(DifficultyAttributes):
             consistency_factor=native.consistencyFactor,
             stamina_top_strains=native.staminaTopStrains,
         )
+
+    def to_native(self) -> NativeTaikoDifficultyAttributes:
+        native = NativeTaikoDifficultyAttributes()
+        native.starRating = self.star_rating
+        native.maxCombo = self.max_combo
+        native.mechanicalDifficulty = self.mechanical_difficulty
+        native.rhythmDifficulty = self.rhythm_difficulty
+        native.readingDifficulty = self.reading_difficulty
+        native.colourDifficulty = self.colour_difficulty
+        native.staminaDifficulty = self.stamina_difficulty
+        native.monoStaminaFactor = self.mono_stamina_factor
+        native.consistencyFactor = self.consistency_factor
+        native.staminaTopStrains = self.stamina_top_strains
+        return native
@@ -1,12 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-
 from ....native import NativeCatchPerformanceAttributes
+from ...slots import slotted_dataclass
 from .base import PerformanceAttributes
 
 
-@dataclass
+@slotted_dataclass
 class CatchPerformanceAttributes(PerformanceAttributes):
     """Performance attributes for osu!catch mode.
 
@@ -1,12 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-
 from ....native import NativeManiaPerformanceAttributes
+from ...slots import slotted_dataclass
 from .base import PerformanceAttributes
 
 
-@dataclass
+@slotted_dataclass
 class ManiaPerformanceAttributes(PerformanceAttributes):
     """Performance attributes for osu!mania mode.
 
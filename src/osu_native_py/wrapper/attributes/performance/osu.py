@@ -1,13 +1,13 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
 from typing import Optional
 
 from ....native import NativeOsuPerformanceAttributes
+from ...slots import slotted_dataclass
 from .base import PerformanceAttributes
 
 
-@dataclass
+@slotted_dataclass
 class OsuPerformanceAttributes(PerformanceAttributes):
     """Performance attributes for osu!standard mode.
 
@@ -1,13 +1,13 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
 from typing import Optional
 
 from ....native import NativeTaikoPerformanceAttributes
+from ...slots import slotted_dataclass
 from .base import PerformanceAttributes
 
 
-@dataclass
+@slotted_dataclass
 class TaikoPerformanceAttributes(PerformanceAttributes):
     """Performance attributes for osu!taiko mode.
 
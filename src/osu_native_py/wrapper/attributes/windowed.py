@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from array import array
+from typing import Dict
+from typing import List
+
+
+class WindowedDifficulty:
+    """Difficulty attributes of a sliding window over a beatmap, section by section.
+
+    These are the star rating and skill difficulties of the hit objects inside
+    each window, calculated as if they were a beatmap of their own, with no
+    strain history from earlier objects. They are not the strains the full
+    difficulty calculation accumulates and are no substitute for a strain
+    timeline.
+
+    Attributes:
+        times: The end time of each section in milliseconds, in beatmap time (not
+            adjusted for rate-changing mods).
+        skills: One value per section for each skill, keyed by the name of the
+            difficulty attribute the values are taken from.
+    """
+
+    __slots__ = ("times", "skills")
+
+    def __init__(self, times: array, skills: Dict[str, array]):
+        self.times = times
+        self.skills = skills
+
+    def to_dict(self) -> Dict[str, List[float]]:
+        """Return ``time`` and every skill as lists."""
+        result = {"time": self.times.tolist()}
+        result.update((name, values.tolist()) for name, values in self.skills.items())
+        return result
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def __repr__(self) -> str:
+        return f"<WindowedDifficulty sections={len(self.times)} skills={list(self.skills)}>"
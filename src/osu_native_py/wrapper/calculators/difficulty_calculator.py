@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import time
 from abc import ABC
 from abc import abstractmethod
+from array import array
 from ctypes import byref
+from typing import List
+from typing import Optional
+from typing import Tuple
 from typing import Union
 
 from ...native import NativeCatchDifficultyCalculator
@@ -15,10 +20,13 @@ from ..attributes.difficulty import DifficultyAttributes
 from ..attributes.difficulty import ManiaDifficultyAttributes
 from ..attributes.difficulty import OsuDifficultyAttributes
 from ..attributes.difficulty import TaikoDifficultyAttributes
+from ..attributes.windowed import WindowedDifficulty
 from ..objects import Beatmap
 from ..objects import ModsCollection
 from ..objects import Ruleset
+from ..utils import slow_log
 from ..utils.native_handler import NativeHandler
+from ..utils.osu_text import HitObjectText
 
 
 class DifficultyCalculator(NativeHandler, ABC):
@@ -28,6 +36,9 @@ class DifficultyCalculator(NativeHandler, ABC):
     This is an abstract base class that must be subclassed for each game mode.
     """
 
+    # The difficulty attributes reported per section by windowed_difficulty.
+    _windowed_skills: Tuple[str, ...] = ("star_rating",)
+
     def __init__(
         self,
         handle: Union[
@@ -36,10 +47,23 @@ class DifficultyCalculator(NativeHandler, ABC):
             NativeCatchDifficultyCalculator,
             NativeManiaDifficultyCalculator,
         ],
+        ruleset: Optional[Ruleset] = None,
+        beatmap: Optional[Beatmap] = None,
     ):
         super().__init__(handle)
+        self._ruleset = ruleset
+        self._beatmap = beatmap
+
+    @property
+    def ruleset(self) -> Optional[Ruleset]:
+        """The ruleset the calculator was created for, if known."""
+        return self._ruleset
+
+    @property
+    def beatmap(self) -> Optional[Beatmap]:
+        """The beatmap the calculator was created for, if known."""
+        return self._beatmap
 
-    @abstractmethod
     def calculate(self, mods: ModsCollection) -> DifficultyAttributes:
         """Calculate the difficulty of the beatmap with the given mods.
 
@@ -48,12 +72,126 @@ class DifficultyCalculator(NativeHandler, ABC):
 
         Returns:
             A structure describing the difficulty of the beatmap.
+
+        Raises:
+            RuntimeError: If the calculator is closed or the calculation fails.
+        """
+        self._check_not_closed()
+
+        log = slow_log.active_log()
+        if log is None:
+            return self._calculate(mods)
+
+        start = time.perf_counter()
+        attributes = self._calculate(mods)
+        duration = time.perf_counter() - start
+        log.observe("difficulty", duration, self._beatmap, self._ruleset, mods, attributes)
+
+        return attributes
+
+    def windowed_difficulty(
+        self,
+        mods: ModsCollection,
+        section_length: float = 5000.0,
+        window: float = 10000.0,
+    ) -> WindowedDifficulty:
+        """Calculate the difficulty of a sliding window over the beatmap.
+
+        These values are not the strains of the full difficulty calculation and
+        must not be used as a strain timeline. The native library only exposes
+        final difficulty attributes, so every section is loaded from text and
+        calculated as a beatmap of its own: the values of a section are the
+        difficulty attributes of the hit objects that start in the ``window``
+        milliseconds before its end. Each window starts with no strain history
+        from the objects before it, so sections differ from the strains the full
+        calculation would reach at the same time, and their peaks do not add up
+        to the beatmap's star rating.
+
+        This is expensive. Each section whose window differs from the previous
+        one loads a new beatmap from text and runs a full difficulty calculation
+        on it, so the cost grows with the drain length divided by
+        ``section_length``, times the cost of calculating ``window`` milliseconds
+        of the map. Keep ``section_length`` coarse.
+
+        Args:
+            mods: The mods to apply to the beatmap.
+            section_length: The length of each section in milliseconds.
+            window: How far back from the end of a section hit objects are included.
+
+        Returns:
+            The end time and attribute values of each section, from the first hit
+            object to the last.
+
+        Raises:
+            RuntimeError: If the calculator is closed, was not created with a ruleset
+                and beatmap, or a calculation fails.
+            ValueError: If ``section_length`` or ``window`` is not positive.
         """
+        self._check_not_closed()
+        if self._ruleset is None or self._beatmap is None:
+            raise RuntimeError("windowed_difficulty requires a calculator created from a beatmap")
+        if section_length <= 0 or window <= 0:
+            raise ValueError("section_length and window must be positive")
+
+        hit_objects = HitObjectText.parse(self._beatmap.text())
+        times = array("d")
+        columns = [array("d") for _ in self._windowed_skills]
+
+        if hit_objects:
+            first, last = hit_objects.times[0], hit_objects.times[-1]
+            previous = None
+            values: List[float] = []
+            section = 1
+
+            while True:
+                end = first + section * section_length
+                objects = (hit_objects.index_at(end - window), hit_objects.index_at(end))
+                if objects != previous:
+                    values = self._section_values(hit_objects, *objects, mods)
+                    previous = objects
+
+                times.append(end)
+                for column, value in zip(columns, values):
+                    column.append(value)
+
+                if end > last:
+                    break
+                section += 1
+
+        return WindowedDifficulty(times, dict(zip(self._windowed_skills, columns)))
+
+    def _section_values(
+        self,
+        hit_objects: HitObjectText,
+        start: int,
+        stop: int,
+        mods: ModsCollection,
+    ) -> List[float]:
+        if start == stop:
+            return [0.0] * len(self._windowed_skills)
+
+        with Beatmap.from_text(hit_objects.text(start, stop)) as beatmap:
+            with type(self).create(self._ruleset, beatmap) as calculator:  # type: ignore
+                attributes = calculator._calculate(mods)
+
+        return [float(getattr(attributes, name)) for name in self._windowed_skills]
+
+    @abstractmethod
+    def _calculate(self, mods: ModsCollection) -> DifficultyAttributes:
+        """Run the native calculation."""
 
 
 class OsuDifficultyCalculator(DifficultyCalculator):
     """Difficulty calculator for osu!standard mode."""
 
+    _windowed_skills = (
+        "star_rating",
+        "aim_difficulty",
+        "speed_difficulty",
+        "reading_difficulty",
+        "flashlight_difficulty",
+    )
+
     @classmethod
     def create(cls, ruleset: Ruleset, beatmap: Beatmap) -> OsuDifficultyCalculator:
         native_calc = bindings.NativeOsuDifficultyCalculator()
@@ -63,11 +201,9 @@ class OsuDifficultyCalculator(DifficultyCalculator):
             byref(native_calc),
         )
         cls.check_error(result, "create OsuDifficultyCalculator")
-        return cls(native_calc)
-
-    def calculate(self, mods: ModsCollection) -> OsuDifficultyAttributes:
-        self._check_not_closed()
+        return cls(native_calc, ruleset, beatmap)
 
+    def _calculate(self, mods: ModsCollection) -> OsuDifficultyAttributes:
         native_diff = bindings.NativeOsuDifficultyAttributes()
         result = bindings.OsuDifficultyCalculator_Calculate(
             self.handle,
@@ -85,6 +221,14 @@ class OsuDifficultyCalculator(DifficultyCalculator):
 class TaikoDifficultyCalculator(DifficultyCalculator):
     """Difficulty calculator for osu!taiko mode."""
 
+    _windowed_skills = (
+        "star_rating",
+        "colour_difficulty",
+        "rhythm_difficulty",
+        "stamina_difficulty",
+        "reading_difficulty",
+    )
+
     @classmethod
     def create(cls, ruleset: Ruleset, beatmap: Beatmap) -> TaikoDifficultyCalculator:
         native_calc = bindings.NativeTaikoDifficultyCalculator()
@@ -94,11 +238,9 @@ class TaikoDifficultyCalculator(DifficultyCalculator):
             byref(native_calc),
         )
         cls.check_error(result, "create TaikoDifficultyCalculator")
-        return cls(native_calc)
-
-    def calculate(self, mods: ModsCollection) -> TaikoDifficultyAttributes:
-        self._check_not_closed()
+        return cls(native_calc, ruleset, beatmap)
 
+    def _calculate(self, mods: ModsCollection) -> TaikoDifficultyAttributes:
         native_diff = bindings.NativeTaikoDifficultyAttributes()
         result = bindings.TaikoDifficultyCalculator_Calculate(
             self.handle,
@@ -125,11 +267,9 @@ class CatchDifficultyCalculator(DifficultyCalculator):
             byref(native_calc),
         )
         cls.check_error(result, "create CatchDifficultyCalculator")
-        return cls(native_calc)
-
-    def calculate(self, mods: ModsCollection) -> CatchDifficultyAttributes:
-        self._check_not_closed()
+        return cls(native_calc, ruleset, beatmap)
 
+    def _calculate(self, mods: ModsCollection) -> CatchDifficultyAttributes:
         native_diff = bindings.NativeCatchDifficultyAttributes()
         result = bindings.CatchDifficultyCalculator_Calculate(
             self.handle,
@@ -156,11 +296,9 @@ class ManiaDifficultyCalculator(DifficultyCalculator):
             byref(native_calc),
         )
         cls.check_error(result, "create ManiaDifficultyCalculator")
-        return cls(native_calc)
-
-    def calculate(self, mods: ModsCollection) -> ManiaDifficultyAttributes:
-        self._check_not_closed()
+        return cls(native_calc, ruleset, beatmap)
 
+    def _calculate(self, mods: ModsCollection) -> ManiaDifficultyAttributes:
         native_diff = bindings.NativeManiaDifficultyAttributes()
         result = bindings.ManiaDifficultyCalculator_Calculate(
             self.handle,
@@ -1,13 +1,31 @@
 from __future__ import annotations
 
+import time
 from abc import ABC
 from abc import abstractmethod
 from ctypes import byref
+from ctypes import sizeof
+from dataclasses import fields
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Sequence
+from typing import Type
 from typing import Union
 
+from ...native import NativeCatchDifficultyAttributes
+from ...native import NativeCatchPerformanceAttributes
 from ...native import NativeCatchPerformanceCalculator
+from ...native import NativeManiaDifficultyAttributes
+from ...native import NativeManiaPerformanceAttributes
 from ...native import NativeManiaPerformanceCalculator
+from ...native import NativeOsuDifficultyAttributes
+from ...native import NativeOsuPerformanceAttributes
 from ...native import NativeOsuPerformanceCalculator
+from ...native import NativeScoreInfo
+from ...native import NativeTaikoDifficultyAttributes
+from ...native import NativeTaikoPerformanceAttributes
 from ...native import NativeTaikoPerformanceCalculator
 from ...native import bindings
 from ..attributes.difficulty import CatchDifficultyAttributes
@@ -24,8 +42,15 @@ from ..objects import Beatmap
 from ..objects import ModsCollection
 from ..objects import Ruleset
 from ..objects import ScoreInfo
+from ..utils import slow_log
+from ..utils.columnar import import_numpy
+from ..utils.columnar import native_field_name
+from ..utils.columnar import nullable_column
+from ..utils.columnar import struct_array
 from ..utils.native_handler import NativeHandler
 
+_SCORE_COLUMNS = tuple(field.name for field in fields(ScoreInfo))
+
 
 class PerformanceCalculator(NativeHandler, ABC):
     """Base class for performance calculators.
@@ -34,6 +59,10 @@ class PerformanceCalculator(NativeHandler, ABC):
     This is an abstract base class that must be subclassed for each game mode.
     """
 
+    _difficulty_attributes_type: Type[DifficultyAttributes] = DifficultyAttributes
+    _performance_attributes_type: Type[PerformanceAttributes] = PerformanceAttributes
+    _native_performance_type: Any = None
+
     def __init__(
         self,
         handle: Union[
@@ -45,7 +74,6 @@ class PerformanceCalculator(NativeHandler, ABC):
     ):
         super().__init__(handle)
 
-    @abstractmethod
     def calculate(
         self,
         ruleset: Ruleset,
@@ -65,73 +93,299 @@ class PerformanceCalculator(NativeHandler, ABC):
 
         Returns:
             A structure describing the performance of the score.
+
+        Raises:
+            TypeError: If the difficulty attributes do not match the ruleset.
+            RuntimeError: If the calculator is closed or the calculation fails.
         """
+        return self.calculate_many(ruleset, beatmap, mods, [score_info], difficulty_attributes)[0]
 
+    def calculate_many(
+        self,
+        ruleset: Ruleset,
+        beatmap: Beatmap,
+        mods: ModsCollection,
+        scores: Sequence[ScoreInfo],
+        difficulty_attributes: DifficultyAttributes,
+    ) -> List[PerformanceAttributes]:
+        """Calculate the performance attributes of several scores in one pass.
 
-class OsuPerformanceCalculator(PerformanceCalculator):
-    """Performance calculator for osu!standard mode."""
+        All scores share the same beatmap, mods and difficulty attributes, so the
+        native difficulty structure is only built once.
 
-    @classmethod
-    def create(cls) -> OsuPerformanceCalculator:
-        native_calc = bindings.NativeOsuPerformanceCalculator()
-        result = bindings.OsuPerformanceCalculator_Create(byref(native_calc))
-        cls.check_error(result, "create OsuPerformanceCalculator")
-        return cls(native_calc)
+        Args:
+            ruleset: The ruleset for the beatmap.
+            beatmap: The beatmap the scores were set on.
+            mods: The mods to apply to the beatmap.
+            scores: Information about each score.
+            difficulty_attributes: The difficulty attributes for the beatmap.
 
-    def calculate(
+        Returns:
+            The performance of each score, in the same order as ``scores``.
+
+        Raises:
+            TypeError: If the difficulty attributes do not match the ruleset.
+            RuntimeError: If the calculator is closed or a calculation fails.
+        """
+        self._check_not_closed()
+        native_diff = self._difficulty_to_native(difficulty_attributes)
+
+        ruleset_handle = ruleset.handle
+        beatmap_handle = beatmap.handle
+        mods_handle = mods.handle
+
+        log = slow_log.active_log()
+        if log is None:
+            return [
+                self._calculate_native(
+                    score.to_native(ruleset_handle, beatmap_handle, mods_handle),
+                    native_diff,
+                )
+                for score in scores
+            ]
+
+        results = []
+        for score in scores:
+            start = time.perf_counter()
+            native_score = score.to_native(ruleset_handle, beatmap_handle, mods_handle)
+            results.append(self._calculate_native(native_score, native_diff))
+            duration = time.perf_counter() - start
+            log.observe("performance", duration, beatmap, ruleset, mods, difficulty_attributes)
+
+        return results
+
+    def prepare(
         self,
         ruleset: Ruleset,
         beatmap: Beatmap,
         mods: ModsCollection,
-        score_info: ScoreInfo,
         difficulty_attributes: DifficultyAttributes,
-    ) -> OsuPerformanceAttributes:
+    ) -> Callable[[ScoreInfo], PerformanceAttributes]:
+        """Bind a calculation context for scores that are not known up front.
+
+        The native difficulty structure is built once, and the returned function
+        calculates the performance of one score at a time against it. This suits
+        searches and live updates, where each score depends on the previous result.
+
+        Args:
+            ruleset: The ruleset for the beatmap.
+            beatmap: The beatmap the scores are set on.
+            mods: The mods to apply to the beatmap.
+            difficulty_attributes: The difficulty attributes for the beatmap.
+
+        Returns:
+            A function that takes a ``ScoreInfo`` and returns its performance.
+
+        Raises:
+            TypeError: If the difficulty attributes do not match the ruleset.
+            RuntimeError: If the calculator is closed.
+        """
+        self._check_not_closed()
+        native_diff = self._difficulty_to_native(difficulty_attributes)
+        handles = (ruleset.handle, beatmap.handle, mods.handle)
+
+        def calculate(score_info: ScoreInfo) -> PerformanceAttributes:
+            self._check_not_closed()
+            return self._calculate_native(score_info.to_native(*handles), native_diff)
+
+        return calculate
+
+    def calculate_columns(
+        self,
+        ruleset: Ruleset,
+        beatmap: Beatmap,
+        mods: ModsCollection,
+        scores: Any,
+        difficulty_attributes: DifficultyAttributes,
+    ) -> Dict[str, Any]:
+        """Calculate the performance of many scores given as columns. Requires NumPy.
+
+        Scores are written straight into a native array instead of going through
+        ``ScoreInfo`` objects, and results are returned as columns instead of
+        ``PerformanceAttributes`` objects.
+
+        Args:
+            ruleset: The ruleset for the beatmap.
+            beatmap: The beatmap the scores were set on.
+            mods: The mods to apply to the beatmap.
+            scores: A mapping of ``ScoreInfo`` field names to NumPy arrays (or any
+                buffer-protocol arrays or scalars), or a NumPy structured array with
+                those field names. Missing columns take the ``ScoreInfo`` defaults and
+                scalars are broadcast. Rows of ``legacy_total_score`` that are masked,
+                negative or NaN are treated as having no legacy score.
+            difficulty_attributes: The difficulty attributes for the beatmap.
+
+        Returns:
+            A float64 array per field of the ruleset's performance attributes, keyed by
+            field name. Optional fields are NaN where the value is not available.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+            TypeError: If the difficulty attributes do not match the ruleset.
+            ValueError: If a column is unknown or the column lengths do not match.
+            RuntimeError: If the calculator is closed or a calculation fails.
+        """
+        np = import_numpy()
+        records = self.calculate_records(ruleset, beatmap, mods, scores, difficulty_attributes)
+
+        return {
+            field.name: nullable_column(np, records[native_field_name(field.name)])
+            for field in fields(self._performance_attributes_type)
+        }
+
+    def calculate_records(
+        self,
+        ruleset: Ruleset,
+        beatmap: Beatmap,
+        mods: ModsCollection,
+        scores: Any,
+        difficulty_attributes: DifficultyAttributes,
+        out: Any = None,
+    ) -> Any:
+        """Calculate the performance of many scores into native-layout records. Requires NumPy.
+
+        Like :meth:`calculate_columns`, but results are returned as a NumPy
+        structured array with the dtype of the ruleset's native performance
+        struct, so they can be written straight into a caller-provided buffer
+        such as shared memory. Each row is timed against the active slow-call
+        log, as in :meth:`calculate_many`.
+
+        Args:
+            ruleset: The ruleset for the beatmap.
+            beatmap: The beatmap the scores were set on.
+            mods: The mods to apply to the beatmap.
+            scores: The scores, as accepted by :meth:`calculate_columns`.
+            difficulty_attributes: The difficulty attributes for the beatmap.
+            out: A writable, C-contiguous structured array with
+                :meth:`record_dtype` and one row per score to write the results into.
+                A new array is allocated when not given.
+
+        Returns:
+            The results, as ``out`` if it was given.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+            TypeError: If the difficulty attributes do not match the ruleset.
+            ValueError: If a column is unknown, the column lengths do not match or
+                ``out`` has the wrong dtype or length.
+            RuntimeError: If the calculator is closed or a calculation fails.
+        """
+        np = import_numpy()
         self._check_not_closed()
+        native_diff = self._difficulty_to_native(difficulty_attributes)
+
+        names = scores.dtype.names if hasattr(scores, "dtype") else tuple(scores)
+        unknown = set(names) - set(_SCORE_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown score columns: {', '.join(sorted(unknown))}")
+
+        columns = {name: np.asarray(scores[name]) for name in names}
+        legacy = scores["legacy_total_score"] if "legacy_total_score" in names else None
+        size = max((column.size for column in columns.values() if column.ndim), default=1)
+
+        native_scores, score_view = struct_array(NativeScoreInfo, size)
+        template = ScoreInfo().to_native(ruleset.handle, beatmap.handle, mods.handle)
+        score_view[:] = np.frombuffer(template, dtype=score_view.dtype)
+
+        for name, column in columns.items():
+            if name == "legacy_total_score":
+                continue
+            score_view[native_field_name(name)] = np.broadcast_to(column, (size,))
+
+        if legacy is not None:
+            values = np.broadcast_to(np.ma.getdata(legacy), (size,))
+            missing = np.broadcast_to(np.ma.getmaskarray(legacy), (size,)) | ~(values >= 0)
+            score_view["legacyTotalScore"]["hasValue"] = ~missing
+            score_view["legacyTotalScore"]["value"] = np.where(missing, 0, values)
+
+        if out is None:
+            native_perf, perf_view = struct_array(self._native_performance_type, size)
+        else:
+            if out.dtype != self.record_dtype() or out.shape != (size,):
+                raise ValueError(
+                    f"Expected out to be {size} records of {self._native_performance_type.__name__}",
+                )
+            native_perf = (self._native_performance_type * size).from_buffer(out)
+            perf_view = out
+
+        perf_size = sizeof(self._native_performance_type)
+        calculate_into = self._calculate_into
+
+        log = slow_log.active_log()
+        if log is None:
+            for i in range(size):
+                calculate_into(native_scores[i], native_diff, byref(native_perf, i * perf_size))
+            return perf_view
+
+        for i in range(size):
+            start = time.perf_counter()
+            calculate_into(native_scores[i], native_diff, byref(native_perf, i * perf_size))
+            duration = time.perf_counter() - start
+            log.observe("performance", duration, beatmap, ruleset, mods, difficulty_attributes)
+
+        return perf_view
+
+    @classmethod
+    def record_dtype(cls) -> Any:
+        """Return the NumPy dtype of the records written by :meth:`calculate_records`.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        np = import_numpy()
+        return np.dtype(cls._native_performance_type)
 
-        if not isinstance(difficulty_attributes, OsuDifficultyAttributes):
+    def _difficulty_to_native(self, difficulty_attributes: DifficultyAttributes) -> Any:
+        expected = self._difficulty_attributes_type
+        if not isinstance(difficulty_attributes, expected):
             raise TypeError(
-                f"Expected OsuDifficultyAttributes, got {type(difficulty_attributes).__name__}",
+                f"Expected {expected.__name__}, got {type(difficulty_attributes).__name__}",
             )
 
-        native_score = score_info.to_native(ruleset.handle, beatmap.handle, mods.handle)
-
-        native_diff = bindings.NativeOsuDifficultyAttributes()
-        native_diff.starRating = difficulty_attributes.star_rating
-        native_diff.maxCombo = difficulty_attributes.max_combo
-        native_diff.aimDifficulty = difficulty_attributes.aim_difficulty
-        native_diff.aimDifficultSliderCount = difficulty_attributes.aim_difficult_slider_count
-        native_diff.speedDifficulty = difficulty_attributes.speed_difficulty
-        native_diff.speedNoteCount = difficulty_attributes.speed_note_count
-        native_diff.flashlightDifficulty = difficulty_attributes.flashlight_difficulty
-        native_diff.readingDifficulty = difficulty_attributes.reading_difficulty
-        native_diff.sliderFactor = difficulty_attributes.slider_factor
-        native_diff.aimTopWeightedSliderFactor = (
-            difficulty_attributes.aim_top_weighted_slider_factor
-        )
-        native_diff.speedTopWeightedSliderFactor = (
-            difficulty_attributes.speed_top_weighted_slider_factor
-        )
-        native_diff.aimDifficultStrainCount = difficulty_attributes.aim_difficult_strain_count
-        native_diff.speedDifficultStrainCount = difficulty_attributes.speed_difficult_strain_count
-        native_diff.readingDifficultNoteCount = difficulty_attributes.reading_difficult_note_count
-        native_diff.nestedScorePerObject = difficulty_attributes.nested_score_per_object
-        native_diff.legacyScoreBaseMultiplier = difficulty_attributes.legacy_score_base_multiplier
-        native_diff.maximumLegacyComboScore = difficulty_attributes.maximum_legacy_combo_score
-        native_diff.hitCircleCount = difficulty_attributes.hit_circle_count
-        native_diff.sliderCount = difficulty_attributes.slider_count
-        native_diff.spinnerCount = difficulty_attributes.spinner_count
-
-        native_perf = bindings.NativeOsuPerformanceAttributes()
+        return difficulty_attributes.to_native()  # type: ignore[attr-defined]
+
+    def _calculate_native(
+        self,
+        native_score: NativeScoreInfo,
+        native_diff: Any,
+    ) -> PerformanceAttributes:
+        native_perf = self._native_performance_type()
+        self._calculate_into(native_score, native_diff, byref(native_perf))
+        return self._performance_attributes_type.from_native(native_perf)  # type: ignore
+
+    @abstractmethod
+    def _calculate_into(self, native_score: NativeScoreInfo, native_diff: Any, native_perf: Any):
+        """Run the native calculation, writing the result through the ``native_perf`` pointer."""
+
+
+class OsuPerformanceCalculator(PerformanceCalculator):
+    """Performance calculator for osu!standard mode."""
+
+    _difficulty_attributes_type = OsuDifficultyAttributes
+    _performance_attributes_type = OsuPerformanceAttributes
+    _native_performance_type = NativeOsuPerformanceAttributes
+
+    @classmethod
+    def create(cls) -> OsuPerformanceCalculator:
+        native_calc = bindings.NativeOsuPerformanceCalculator()
+        result = bindings.OsuPerformanceCalculator_Create(byref(native_calc))
+        cls.check_error(result, "create OsuPerformanceCalculator")
+        return cls(native_calc)
+
+    def _calculate_into(
+        self,
+        native_score: NativeScoreInfo,
+        native_diff: NativeOsuDifficultyAttributes,
+        native_perf: Any,
+    ) -> None:
         result = bindings.OsuPerformanceCalculator_Calculate(
             self.handle,
             native_score,
             native_diff,
-            byref(native_perf),
+            native_perf,
         )
         self.check_error(result, "calculate osu! performance")
 
-        return OsuPerformanceAttributes.from_native(native_perf)
-
     def _destroy(self) -> None:
         bindings.OsuPerformanceCalculator_Destroy(self.handle)
 
@@ -139,6 +393,10 @@ class OsuPerformanceCalculator(PerformanceCalculator):
 class TaikoPerformanceCalculator(PerformanceCalculator):
     """Performance calculator for osu!taiko mode."""
 
+    _difficulty_attributes_type = TaikoDifficultyAttributes
+    _performance_attributes_type = TaikoPerformanceAttributes
+    _native_performance_type = NativeTaikoPerformanceAttributes
+
     @classmethod
     def create(cls) -> TaikoPerformanceCalculator:
         native_calc = bindings.NativeTaikoPerformanceCalculator()
@@ -146,46 +404,20 @@ class TaikoPerformanceCalculator(PerformanceCalculator):
         cls.check_error(result, "create TaikoPerformanceCalculator")
         return cls(native_calc)
 
-    def calculate(
+    def _calculate_into(
         self,
-        ruleset: Ruleset,
-        beatmap: Beatmap,
-        mods: ModsCollection,
-        score_info: ScoreInfo,
-        difficulty_attributes: DifficultyAttributes,
-    ) -> TaikoPerformanceAttributes:
-        self._check_not_closed()
-
-        if not isinstance(difficulty_attributes, TaikoDifficultyAttributes):
-            raise TypeError(
-                f"Expected TaikoDifficultyAttributes, got {type(difficulty_attributes).__name__}",
-            )
-
-        native_score = score_info.to_native(ruleset.handle, beatmap.handle, mods.handle)
-
-        native_diff = bindings.NativeTaikoDifficultyAttributes()
-        native_diff.starRating = difficulty_attributes.star_rating
-        native_diff.maxCombo = difficulty_attributes.max_combo
-        native_diff.mechanicalDifficulty = difficulty_attributes.mechanical_difficulty
-        native_diff.rhythmDifficulty = difficulty_attributes.rhythm_difficulty
-        native_diff.readingDifficulty = difficulty_attributes.reading_difficulty
-        native_diff.colourDifficulty = difficulty_attributes.colour_difficulty
-        native_diff.staminaDifficulty = difficulty_attributes.stamina_difficulty
-        native_diff.monoStaminaFactor = difficulty_attributes.mono_stamina_factor
-        native_diff.consistencyFactor = difficulty_attributes.consistency_factor
-        native_diff.staminaTopStrains = difficulty_attributes.stamina_top_strains
-
-        native_perf = bindings.NativeTaikoPerformanceAttributes()
+        native_score: NativeScoreInfo,
+        native_diff: NativeTaikoDifficultyAttributes,
+        native_perf: Any,
+    ) -> None:
         result = bindings.TaikoPerformanceCalculator_Calculate(
             self.handle,
             native_score,
             native_diff,
-            byref(native_perf),
+            native_perf,
         )
         self.check_error(result, "calculate Taiko performance")
 
-        return TaikoPerformanceAttributes.from_native(native_perf)
-
     def _destroy(self) -> None:
         bindings.TaikoPerformanceCalculator_Destroy(self.handle)
 
@@ -193,6 +425,10 @@ class TaikoPerformanceCalculator(PerformanceCalculator):
 class CatchPerformanceCalculator(PerformanceCalculator):
     """Performance calculator for osu!catch mode."""
 
+    _difficulty_attributes_type = CatchDifficultyAttributes
+    _performance_attributes_type = CatchPerformanceAttributes
+    _native_performance_type = NativeCatchPerformanceAttributes
+
     @classmethod
     def create(cls) -> CatchPerformanceCalculator:
         native_calc = bindings.NativeCatchPerformanceCalculator()
@@ -200,38 +436,20 @@ class CatchPerformanceCalculator(PerformanceCalculator):
         cls.check_error(result, "create CatchPerformanceCalculator")
         return cls(native_calc)
 
-    def calculate(
+    def _calculate_into(
         self,
-        ruleset: Ruleset,
-        beatmap: Beatmap,
-        mods: ModsCollection,
-        score_info: ScoreInfo,
-        difficulty_attributes: DifficultyAttributes,
-    ) -> CatchPerformanceAttributes:
-        self._check_not_closed()
-
-        if not isinstance(difficulty_attributes, CatchDifficultyAttributes):
-            raise TypeError(
-                f"Expected CatchDifficultyAttributes, got {type(difficulty_attributes).__name__}",
-            )
-
-        native_score = score_info.to_native(ruleset.handle, beatmap.handle, mods.handle)
-
-        native_diff = bindings.NativeCatchDifficultyAttributes()
-        native_diff.starRating = difficulty_attributes.star_rating
-        native_diff.maxCombo = difficulty_attributes.max_combo
-
-        native_perf = bindings.NativeCatchPerformanceAttributes()
+        native_score: NativeScoreInfo,
+        native_diff: NativeCatchDifficultyAttributes,
+        native_perf: Any,
+    ) -> None:
         result = bindings.CatchPerformanceCalculator_Calculate(
             self.handle,
             native_score,
             native_diff,
-            byref(native_perf),
+            native_perf,
         )
         self.check_error(result, "calculate Catch performance")
 
-        return CatchPerformanceAttributes.from_native(native_perf)
-
     def _destroy(self) -> None:
         bindings.CatchPerformanceCalculator_Destroy(self.handle)
 
@@ -239,6 +457,10 @@ class CatchPerformanceCalculator(PerformanceCalculator):
 class ManiaPerformanceCalculator(PerformanceCalculator):
     """Performance calculator for osu!mania mode."""
 
+    _difficulty_attributes_type = ManiaDifficultyAttributes
+    _performance_attributes_type = ManiaPerformanceAttributes
+    _native_performance_type = NativeManiaPerformanceAttributes
+
     @classmethod
     def create(cls) -> ManiaPerformanceCalculator:
         native_calc = bindings.NativeManiaPerformanceCalculator()
@@ -246,38 +468,20 @@ class ManiaPerformanceCalculator(PerformanceCalculator):
         cls.check_error(result, "create ManiaPerformanceCalculator")
         return cls(native_calc)
 
-    def calculate(
+    def _calculate_into(
         self,
-        ruleset: Ruleset,
-        beatmap: Beatmap,
-        mods: ModsCollection,
-        score_info: ScoreInfo,
-        difficulty_attributes: DifficultyAttributes,
-    ) -> ManiaPerformanceAttributes:
-        self._check_not_closed()
-
-        if not isinstance(difficulty_attributes, ManiaDifficultyAttributes):
-            raise TypeError(
-                f"Expected ManiaDifficultyAttributes, got {type(difficulty_attributes).__name__}",
-            )
-
-        native_score = score_info.to_native(ruleset.handle, beatmap.handle, mods.handle)
-
-        native_diff = bindings.NativeManiaDifficultyAttributes()
-        native_diff.starRating = difficulty_attributes.star_rating
-        native_diff.maxCombo = difficulty_attributes.max_combo
-
-        native_perf = bindings.NativeManiaPerformanceAttributes()
+        native_score: NativeScoreInfo,
+        native_diff: NativeManiaDifficultyAttributes,
+        native_perf: Any,
+    ) -> None:
         result = bindings.ManiaPerformanceCalculator_Calculate(
             self.handle,
             native_score,
             native_diff,
-            byref(native_perf),
+            native_perf,
         )
         self.check_error(result, "calculate Mania performance")
 
-        return ManiaPerformanceAttributes.from_native(native_perf)
-
     def _destroy(self) -> None:
         bindings.ManiaPerformanceCalculator_Destroy(self.handle)
 
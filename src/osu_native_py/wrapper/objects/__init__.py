@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from .beatmap import Beatmap
+from .beatmap_metadata import BeatmapMetadata
 from .error_code import ErrorCode
 from .mod import Mod
 from .mods_collection import ModsCollection
@@ -9,6 +10,7 @@ from .score_info import ScoreInfo
 
 __all__ = [
     "Beatmap",
+    "BeatmapMetadata",
     "ErrorCode",
     "Mod",
     "ModsCollection",
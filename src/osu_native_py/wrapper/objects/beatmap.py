@@ -1,10 +1,19 @@
 from __future__ import annotations
 
+import hashlib
+import os
+import threading
 from ctypes import byref
+from typing import Optional
+from typing import Tuple
 
+from ...native import ManagedObjectHandle
 from ...native import NativeBeatmap
 from ...native import bindings
 from ..utils.native_handler import NativeHandler
+from .beatmap_metadata import BeatmapMetadata
+
+_rebuild_lock = threading.Lock()
 
 
 class Beatmap(NativeHandler):
@@ -12,10 +21,22 @@ class Beatmap(NativeHandler):
 
     A beatmap can be loaded from a .osu file or from text content, providing
     access to metadata and difficulty settings.
+
+    Beatmaps can be pickled, for example to send them to worker processes. The
+    pickle carries the file path or text the beatmap was loaded from, with its MD5
+    checksum and metadata. Loading a file only records its size and modification
+    time; the checksum is taken on first use, and refused if the file changed
+    since it was loaded. The native beatmap is only rebuilt the first time it is
+    needed after unpickling, and a file whose checksum no longer matches is
+    rejected.
     """
 
-    def __init__(self, native_beatmap: NativeBeatmap):
+    def __init__(self, native_beatmap: NativeBeatmap, source: Optional[Tuple[str, str]] = None):
         super().__init__(native_beatmap)
+        self._metadata: Optional[BeatmapMetadata] = None
+        self._source = source
+        self._checksum: Optional[str] = None
+        self._file_identity: Optional[Tuple[int, int]] = None
 
     @classmethod
     def from_file(cls, file_path: str) -> Beatmap:
@@ -30,18 +51,33 @@ class Beatmap(NativeHandler):
         Raises:
             RuntimeError: If the file cannot be loaded or parsed.
         """
+        # Record the file's identity now, so that a pickle never describes a
+        # newer file than the one that was parsed.
+        try:
+            identity: Optional[Tuple[int, int]] = _stat_identity(os.stat(file_path))
+        except OSError:
+            # Let the native loader report the failure.
+            identity = None
+
         native_string = cls.create_native_string(file_path)
         native_beatmap = bindings.NativeBeatmap()
 
         result = bindings.Beatmap_CreateFromFile(native_string, byref(native_beatmap))
         cls.check_error(result, f"create beatmap from file '{file_path}'")
 
-        return cls(native_beatmap)
+        beatmap = cls(native_beatmap, ("path", file_path))
+        beatmap._file_identity = identity
+        return beatmap
 
     @classmethod
     def from_text(cls, beatmap_text: str) -> Beatmap:
         """Create a beatmap from .osu file content as text.
 
+        The beatmap keeps a reference to ``beatmap_text`` for as long as it
+        lives, for :meth:`text`, :meth:`checksum` and pickling, so the full .osu
+        content stays in memory alongside the native beatmap. Use
+        :meth:`from_file` where that matters.
+
         Args:
             beatmap_text: The content of a .osu file as a string.
 
@@ -57,73 +93,196 @@ class Beatmap(NativeHandler):
         result = bindings.Beatmap_CreateFromText(native_string, byref(native_beatmap))
         cls.check_error(result, "create beatmap from text")
 
-        return cls(native_beatmap)
+        return cls(native_beatmap, ("text", beatmap_text))
+
+    def checksum(self) -> str:
+        """Return the MD5 checksum of the .osu file or text the beatmap was loaded from.
+
+        For beatmaps loaded from a file, the file is read on the first call.
+
+        Raises:
+            OSError: If the file can no longer be read.
+            RuntimeError: If the beatmap was not loaded through from_file or from_text,
+                or its file changed since it was loaded.
+        """
+        if self._checksum is None:
+            if self._source is None:
+                raise RuntimeError("Beatmap has no source to checksum")
+
+            kind, value = self._source
+            if kind == "path":
+                with open(value, "rb") as f:
+                    identity = self._file_identity
+                    if identity is not None and identity != _stat_identity(os.fstat(f.fileno())):
+                        raise RuntimeError(
+                            f"Beatmap file '{value}' changed since the beatmap was loaded"
+                        )
+                    data = f.read()
+            else:
+                data = value.encode("utf-8")
+
+            self._checksum = hashlib.md5(data).hexdigest()
+
+        return self._checksum
+
+    def text(self) -> str:
+        """Return the .osu content the beatmap was loaded from.
+
+        For beatmaps loaded from a file, the file is read again on every call.
+
+        Raises:
+            OSError: If the file can no longer be read.
+            RuntimeError: If the beatmap was not loaded through from_file or from_text.
+        """
+        if self._source is None:
+            raise RuntimeError("Beatmap has no source text")
+
+        kind, value = self._source
+        if kind == "path":
+            with open(value, encoding="utf-8-sig") as f:
+                return f.read()
+
+        return value
+
+    def metadata(self) -> BeatmapMetadata:
+        """Return a snapshot of the beatmap's metadata and difficulty settings.
+
+        The snapshot is read from the native beatmap on first use and cached, so
+        subsequent calls (and the title, artist and version properties) make no
+        native calls.
+
+        Raises:
+            RuntimeError: If the beatmap is already closed.
+        """
+        self._check_not_closed()
+
+        if self._metadata is None:
+            native = self._native_beatmap()
+            self._metadata = BeatmapMetadata(
+                title=self.get_string(bindings.Beatmap_GetTitle),
+                artist=self.get_string(bindings.Beatmap_GetArtist),
+                version=self.get_string(bindings.Beatmap_GetVersion),
+                beatmap_id=native.beatmapId,
+                ruleset_id=native.rulesetId,
+                approach_rate=native.approachRate,
+                drain_rate=native.drainRate,
+                overall_difficulty=native.overallDifficulty,
+                circle_size=native.circleSize,
+                slider_multiplier=native.sliderMultiplier,
+                slider_tick_rate=native.sliderTickRate,
+            )
+
+        return self._metadata
 
     @property
     def title(self) -> str:
         """The title of the beatmap."""
-        self._check_not_closed()
-        return self.get_string(bindings.Beatmap_GetTitle)
+        return self.metadata().title
 
     @property
     def artist(self) -> str:
         """The artist of the beatmap."""
-        self._check_not_closed()
-        return self.get_string(bindings.Beatmap_GetArtist)
+        return self.metadata().artist
 
     @property
     def version(self) -> str:
         """The difficulty name/version of the beatmap."""
-        self._check_not_closed()
-        return self.get_string(bindings.Beatmap_GetVersion)
+        return self.metadata().version
 
     @property
     def approach_rate(self) -> float:
         """The approach rate (AR) of the beatmap."""
-        self._check_not_closed()
-        return self._native.approachRate
+        return self._native_beatmap().approachRate
 
     @property
     def drain_rate(self) -> float:
         """The HP drain rate of the beatmap."""
-        self._check_not_closed()
-        return self._native.drainRate
+        return self._native_beatmap().drainRate
 
     @property
     def overall_difficulty(self) -> float:
         """The overall difficulty (OD) of the beatmap."""
-        self._check_not_closed()
-        return self._native.overallDifficulty
+        return self._native_beatmap().overallDifficulty
 
     @property
     def circle_size(self) -> float:
         """The circle size (CS) of the beatmap."""
-        self._check_not_closed()
-        return self._native.circleSize
+        return self._native_beatmap().circleSize
 
     @property
     def slider_multiplier(self) -> float:
         """The slider velocity multiplier of the beatmap."""
-        self._check_not_closed()
-        return self._native.sliderMultiplier
+        return self._native_beatmap().sliderMultiplier
 
     @property
     def slider_tick_rate(self) -> float:
         """The slider tick rate of the beatmap."""
-        self._check_not_closed()
-        return self._native.sliderTickRate
+        return self._native_beatmap().sliderTickRate
 
     @property
     def ruleset_id(self) -> int:
         """The ruleset ID (0=osu!, 1=taiko, 2=catch, 3=mania)."""
-        self._check_not_closed()
-        return self._native.rulesetId
+        return self._native_beatmap().rulesetId
 
     @property
     def beatmap_id(self) -> int:
         """The online beatmap ID."""
+        return self._native_beatmap().beatmapId
+
+    @property
+    def handle(self) -> ManagedObjectHandle:
+        return self._native_beatmap().handle
+
+    def close(self) -> None:
+        if self._native is None:
+            # Unpickled and never used, so there is no native beatmap to destroy.
+            self._closed = True
+            return
+
+        super().close()
+
+    def _native_beatmap(self) -> NativeBeatmap:
+        self._check_not_closed()
+
+        if self._native is None:
+            with _rebuild_lock:
+                if self._native is None:
+                    self._rebuild()
+
+        return self._native
+
+    def _rebuild(self) -> None:
+        if self._source is None:
+            raise RuntimeError("Beatmap has no source to rebuild from")
+
+        kind, value = self._source
+
+        if kind == "path":
+            with open(value, "rb") as f:
+                data = f.read()
+
+            if hashlib.md5(data).hexdigest() != self._checksum:
+                raise RuntimeError(f"Beatmap file '{value}' changed since the beatmap was loaded")
+
+            text = data.decode("utf-8-sig")
+        else:
+            text = value
+
+        native_beatmap = bindings.NativeBeatmap()
+        result = bindings.Beatmap_CreateFromText(
+            self.create_native_string(text),
+            byref(native_beatmap),
+        )
+        self.check_error(result, "rebuild unpickled beatmap")
+
+        NativeHandler.__init__(self, native_beatmap)
+
+    def __reduce__(self):
         self._check_not_closed()
-        return self._native.beatmapId
+        if self._source is None:
+            raise TypeError("Only beatmaps created with from_file or from_text can be pickled")
+
+        return _restore_beatmap, (self._source, self.checksum(), self._metadata)
 
     def _destroy(self) -> None:
         bindings.Beatmap_Destroy(self.handle)
@@ -133,9 +292,29 @@ class Beatmap(NativeHandler):
             return f"<Beatmap (closed)>"
 
         try:
+            metadata = self.metadata()
             return (
-                f"<Beatmap '{self.artist} - {self.title} [{self.version}]' "
-                f"AR={self.approach_rate:.1f} OD={self.overall_difficulty:.1f}>"
+                f"<Beatmap '{metadata.artist} - {metadata.title} [{metadata.version}]' "
+                f"AR={metadata.approach_rate:.1f} OD={metadata.overall_difficulty:.1f}>"
             )
-        except:
-            return f"<Beatmap handle={self.handle.id}>"
+        except RuntimeError:
+            return "<Beatmap>"
+
+
+def _restore_beatmap(
+    source: Tuple[str, str],
+    checksum: str,
+    metadata: Optional[BeatmapMetadata],
+) -> Beatmap:
+    beatmap = Beatmap.__new__(Beatmap)
+    beatmap._native = None
+    beatmap._closed = False
+    beatmap._metadata = metadata
+    beatmap._source = source
+    beatmap._checksum = checksum
+    beatmap._file_identity = None
+    return beatmap
+
+
+def _stat_identity(stat: os.stat_result) -> Tuple[int, int]:
+    return stat.st_size, stat.st_mtime_ns
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from typing import Any
+from typing import Dict
+from typing import Tuple
+
+
+class BeatmapMetadata:
+    """Immutable snapshot of a beatmap's metadata and difficulty settings.
+
+    Attributes:
+        title: The title of the beatmap.
+        artist: The artist of the beatmap.
+        version: The difficulty name/version of the beatmap.
+        beatmap_id: The online beatmap ID.
+        ruleset_id: The ruleset ID (0=osu!, 1=taiko, 2=catch, 3=mania).
+        approach_rate: The approach rate (AR) of the beatmap.
+        drain_rate: The HP drain rate of the beatmap.
+        overall_difficulty: The overall difficulty (OD) of the beatmap.
+        circle_size: The circle size (CS) of the beatmap.
+        slider_multiplier: The slider velocity multiplier of the beatmap.
+        slider_tick_rate: The slider tick rate of the beatmap.
+    """
+
+    __slots__ = (
+        "title",
+        "artist",
+        "version",
+        "beatmap_id",
+        "ruleset_id",
+        "approach_rate",
+        "drain_rate",
+        "overall_difficulty",
+        "circle_size",
+        "slider_multiplier",
+        "slider_tick_rate",
+    )
+
+    title: str
+    artist: str
+    version: str
+    beatmap_id: int
+    ruleset_id: int
+    approach_rate: float
+    drain_rate: float
+    overall_difficulty: float
+    circle_size: float
+    slider_multiplier: float
+    slider_tick_rate: float
+
+    def __init__(
+        self,
+        title: str,
+        artist: str,
+        version: str,
+        beatmap_id: int,
+        ruleset_id: int,
+        approach_rate: float,
+        drain_rate: float,
+        overall_difficulty: float,
+        circle_size: float,
+        slider_multiplier: float,
+        slider_tick_rate: float,
+    ):
+        set_field = object.__setattr__
+        set_field(self, "title", title)
+        set_field(self, "artist", artist)
+        set_field(self, "version", version)
+        set_field(self, "beatmap_id", beatmap_id)
+        set_field(self, "ruleset_id", ruleset_id)
+        set_field(self, "approach_rate", approach_rate)
+        set_field(self, "drain_rate", drain_rate)
+        set_field(self, "overall_difficulty", overall_difficulty)
+        set_field(self, "circle_size", circle_size)
+        set_field(self, "slider_multiplier", slider_multiplier)
+        set_field(self, "slider_tick_rate", slider_tick_rate)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the fields as a dict."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def _astuple(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, BeatmapMetadata):
+            return NotImplemented
+        return self._astuple() == other._astuple()
+
+    def __hash__(self) -> int:
+        return hash(self._astuple())
+
+    def __reduce__(self):
+        return (self.__class__, self._astuple())
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{self.__class__.__name__}({fields})"
@@ -15,8 +15,9 @@ class Mod(NativeHandler):
     and may have configurable settings.
     """
 
-    def __init__(self, native_mod: NativeMod):
+    def __init__(self, native_mod: NativeMod, acronym: str = ""):
         super().__init__(native_mod)
+        self._acronym = acronym
 
     @classmethod
     def create(cls, acronym: str) -> Mod:
@@ -37,7 +38,12 @@ class Mod(NativeHandler):
         result = bindings.Mod_Create(native_string, byref(native_mod))
         cls.check_error(result, f"create mod '{acronym}'")
 
-        return cls(native_mod)
+        return cls(native_mod, acronym)
+
+    @property
+    def acronym(self) -> str:
+        """The acronym the mod was created from (e.g., "HD")."""
+        return self._acronym
 
     def set_setting_bool(self, key: str, value: bool) -> None:
         """Set a boolean mod setting.
@@ -90,4 +96,4 @@ class Mod(NativeHandler):
     def __repr__(self) -> str:
         if self.is_closed:
             return f"<Mod (closed)>"
-        return f"<Mod handle={self.handle.id}>"
+        return f"<Mod '{self._acronym}' handle={self.handle.id}>"
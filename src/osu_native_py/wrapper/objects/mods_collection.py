@@ -63,6 +63,11 @@ class ModsCollection(NativeHandler):
         """
         return mod in self._mods
 
+    @property
+    def acronyms(self) -> List[str]:
+        """The acronyms of the mods in the collection, in insertion order."""
+        return [mod.acronym for mod in self._mods]
+
     def remove(self, mod: Mod) -> None:
         """Removes a mod from the collection.
 
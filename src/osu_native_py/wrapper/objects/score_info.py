@@ -1,14 +1,14 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
 from typing import Optional
 
 from ...native import ManagedObjectHandle
 from ...native import NativeScoreInfo
 from ...native import bindings
+from ..slots import slotted_dataclass
 
 
-@dataclass
+@slotted_dataclass
 class ScoreInfo:
     """Information about a score for performance calculation.
 
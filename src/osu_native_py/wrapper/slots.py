@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from dataclasses import fields
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Callable
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+if TYPE_CHECKING:
+    # Type checkers only understand the dataclass decorators they know about.
+    from dataclasses import dataclass as slotted_dataclass
+else:
+
+    def slotted_dataclass(
+        cls: Optional[type] = None,
+        *,
+        frozen: bool = False,
+    ) -> Union[type, Callable[[type], type]]:
+        """Create a dataclass whose instances store their fields in ``__slots__``.
+
+        This is ``@dataclass(slots=True)`` for Python versions before 3.10. Instances
+        have no ``__dict__``, which saves several hundred bytes each for the larger
+        attribute classes, while ``dataclasses.asdict``, ``replace``, copying, weak
+        references and pickling (all protocols) keep working. Subclasses must use this
+        decorator as well to stay slotted.
+
+        Args:
+            cls: The class to decorate.
+            frozen: Make instances immutable, as with ``@dataclass(frozen=True)``.
+        """
+
+        def wrap(cls: type) -> type:
+            return _add_slots(dataclass(cls, frozen=frozen))
+
+        return wrap if cls is None else wrap(cls)
+
+
+def _add_slots(cls: type) -> type:
+    field_names = tuple(field.name for field in fields(cls))
+
+    inherited = set()
+    for base in cls.__mro__[1:-1]:
+        inherited.update(base.__dict__.get("__slots__", ()))
+
+    slots = tuple(name for name in field_names if name not in inherited)
+    if "__weakref__" not in inherited:
+        slots += ("__weakref__",)
+
+    namespace = dict(cls.__dict__)
+    namespace["__slots__"] = slots
+    for name in field_names:
+        namespace.pop(name, None)
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+
+    slotted = type(cls)(cls.__name__, cls.__bases__, namespace)
+    slotted.__qualname__ = cls.__qualname__
+    slotted.__getstate__ = _getstate  # type: ignore[attr-defined]
+    slotted.__setstate__ = _setstate  # type: ignore[attr-defined]
+    return slotted
+
+
+def _getstate(self: Any) -> Tuple[Any, ...]:
+    return tuple(getattr(self, field.name) for field in fields(self))
+
+
+def _setstate(self: Any, state: Any) -> None:
+    # Bypasses frozen dataclasses' __setattr__, like their generated __init__.
+    if _is_dict_state(self, state):
+        # Pickled before the class was slotted: the instance __dict__, or the
+        # (__dict__, slots) pair of object.__reduce_ex__.
+        if isinstance(state, tuple):
+            state = {**(state[0] or {}), **state[1]}
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+        return
+
+    for field, value in zip(fields(self), state):
+        object.__setattr__(self, field.name, value)
+
+
+def _is_dict_state(self: Any, state: Any) -> bool:
+    if isinstance(state, dict):
+        return True
+
+    # A two-field instance pickles to a tuple of the same shape, so only take
+    # it as the old format when the dict holds field names.
+    return (
+        isinstance(state, tuple)
+        and len(state) == 2
+        and (state[0] is None or isinstance(state[0], dict))
+        and isinstance(state[1], dict)
+        and bool(state[1])
+        and set(state[1]) <= {field.name for field in fields(self)}
+    )
@@ -2,8 +2,12 @@ from __future__ import annotations
 
 from .native_handler import NativeHandler
 from .native_helper import NativeHelper
+from .slow_log import SlowCall
+from .slow_log import SlowCallLog
 
 __all__ = [
     "NativeHandler",
     "NativeHelper",
+    "SlowCall",
+    "SlowCallLog",
 ]
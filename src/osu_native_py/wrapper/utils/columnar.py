@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import re
+from typing import Any
+from typing import Tuple
+
+_CAMEL_BOUNDARY = re.compile(r"_([a-z0-9])")
+
+
+def import_numpy() -> Any:
+    """Import NumPy for the columnar APIs.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(
+            "Columnar calculations require NumPy. "
+            "Install it with `pip install osu-native-py[numpy]`.",
+        ) from None
+
+    return numpy
+
+
+def native_field_name(name: str) -> str:
+    """Return the native struct field name for a wrapper attribute name.
+
+    Example: ``effective_miss_count`` becomes ``effectiveMissCount``.
+    """
+    return _CAMEL_BOUNDARY.sub(lambda match: match.group(1).upper(), name)
+
+
+def struct_array(struct_type: Any, size: int) -> Tuple[Any, Any]:
+    """Allocate a ctypes array of structs and a NumPy record view sharing its memory."""
+    np = import_numpy()
+    native = (struct_type * size)()
+    return native, np.frombuffer(native, dtype=np.dtype(struct_type))
+
+
+def nullable_column(np: Any, column: Any) -> Any:
+    """Return a float64 copy of a struct column, with NaN where a nullable field has no value."""
+    if column.dtype.names is None:
+        return column.astype(np.float64)
+
+    return np.where(column["hasValue"], column["value"], np.nan).astype(np.float64)
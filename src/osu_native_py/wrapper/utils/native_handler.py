@@ -1,15 +1,19 @@
 from __future__ import annotations
 
+import threading
 from abc import ABC
 from abc import abstractmethod
-from ctypes import byref
-from ctypes import c_int32
-from ctypes import c_uint8
 from typing import Any
 from typing import Callable
+from typing import Dict
 
 from ...native import ManagedObjectHandle
 from ..objects.error_code import ErrorCode
+from .native_helper import NativeHelper
+
+_handle_counts_lock = threading.Lock()
+_handles_created: Dict[str, int] = {}
+_handles_closed: Dict[str, int] = {}
 
 
 class NativeHandler(ABC):
@@ -17,6 +21,23 @@ class NativeHandler(ABC):
         self._native = native
         self._closed = False
 
+        name = type(self).__name__
+        with _handle_counts_lock:
+            _handles_created[name] = _handles_created.get(name, 0) + 1
+
+    @staticmethod
+    def handle_counts() -> Dict[str, Dict[str, int]]:
+        """Return how many handles of each subclass were created, closed and are still open."""
+        with _handle_counts_lock:
+            return {
+                name: {
+                    "created": created,
+                    "closed": _handles_closed.get(name, 0),
+                    "live": created - _handles_closed.get(name, 0),
+                }
+                for name, created in _handles_created.items()
+            }
+
     @property
     def handle(self) -> ManagedObjectHandle:
         return self._native.handle
@@ -27,12 +48,7 @@ class NativeHandler(ABC):
 
     @staticmethod
     def create_native_string(text: str):
-        encoded = text.encode("utf-8")
-        buffer = (c_uint8 * (len(encoded) + 1))()
-        for i, byte in enumerate(encoded):
-            buffer[i] = byte
-        buffer[len(encoded)] = 0
-        return buffer
+        return NativeHelper.create_native_string(text)
 
     @staticmethod
     def check_error(result: int, operation: str) -> None:
@@ -41,22 +57,7 @@ class NativeHandler(ABC):
             raise RuntimeError(f"Failed to {operation}. Error: {error_code}")
 
     def get_string(self, getter_func: Callable, max_size: int = 1024) -> str:
-        buffer_size = c_int32(0)
-        result = getter_func(self.handle, None, byref(buffer_size))
-
-        if result != ErrorCode.BUFFER_SIZE_QUERY:
-            raise RuntimeError(f"Error querying buffer size: {ErrorCode.from_value(result)}")
-
-        if buffer_size.value <= 0:
-            return ""
-
-        buffer = (c_uint8 * buffer_size.value)()
-        result = getter_func(self.handle, buffer, byref(buffer_size))
-
-        if result != ErrorCode.SUCCESS:
-            raise RuntimeError(f"Error getting string: {ErrorCode.from_value(result)}")
-
-        return bytes(buffer[: buffer_size.value]).decode("utf-8").rstrip("\x00")
+        return NativeHelper.get_string(self.handle, getter_func, max_size)
 
     def close(self) -> None:
         if self._closed:
@@ -65,6 +66,10 @@ class NativeHandler(ABC):
         self._destroy()
         self._closed = True
 
+        name = type(self).__name__
+        with _handle_counts_lock:
+            _handles_closed[name] = _handles_closed.get(name, 0) + 1
+
     @abstractmethod
     def _destroy(self) -> None:
         raise NotImplementedError()
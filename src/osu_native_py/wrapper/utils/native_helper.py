@@ -3,6 +3,7 @@ from __future__ import annotations
 from ctypes import byref
 from ctypes import c_int32
 from ctypes import c_uint8
+from ctypes import string_at
 from typing import Callable
 
 from ...native import ManagedObjectHandle
@@ -12,6 +13,13 @@ from ..objects.error_code import ErrorCode
 class NativeHelper:
     @staticmethod
     def get_string(handle: ManagedObjectHandle, getter_func: Callable, max_size: int = 1024) -> str:
+        """Read a string from a native getter.
+
+        The required size is queried first and the string is copied into a buffer
+        of exactly that size. The native getters do not report a buffer that is
+        too small, so reading into a fixed-size buffer without the query could
+        silently truncate long values.
+        """
         buffer_size = c_int32(0)
         result = getter_func(handle, None, byref(buffer_size))
 
@@ -29,16 +37,18 @@ class NativeHelper:
         if result != ErrorCode.SUCCESS:
             raise RuntimeError(f"Error getting string: {ErrorCode.from_value(result)}")
 
-        return bytes(buffer[: buffer_size.value]).decode("utf-8").rstrip("\x00")
+        return NativeHelper._decode(buffer, min(buffer_size.value, len(buffer)))
+
+    @staticmethod
+    def _decode(buffer, size: int) -> str:
+        data = string_at(buffer, size)
+        end = data.find(b"\x00")
+        return (data if end < 0 else data[:end]).decode("utf-8")
 
     @staticmethod
     def create_native_string(text: str):
-        encoded = text.encode("utf-8")
-        buffer = (c_uint8 * (len(encoded) + 1))()
-        for i, byte in enumerate(encoded):
-            buffer[i] = byte
-        buffer[len(encoded)] = 0
-        return buffer
+        encoded = text.encode("utf-8") + b"\x00"
+        return (c_uint8 * len(encoded)).from_buffer_copy(encoded)
 
     @staticmethod
     def check_error(result: int, operation: str) -> None:
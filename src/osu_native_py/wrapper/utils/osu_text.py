@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import List
+from typing import Optional
+
+_HIT_OBJECTS_HEADER = "[HitObjects]"
+
+
+class HitObjectText:
+    """The hit objects of .osu text, split from the rest of the file.
+
+    Used to build beatmaps that contain only part of the hit objects, for
+    evaluations the native library has no API for (sections, prefixes).
+
+    Attributes:
+        head: Everything up to and including the ``[HitObjects]`` header line.
+        lines: The hit object lines, ordered by time.
+        times: The start time of each hit object in milliseconds.
+        tail: Any sections after ``[HitObjects]``.
+    """
+
+    __slots__ = ("head", "lines", "times", "tail")
+
+    def __init__(self, head: str, lines: List[str], times: List[float], tail: str):
+        self.head = head
+        self.lines = lines
+        self.times = times
+        self.tail = tail
+
+    @classmethod
+    def parse(cls, text: str) -> HitObjectText:
+        """Split .osu text.
+
+        Raises:
+            ValueError: If the text has no ``[HitObjects]`` section.
+        """
+        all_lines = text.splitlines()
+        try:
+            start = next(
+                i for i, line in enumerate(all_lines) if line.strip() == _HIT_OBJECTS_HEADER
+            )
+        except StopIteration:
+            raise ValueError("The beatmap has no [HitObjects] section") from None
+
+        end = len(all_lines)
+        for i in range(start + 1, len(all_lines)):
+            if all_lines[i].startswith("["):
+                end = i
+                break
+
+        objects = []
+        for line in all_lines[start + 1 : end]:
+            parts = line.split(",", 3)
+            if len(parts) < 4:
+                continue
+            objects.append((float(parts[2]), line))
+
+        # Stable, so objects sharing a time keep their file order.
+        objects.sort(key=lambda item: item[0])
+
+        return cls(
+            "\n".join(all_lines[: start + 1]),
+            [line for _, line in objects],
+            [time for time, _ in objects],
+            "\n".join(all_lines[end:]),
+        )
+
+    def index_at(self, time: float) -> int:
+        """Return the number of hit objects that start before ``time``."""
+        return bisect_left(self.times, time)
+
+    def text(self, start: int = 0, stop: Optional[int] = None) -> str:
+        """Return .osu text with only the hit objects ``lines[start:stop]``."""
+        parts = [self.head, *self.lines[start:stop]]
+        if self.tail:
+            parts.append(self.tail)
+        return "\n".join(parts) + "\n"
+
+    def __len__(self) -> int:
+        return len(self.lines)
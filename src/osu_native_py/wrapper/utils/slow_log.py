@@ -0,0 +1,203 @@
+"""Log of difficulty and performance calculations slower than a threshold.
+
+Example::
+
+    from osu_native_py.wrapper.utils import slow_log
+
+    log = slow_log.enable(threshold=0.5, callback=print)
+    ...
+    for call in log.worst():
+        print(call.beatmap_id, call.duration)
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from dataclasses import field
+from dataclasses import replace
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+logger = logging.getLogger("osu_native_py.slow_log")
+
+_OBJECT_COUNT_FIELDS = ("max_combo", "hit_circle_count", "slider_count", "spinner_count")
+
+
+@dataclass
+class SlowCall:
+    """A calculation that exceeded the slow-call threshold.
+
+    Attributes:
+        kind: "difficulty" or "performance".
+        duration: The duration of the calculation in seconds.
+        beatmap_id: The online ID of the beatmap, or None if unknown.
+        title: The "artist - title [version]" of the beatmap, or None if unknown.
+        ruleset: The short name of the ruleset, or None if unknown.
+        mods: The acronyms of the applied mods.
+        object_counts: Object counts taken from the difficulty attributes.
+        timestamp: When the calculation finished, as a Unix timestamp.
+        worst: The worst calculations seen so far, slowest first, including this
+            one if it qualifies. Entries in this list have an empty ``worst``.
+    """
+
+    kind: str
+    duration: float
+    beatmap_id: Optional[int]
+    title: Optional[str]
+    ruleset: Optional[str]
+    mods: Tuple[str, ...]
+    object_counts: Dict[str, int]
+    timestamp: float
+    worst: Tuple[SlowCall, ...] = field(default=(), repr=False)
+
+
+class SlowCallLog:
+    """Records calculations slower than ``threshold`` seconds.
+
+    Every slow call is written to ``logger`` at WARNING level and passed to
+    ``callback`` if one is given; exceptions raised by the callback are logged
+    and never reach the calculation being timed. The ``top_n`` slowest
+    calculations are kept, counting each kind of calculation on a beatmap,
+    ruleset and mod combination once.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 1.0,
+        top_n: int = 10,
+        callback: Optional[Callable[[SlowCall], Any]] = None,
+        log: Optional[logging.Logger] = logger,
+    ):
+        self.threshold = threshold
+        self.top_n = top_n
+        self.callback = callback
+        self.log = log
+
+        self._worst: Dict[Tuple[Any, ...], SlowCall] = {}
+        self._lock = threading.Lock()
+
+    def observe(
+        self,
+        kind: str,
+        duration: float,
+        beatmap: Any,
+        ruleset: Any,
+        mods: Any,
+        difficulty_attributes: Any,
+    ) -> Optional[SlowCall]:
+        """Record a calculation if it was slow.
+
+        Returns:
+            The recorded entry, or None if the calculation was fast enough.
+        """
+        if duration < self.threshold:
+            return None
+
+        call = SlowCall(
+            kind=kind,
+            duration=duration,
+            beatmap_id=_safe(lambda: beatmap.beatmap_id),
+            title=_safe(lambda: f"{beatmap.artist} - {beatmap.title} [{beatmap.version}]"),
+            ruleset=_safe(lambda: ruleset.short_name),
+            mods=tuple(_safe(lambda: mods.acronyms) or ()),
+            object_counts={
+                name: getattr(difficulty_attributes, name)
+                for name in _OBJECT_COUNT_FIELDS
+                if hasattr(difficulty_attributes, name)
+            },
+            timestamp=time.time(),
+        )
+
+        key = (call.kind, call.beatmap_id, call.title, call.ruleset, call.mods)
+        with self._lock:
+            previous = self._worst.get(key)
+            if previous is None or previous.duration < duration:
+                self._worst[key] = call
+                if len(self._worst) > self.top_n:
+                    keep = heapq.nlargest(self.top_n, self._worst.items(), key=_by_duration)
+                    self._worst = dict(keep)
+
+            worst = tuple(sorted(self._worst.values(), key=lambda c: c.duration, reverse=True))
+
+        call = replace(call, worst=worst)
+
+        if self.log is not None:
+            self.log.warning(
+                "Slow %s calculation: %.3fs for beatmap %s '%s' (%s, mods=%s, objects=%s)",
+                kind,
+                duration,
+                call.beatmap_id,
+                call.title,
+                call.ruleset,
+                "".join(call.mods) or "NM",
+                call.object_counts,
+            )
+
+        if self.callback is not None:
+            try:
+                self.callback(call)
+            except Exception:
+                logger.exception("Slow call callback failed")
+
+        return call
+
+    def worst(self) -> List[SlowCall]:
+        """Return the slowest calculations seen so far, slowest first."""
+        with self._lock:
+            return sorted(self._worst.values(), key=lambda c: c.duration, reverse=True)
+
+    def reset(self) -> None:
+        """Forget the slowest calculations seen so far."""
+        with self._lock:
+            self._worst.clear()
+
+
+def _by_duration(item: Tuple[Any, SlowCall]) -> float:
+    return item[1].duration
+
+
+def _safe(getter: Callable[[], Any]) -> Any:
+    try:
+        return getter()
+    except Exception:
+        return None
+
+
+_active: Optional[SlowCallLog] = None
+
+
+def enable(
+    threshold: float = 1.0,
+    top_n: int = 10,
+    callback: Optional[Callable[[SlowCall], Any]] = None,
+    log: Optional[logging.Logger] = logger,
+) -> SlowCallLog:
+    """Start logging slow calculations made by any calculator.
+
+    Replaces the previously enabled log, if any.
+
+    Returns:
+        The new active log.
+    """
+    global _active
+    _active = SlowCallLog(threshold, top_n, callback, log)
+    return _active
+
+
+def disable() -> None:
+    """Stop logging slow calculations."""
+    global _active
+    _active = None
+
+
+def active_log() -> Optional[SlowCallLog]:
+    """Return the currently enabled log, or None."""
+    return _active
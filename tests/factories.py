@@ -0,0 +1,47 @@
+"""Attribute objects with known values and native setup shared by the tests."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Tuple
+
+from osu_native_py.wrapper.attributes import DifficultyAttributes
+from osu_native_py.wrapper.attributes import OsuPerformanceAttributes
+from osu_native_py.wrapper.calculators import create_difficulty_calculator
+from osu_native_py.wrapper.objects import Beatmap
+from osu_native_py.wrapper.objects import ModsCollection
+from osu_native_py.wrapper.objects import Ruleset
+
+RESOURCES_DIR = Path(__file__).parent / "resources"
+
+
+def osu_performance(i: int = 0) -> OsuPerformanceAttributes:
+    """Return osu! performance attributes that vary with ``i``, with odd ``i`` missing
+    the speed deviation."""
+    return OsuPerformanceAttributes(
+        total=100.0 + i,
+        aim=50.0,
+        speed=30.0,
+        accuracy=20.0,
+        flashlight=0.0,
+        reading=1.0,
+        effective_miss_count=float(i),
+        speed_deviation=None if i % 2 else 10.0 + i,
+        combo_based_estimated_miss_count=0.0,
+        score_based_estimated_miss_count=None,
+        aim_estimated_slider_breaks=0.0,
+        speed_estimated_slider_breaks=0.0,
+    )
+
+
+def calculation_context(
+    ruleset_id: int = 0,
+    file_name: str = "5438072.osu",
+) -> Tuple[Ruleset, Beatmap, ModsCollection, DifficultyAttributes]:
+    """Load a test beatmap with no mods and calculate its difficulty."""
+    ruleset = Ruleset.from_id(ruleset_id)
+    beatmap = Beatmap.from_file(str(RESOURCES_DIR / file_name))
+    mods = ModsCollection.create()
+    with create_difficulty_calculator(ruleset, beatmap) as calculator:
+        diff_attrs = calculator.calculate(mods)
+    return ruleset, beatmap, mods, diff_attrs
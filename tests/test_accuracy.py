@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from osu_native_py import accuracy
+from osu_native_py.wrapper.attributes import CatchDifficultyAttributes
+from osu_native_py.wrapper.attributes import ManiaDifficultyAttributes
+from osu_native_py.wrapper.attributes import OsuDifficultyAttributes
+from osu_native_py.wrapper.attributes import TaikoDifficultyAttributes
+from osu_native_py.wrapper.calculators import create_difficulty_calculator
+from osu_native_py.wrapper.objects import Beatmap
+from osu_native_py.wrapper.objects import ModsCollection
+from osu_native_py.wrapper.objects import Ruleset
+from osu_native_py.wrapper.objects import ScoreInfo
+
+TEST_DIR = Path(__file__).parent
+RESOURCES_DIR = TEST_DIR / "resources"
+
+OSU = OsuDifficultyAttributes(
+    star_rating=5.0,
+    max_combo=250,
+    aim_difficulty=2.5,
+    aim_difficult_slider_count=10.0,
+    speed_difficulty=2.0,
+    speed_note_count=50.0,
+    flashlight_difficulty=0.0,
+    reading_difficulty=1.0,
+    slider_factor=1.0,
+    aim_top_weighted_slider_factor=0.5,
+    speed_top_weighted_slider_factor=0.5,
+    aim_difficult_strain_count=20.0,
+    speed_difficult_strain_count=20.0,
+    reading_difficult_note_count=10.0,
+    nested_score_per_object=10.0,
+    legacy_score_base_multiplier=4.0,
+    maximum_legacy_combo_score=100000.0,
+    hit_circle_count=60,
+    slider_count=39,
+    spinner_count=1,
+)
+TAIKO = TaikoDifficultyAttributes(5.0, 400, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0)
+CATCH = CatchDifficultyAttributes(star_rating=5.0, max_combo=500)
+MANIA = ManiaDifficultyAttributes(star_rating=5.0, max_combo=1000)
+
+ATTRIBUTES = [OSU, TAIKO, CATCH, MANIA]
+JUDGEMENTS = [
+    "count_perfect",
+    "count_great",
+    "count_good",
+    "count_ok",
+    "count_meh",
+    "count_miss",
+]
+
+
+def _judgement_total(score):
+    return sum(getattr(score, name) for name in JUDGEMENTS)
+
+
+def test_osu_matches_osu_tools():
+    score = accuracy.score_for_accuracy(OSU, 0.98)
+
+    assert (score.count_great, score.count_ok, score.count_meh, score.count_miss) == (97, 3, 0, 0)
+    assert score.count_slider_tail_hit == 39
+    assert score.max_combo == 250
+    assert score.accuracy == pytest.approx(0.98)
+
+
+def test_taiko_and_mania_counts():
+    taiko = accuracy.score_for_accuracy(TAIKO, 0.95, misses=4)
+    assert (taiko.count_great, taiko.count_ok, taiko.count_miss) == (364, 32, 4)
+
+    mania = accuracy.score_for_accuracy(MANIA, 0.9)
+    assert mania.count_perfect == 880
+    assert _judgement_total(mania) == 1000
+    assert mania.accuracy == pytest.approx(0.9, abs=1e-3)
+
+
+def test_catch_uses_small_ticks():
+    score = accuracy.score_for_accuracy(CATCH, 0.98, misses=2, small_ticks=100)
+
+    assert score.count_great == 498
+    assert score.count_small_tick_hit + score.count_small_tick_miss == 100
+    assert score.accuracy == pytest.approx(0.98, abs=1e-3)
+
+
+@pytest.mark.parametrize("attributes", ATTRIBUTES)
+@pytest.mark.parametrize("target", [0.0, 0.5, 0.9, 0.955, 0.99, 1.0])
+@pytest.mark.parametrize("misses", [0, 3])
+def test_counts_are_consistent(attributes, target, misses):
+    score = accuracy.score_for_accuracy(attributes, target, misses=misses, small_ticks=50)
+
+    assert score.count_miss == misses
+    assert all(getattr(score, name) >= 0 for name in JUDGEMENTS)
+    if attributes is OSU:
+        assert _judgement_total(score) == 100
+    elif attributes is not CATCH:
+        assert _judgement_total(score) == attributes.max_combo
+    assert score.accuracy <= 1.0
+
+
+@pytest.mark.parametrize("attributes", ATTRIBUTES)
+def test_columns_match_scalar_solver(attributes):
+    np = pytest.importorskip("numpy")
+    targets = np.linspace(0.8, 1.0, 21)
+
+    columns = accuracy.score_columns_for_accuracies(attributes, targets, misses=[1], small_ticks=30)
+    scores = accuracy.scores_for_accuracies(attributes, targets, misses=1, small_ticks=30)
+
+    for i, score in enumerate(scores):
+        for name, column in columns.items():
+            assert column[i] == pytest.approx(getattr(score, name))
+
+
+def test_full_combo_matches_known_score():
+    with Beatmap.from_file(str(RESOURCES_DIR / "5438072.osu")) as beatmap, Ruleset.from_id(
+        0,
+    ) as ruleset, ModsCollection.create() as mods:
+        diff_attrs = create_difficulty_calculator(ruleset, beatmap).calculate(mods)
+
+    assert accuracy.score_for_accuracy(diff_attrs, 1.0) == ScoreInfo(
+        accuracy=1.0,
+        max_combo=183,
+        count_great=140,
+        count_slider_tail_hit=43,
+    )
+
+
+def test_rejects_unknown_attributes():
+    with pytest.raises(TypeError):
+        accuracy.score_for_accuracy(object(), 1.0)  # type: ignore[arg-type]
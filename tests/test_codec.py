@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import pickle
+from ctypes import sizeof
+
+import pytest
+from factories import osu_performance
+
+from osu_native_py import codec
+from osu_native_py.native import NativeOsuPerformanceAttributes
+from osu_native_py.native import NativeTaikoDifficultyAttributes
+from osu_native_py.wrapper.attributes import CatchPerformanceAttributes
+from osu_native_py.wrapper.attributes import OsuPerformanceAttributes
+from osu_native_py.wrapper.attributes import TaikoDifficultyAttributes
+
+
+def _taiko_difficulty(i=0):
+    return TaikoDifficultyAttributes(
+        star_rating=5.5 + i,
+        max_combo=1000 + i,
+        mechanical_difficulty=4.0,
+        rhythm_difficulty=1.25,
+        reading_difficulty=0.5,
+        colour_difficulty=2.0,
+        stamina_difficulty=3.0,
+        mono_stamina_factor=0.1,
+        consistency_factor=0.9,
+        stamina_top_strains=12.0,
+    )
+
+
+def test_record_matches_native_layout():
+    attributes = _taiko_difficulty()
+    taiko = codec.codec_for(TaikoDifficultyAttributes)
+
+    assert taiko.size == sizeof(NativeTaikoDifficultyAttributes)
+    assert taiko.pack(attributes) == bytes(attributes.to_native())
+    assert codec.codec_for(OsuPerformanceAttributes).size == sizeof(NativeOsuPerformanceAttributes)
+
+
+def test_round_trip_keeps_optional_values():
+    for attributes in (osu_performance(0), osu_performance(1), _taiko_difficulty()):
+        data = codec.encode(attributes)
+
+        assert len(data) == 1 + codec.codec_for(type(attributes)).size
+        assert codec.decode(data) == attributes
+
+    assert codec.decode(codec.encode(osu_performance(1))).speed_deviation is None
+
+
+def test_pack_many():
+    osu = codec.codec_for(OsuPerformanceAttributes)
+    results = [osu_performance(i) for i in range(10)]
+    blob = osu.pack_many(results)
+
+    assert len(blob) == 10 * osu.size
+    assert osu.unpack_many(blob) == results
+    assert osu.unpack(blob, 3 * osu.size) == results[3]
+
+
+def test_records_are_smaller_than_pickle():
+    attributes = osu_performance()
+
+    assert len(codec.encode(attributes)) < len(pickle.dumps(attributes))
+
+
+def test_errors():
+    with pytest.raises(TypeError):
+        codec.codec_for(int)
+
+    with pytest.raises(TypeError):
+        codec.codec_for(OsuPerformanceAttributes).pack(CatchPerformanceAttributes(total=1.0))
+
+    with pytest.raises(ValueError, match="Unknown attributes type tag"):
+        codec.decode(b"\xff")
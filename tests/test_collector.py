@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import math
+
+import pytest
+from factories import osu_performance
+
+from osu_native_py.wrapper.attributes import AttributeCollector
+from osu_native_py.wrapper.attributes import OsuDifficultyAttributes
+from osu_native_py.wrapper.attributes import OsuPerformanceAttributes
+from osu_native_py.wrapper.attributes import TaikoPerformanceAttributes
+
+np = pytest.importorskip("numpy")
+
+
+def test_collector_grows_and_exports():
+    collector = AttributeCollector(OsuPerformanceAttributes, capacity=2)
+    collector.extend(osu_performance(i) for i in range(5))
+
+    assert len(collector) == 5
+    assert collector.optional_columns == ["speed_deviation", "score_based_estimated_miss_count"]
+
+    columns = collector.to_dict()
+    assert list(columns) == collector.columns
+    assert columns["total"].tolist() == [100.0, 101.0, 102.0, 103.0, 104.0]
+    assert columns["speed_deviation"].mask.tolist() == [False, True, False, True, False]
+    assert columns["speed_deviation"].compressed().tolist() == [10.0, 12.0, 14.0]
+    assert columns["score_based_estimated_miss_count"].mask.all()
+
+    plain = collector.to_dict(masked=False)
+    assert math.isnan(plain["speed_deviation"][1])
+    assert plain["speed_deviation_mask"].dtype == np.bool_
+
+
+def test_collector_records_keep_types():
+    collector = AttributeCollector(OsuDifficultyAttributes)
+    collector.add(
+        OsuDifficultyAttributes(
+            star_rating=7.5,
+            max_combo=183,
+            aim_difficulty=4.0,
+            aim_difficult_slider_count=30.0,
+            speed_difficulty=2.0,
+            speed_note_count=120.0,
+            flashlight_difficulty=0.0,
+            reading_difficulty=2.0,
+            slider_factor=1.0,
+            aim_top_weighted_slider_factor=0.4,
+            speed_top_weighted_slider_factor=0.5,
+            aim_difficult_strain_count=58.0,
+            speed_difficult_strain_count=62.0,
+            reading_difficult_note_count=37.0,
+            nested_score_per_object=18.0,
+            legacy_score_base_multiplier=4.0,
+            maximum_legacy_combo_score=615888.0,
+            hit_circle_count=140,
+            slider_count=43,
+            spinner_count=0,
+        ),
+    )
+
+    records = collector.to_records()
+    assert records.dtype["max_combo"] == np.int64
+    assert records.dtype["star_rating"] == np.float64
+    assert records[0].slider_count == 43
+
+
+def test_collector_clear_and_type_check():
+    collector = AttributeCollector(TaikoPerformanceAttributes)
+    collector.add(TaikoPerformanceAttributes(1.0, 1.0, 1.0, None))
+    collector.clear()
+    collector.add(TaikoPerformanceAttributes(2.0, 1.0, 1.0, 95.0))
+
+    columns = collector.to_dict()
+    assert columns["total"].tolist() == [2.0]
+    assert columns["estimated_unstable_rate"].mask.tolist() == [False]
+
+    with pytest.raises(TypeError):
+        collector.add(osu_performance(0))
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import math
+from dataclasses import asdict
+
+import pytest
+from factories import calculation_context
+
+from osu_native_py.wrapper.calculators import create_performance_calculator
+from osu_native_py.wrapper.objects import ScoreInfo
+
+np = pytest.importorskip("numpy")
+
+BEATMAPS = [
+    (0, "5438072.osu"),
+    (1, "221923.osu"),
+    (2, "4289411.osu"),
+    (3, "5107047.osu"),
+]
+
+
+@pytest.mark.parametrize("ruleset_id,file_name", BEATMAPS)
+def test_calculate_columns_matches_calculate_many(ruleset_id, file_name):
+    ruleset, beatmap, mods, diff_attrs = calculation_context(ruleset_id, file_name)
+    perf_calc = create_performance_calculator(ruleset)
+
+    accuracy = np.linspace(0.9, 1.0, 7)
+    count_miss = np.array([0, 1, 2, 3, 0, 1, 5], dtype=np.int32)
+    legacy_total_score = np.array([-1, 100000, -1, 2000000, -1, -1, 5000], dtype=np.int64)
+    max_combo = diff_attrs.max_combo
+
+    columns = perf_calc.calculate_columns(
+        ruleset,
+        beatmap,
+        mods,
+        {
+            "accuracy": accuracy,
+            "count_miss": count_miss,
+            "legacy_total_score": legacy_total_score,
+            "max_combo": max_combo,
+        },
+        diff_attrs,
+    )
+
+    scores = [
+        ScoreInfo(
+            accuracy=float(accuracy[i]),
+            count_miss=int(count_miss[i]),
+            legacy_total_score=int(legacy_total_score[i]) if legacy_total_score[i] >= 0 else None,
+            max_combo=max_combo,
+        )
+        for i in range(len(accuracy))
+    ]
+    expected = perf_calc.calculate_many(ruleset, beatmap, mods, scores, diff_attrs)
+
+    assert list(columns) == list(asdict(expected[0]))
+
+    for name, column in columns.items():
+        assert column.dtype == np.float64
+        assert column.shape == (len(scores),)
+
+        for value, attributes in zip(column, expected):
+            expected_value = getattr(attributes, name)
+            if expected_value is None:
+                assert math.isnan(value)
+            else:
+                assert value == pytest.approx(expected_value)
+
+
+def test_calculate_columns_structured_array():
+    ruleset, beatmap, mods, diff_attrs = calculation_context(0, "5438072.osu")
+    perf_calc = create_performance_calculator(ruleset)
+
+    scores = np.zeros(3, dtype=[("accuracy", "f8"), ("max_combo", "i4"), ("count_ok", "i4")])
+    scores["accuracy"] = [0.95, 0.97, 0.99]
+    scores["max_combo"] = diff_attrs.max_combo
+    scores["count_ok"] = [10, 5, 1]
+
+    columns = perf_calc.calculate_columns(ruleset, beatmap, mods, scores, diff_attrs)
+    single = perf_calc.calculate(
+        ruleset,
+        beatmap,
+        mods,
+        ScoreInfo(accuracy=0.97, max_combo=diff_attrs.max_combo, count_ok=5),
+        diff_attrs,
+    )
+
+    assert columns["total"][1] == pytest.approx(single.total)
+
+
+def test_calculate_columns_rejects_bad_input():
+    ruleset, beatmap, mods, diff_attrs = calculation_context(0, "5438072.osu")
+    perf_calc = create_performance_calculator(ruleset)
+
+    with pytest.raises(ValueError):
+        perf_calc.calculate_columns(ruleset, beatmap, mods, {"acc": [1.0]}, diff_attrs)
+
+    with pytest.raises(ValueError):
+        perf_calc.calculate_columns(
+            ruleset,
+            beatmap,
+            mods,
+            {"accuracy": [1.0, 0.9], "count_miss": [0, 1, 2]},
+            diff_attrs,
+        )
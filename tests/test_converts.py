@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from osu_native_py.converts import calculate_all_rulesets
+from osu_native_py.wrapper.attributes import CatchDifficultyAttributes
+from osu_native_py.wrapper.attributes import ManiaDifficultyAttributes
+from osu_native_py.wrapper.attributes import OsuDifficultyAttributes
+from osu_native_py.wrapper.attributes import TaikoDifficultyAttributes
+from osu_native_py.wrapper.calculators import create_difficulty_calculator
+from osu_native_py.wrapper.objects import Beatmap
+from osu_native_py.wrapper.objects import ModsCollection
+from osu_native_py.wrapper.objects import Ruleset
+
+RESOURCES_DIR = Path(__file__).parent / "resources"
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_calculate_all_rulesets(max_workers):
+    with Beatmap.from_file(str(RESOURCES_DIR / "5438072.osu")) as beatmap:
+        results = calculate_all_rulesets(beatmap, max_workers=max_workers)
+
+        with Ruleset.from_id(1) as taiko, ModsCollection.create() as mods:
+            with create_difficulty_calculator(taiko, beatmap) as calculator:
+                expected = calculator.calculate(mods)
+
+    assert list(results) == [0, 1, 2, 3]
+    assert all(result.ok for result in results.values())
+    assert isinstance(results[0].attributes, OsuDifficultyAttributes)
+    assert isinstance(results[1].attributes, TaikoDifficultyAttributes)
+    assert isinstance(results[2].attributes, CatchDifficultyAttributes)
+    assert isinstance(results[3].attributes, ManiaDifficultyAttributes)
+    assert results[1].attributes == expected
+
+
+def test_mods_per_ruleset():
+    with Beatmap.from_file(str(RESOURCES_DIR / "5438072.osu")) as beatmap:
+        results = calculate_all_rulesets(beatmap, {0: ["DT"], 1: [], 3: ["NOPE"]})
+
+    assert list(results) == [0, 1, 3]
+    assert results[0].ok and results[1].ok
+    assert results[0].attributes is not None
+    assert results[0].attributes.star_rating > 0
+    assert not results[3].ok
+    assert results[3].attributes is None
+    assert results[3].error is not None
+    assert "Failed to" in results[3].error
+
+
+def test_non_osu_beatmaps_do_not_convert():
+    with Beatmap.from_file(str(RESOURCES_DIR / "5107047.osu")) as beatmap:
+        assert list(calculate_all_rulesets(beatmap)) == [3]
+
+        results = calculate_all_rulesets(beatmap, {0: [], 3: []})
+        assert results[3].ok
+        assert not results[0].ok
+        assert results[0].error is not None
+        assert "cannot be converted" in results[0].error
+
+        with pytest.raises(ValueError):
+            calculate_all_rulesets(beatmap, {4: []})
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from osu_native_py.cost import estimate_cost
+from osu_native_py.cost import estimate_file_cost
+from osu_native_py.cost import estimate_text_cost
+from osu_native_py.wrapper.objects import Beatmap
+
+TEST_DIR = Path(__file__).parent
+RESOURCES_DIR = TEST_DIR / "resources"
+
+SMALL = RESOURCES_DIR / "5438072.osu"
+LARGE = RESOURCES_DIR / "5107047.osu"
+
+
+def test_estimate_file_cost_counts_objects():
+    cost = estimate_file_cost(SMALL)
+
+    assert cost.hit_objects == 140
+    assert cost.sliders == 43
+    assert cost.slider_spans >= cost.sliders
+    assert 0.0 < cost.slider_density < 1.0
+    assert cost.drain_length > 0.0
+    assert cost.cost > cost.hit_objects
+
+
+def test_estimate_file_cost_orders_beatmaps():
+    small = estimate_file_cost(SMALL)
+    large = estimate_file_cost(LARGE)
+
+    assert large.holds > 0
+    assert large.cost > 10 * small.cost
+    assert large.is_heavy(threshold=small.cost * 10)
+    assert not small.is_heavy()
+
+
+def test_estimate_cost_matches_beatmap_text():
+    with Beatmap.from_file(str(SMALL)) as beatmap:
+        assert estimate_cost(beatmap) == estimate_file_cost(SMALL)
+
+
+def test_breaks_reduce_drain_length():
+    text = "\n".join(
+        [
+            "[Events]",
+            "2,1000,9000",
+            "[HitObjects]",
+            "256,192,0,1,0,0:0:0:0:",
+            "256,192,10000,2,0,B|300:192,2,100",
+            "256,192,20000,12,0,21000,0:0:0:0:",
+        ]
+    )
+    cost = estimate_text_cost(text)
+
+    assert cost.hit_objects == 3
+    assert cost.sliders == 1
+    assert cost.spinners == 1
+    assert cost.slider_spans == 2
+    assert cost.slider_length == pytest.approx(200.0)
+    assert cost.drain_length == pytest.approx(12000.0)
+
+
+def test_estimate_text_cost_without_hit_objects():
+    cost = estimate_text_cost("osu file format v14\n")
+
+    assert cost.hit_objects == 0
+    assert cost.slider_density == 0.0
+    assert cost.cost == 0.0
+
+
+def test_scan_cost_skips_malformed_lines():
+    text = "\n".join(
+        [
+            "[Events]",
+            "2,1000,soon",
+            "[HitObjects]",
+            "256,192,0,1,0,0:0:0:0:",
+            "256,192,abc,1,0,0:0:0:0:",
+            "256,192,500,x,0,0:0:0:0:",
+            "256,192,1000,2,0,B|300:192,many,100",
+            "256,192,2000,1,0,0:0:0:0:",
+        ]
+    )
+    cost = estimate_text_cost(text)
+
+    assert cost.hit_objects == 2
+    assert cost.sliders == 0
+    assert cost.drain_length == pytest.approx(2000.0)
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import pytest
+from factories import calculation_context
+
+from osu_native_py.accuracy import score_for_accuracy
+from osu_native_py.curve import accuracy_for_performance
+from osu_native_py.curve import misses_for_performance
+from osu_native_py.curve import performance_curve
+from osu_native_py.wrapper.calculators import create_performance_calculator
+
+
+def test_performance_curve_matches_single_calculations():
+    ruleset, beatmap, mods, diff_attrs = calculation_context()
+    perf_calc = create_performance_calculator(ruleset)
+
+    curve = performance_curve(
+        ruleset,
+        beatmap,
+        mods,
+        diff_attrs,
+        accuracies=(0.95, 0.98, 1.0),
+        misses=(0, 2),
+        calculator=perf_calc,
+    )
+
+    assert len(curve) == 6
+    assert [(accuracy, misses) for accuracy, misses, _ in curve.rows()] == [
+        (0.95, 0),
+        (0.98, 0),
+        (1.0, 0),
+        (0.95, 2),
+        (0.98, 2),
+        (1.0, 2),
+    ]
+
+    for accuracy, misses, total in curve.rows():
+        score = score_for_accuracy(diff_attrs, accuracy, misses)
+        expected = perf_calc.calculate(ruleset, beatmap, mods, score, diff_attrs)
+        assert total == pytest.approx(expected.total)
+        assert curve.total(accuracy, misses) == total
+
+    totals = curve.totals()
+    assert totals[0] == sorted(totals[0])
+    assert totals[1][-1] < totals[0][-1]
+    assert curve.to_dict()["total"] == totals
+
+    with pytest.raises(KeyError):
+        curve.get(0.5)
+
+
+def test_accuracy_for_performance():
+    ruleset, beatmap, mods, diff_attrs = calculation_context()
+    perf_calc = create_performance_calculator(ruleset)
+    context = (ruleset, beatmap, mods, diff_attrs)
+    target = perf_calc.calculate(
+        ruleset,
+        beatmap,
+        mods,
+        score_for_accuracy(diff_attrs, 0.97),
+        diff_attrs,
+    ).total
+
+    solution = accuracy_for_performance(*context, target, calculator=perf_calc)
+
+    assert solution.converged and solution.value is not None
+    assert solution.performance.total >= target
+    assert solution.value == pytest.approx(0.97, abs=0.01)
+    assert solution.evaluations <= 20
+
+    lower = score_for_accuracy(diff_attrs, solution.value - 0.002)
+    assert perf_calc.calculate(ruleset, beatmap, mods, lower, diff_attrs).total < target
+
+    unreachable = accuracy_for_performance(*context, 1e9, calculator=perf_calc)
+    assert unreachable.value is None
+    assert unreachable.evaluations == 1
+
+
+def test_misses_for_performance():
+    ruleset, beatmap, mods, diff_attrs = calculation_context()
+    perf_calc = create_performance_calculator(ruleset)
+    context = (ruleset, beatmap, mods, diff_attrs)
+    at_three_misses = performance_curve(*context, accuracies=(0.98,), misses=(3,))
+
+    solution = misses_for_performance(
+        *context,
+        at_three_misses.total(0.98, 3),
+        accuracy=0.98,
+        calculator=perf_calc,
+    )
+
+    assert solution.converged and solution.value is not None
+    assert solution.value >= 3
+    assert solution.performance.total >= at_three_misses.total(0.98, 3)
+    assert solution.evaluations <= 12
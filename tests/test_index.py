@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+
+import pytest
+
+from osu_native_py import index
+from osu_native_py.wrapper.attributes.difficulty.osu import OsuDifficultyAttributes
+from osu_native_py.wrapper.calculators import create_difficulty_calculator
+from osu_native_py.wrapper.objects import Beatmap
+from osu_native_py.wrapper.objects import ModsCollection
+from osu_native_py.wrapper.objects import Ruleset
+
+TEST_DIR = Path(__file__).parent
+RESOURCES_DIR = TEST_DIR / "resources"
+
+
+@pytest.mark.parametrize("file_name", sorted(p.name for p in RESOURCES_DIR.glob("*.osu")))
+def test_index_matches_native_beatmap(file_name):
+    path = RESOURCES_DIR / file_name
+    entry = index.scan_file(path)
+
+    assert entry.md5 == hashlib.md5(path.read_bytes()).hexdigest()
+
+    with Beatmap.from_file(str(path)) as beatmap:
+        assert entry.title == beatmap.title
+        assert entry.artist == beatmap.artist
+        assert entry.version == beatmap.version
+        assert entry.beatmap_id == beatmap.beatmap_id
+        assert entry.ruleset_id == beatmap.ruleset_id
+        assert entry.approach_rate == pytest.approx(beatmap.approach_rate, abs=1e-5)
+        assert entry.drain_rate == pytest.approx(beatmap.drain_rate, abs=1e-5)
+        assert entry.overall_difficulty == pytest.approx(beatmap.overall_difficulty, abs=1e-5)
+        assert entry.circle_size == pytest.approx(beatmap.circle_size, abs=1e-5)
+        assert entry.slider_multiplier == pytest.approx(beatmap.slider_multiplier)
+        assert entry.slider_tick_rate == pytest.approx(beatmap.slider_tick_rate)
+
+        if beatmap.ruleset_id == 0:
+            with Ruleset.from_id(0) as ruleset, ModsCollection.create() as mods:
+                attributes = create_difficulty_calculator(ruleset, beatmap).calculate(mods)
+
+            assert isinstance(attributes, OsuDifficultyAttributes)
+            assert entry.circle_count == attributes.hit_circle_count
+            assert entry.slider_count == attributes.slider_count
+            assert entry.spinner_count == attributes.spinner_count
+
+
+def test_index_directory_and_errors(tmp_path):
+    entries = list(index.scan_directory(RESOURCES_DIR))
+    assert {entry.beatmap_id for entry in entries} == {5438072, 221923, 4289411, 5107047}
+    assert sum(entry.hit_object_count for entry in entries) == 140 + 455 + 1233 + 16900
+
+    (tmp_path / "broken.osu").write_text("not a beatmap")
+    assert list(index.scan_directory(tmp_path)) == []
+
+    with pytest.raises(ValueError):
+        list(index.scan_directory(tmp_path, skip_errors=False))
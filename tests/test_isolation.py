@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import multiprocessing
+from pathlib import Path
+
+import pytest
+
+from osu_native_py.server import BeatmapContextCache
+from osu_native_py.server import IsolatedWorkerPool
+from osu_native_py.server import QuarantinedError
+from osu_native_py.server import WorkerTimeoutError
+from osu_native_py.server.cache import calculate_batch
+from osu_native_py.wrapper.objects import ScoreInfo
+
+TEST_DIR = Path(__file__).parent
+RESOURCES_DIR = TEST_DIR / "resources"
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with IsolatedWorkerPool(RESOURCES_DIR, workers=1, timeout=60.0) as pool:
+        yield pool
+
+
+def test_isolated_results_match_in_process(pool):
+    key = ("performance", 5438072, None, ("DT",))
+    scores = [ScoreInfo(accuracy=1.0, max_combo=183), ScoreInfo(accuracy=0.95, count_miss=2)]
+
+    isolated = pool.run(key, scores)
+
+    cache = BeatmapContextCache(RESOURCES_DIR, name="test_isolation_cache")
+    try:
+        expected = calculate_batch(cache, key, scores)
+    finally:
+        cache.clear()
+
+    assert [result.total for result in isolated] == pytest.approx(
+        [result.total for result in expected],
+    )
+
+
+def test_calculation_errors_are_not_quarantined(pool):
+    with pytest.raises(ValueError, match="Invalid mod"):
+        pool.run(("difficulty", 5438072, None, ("NOPE",)), [None])
+
+    with pytest.raises(FileNotFoundError):
+        pool.run(("difficulty", 1, None, ()), [None])
+
+    assert pool.quarantined == {}
+    assert len(pool.run(("difficulty", 5438072, None, ()), [None, None])) == 2
+
+
+def test_dead_idle_worker_is_replaced(pool):
+    respawns = pool.stats()["respawns"]
+    for process in multiprocessing.active_children():
+        if process.name == "osu-native-isolated-worker":
+            process.kill()
+            process.join()
+
+    assert pool.run(("difficulty", 5438072, None, ()), [None])[0].star_rating > 0
+    assert pool.stats()["respawns"] == respawns + 1
+
+
+def test_timeout_kills_worker_and_quarantines():
+    with IsolatedWorkerPool(RESOURCES_DIR, workers=1, timeout=0.001) as pool:
+        key = ("difficulty", 5107047, None, ())
+        with pytest.raises(WorkerTimeoutError):
+            pool.run(key, [None])
+
+        assert 5107047 in pool.quarantined
+        with pytest.raises(QuarantinedError):
+            pool.run(key, [None])
+
+        stats = pool.stats()
+        assert stats["timeouts"] == 1
+        assert stats["respawns"] == 1
+        assert stats["rejected"] == 1
+
+        pool.release(5107047)
+        assert pool.quarantined == {}
+
+
+def test_initial_quarantine():
+    with IsolatedWorkerPool(RESOURCES_DIR, workers=1, quarantine=[5438072]) as pool:
+        with pytest.raises(QuarantinedError):
+            pool.run(("difficulty", 5438072, None, ()), [None])
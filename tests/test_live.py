@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from osu_native_py.live import LivePerformanceSession
+from osu_native_py.wrapper.attributes import TaikoDifficultyAttributes
+from osu_native_py.wrapper.calculators import create_difficulty_calculator
+from osu_native_py.wrapper.calculators import create_performance_calculator
+from osu_native_py.wrapper.objects import Beatmap
+from osu_native_py.wrapper.objects import ModsCollection
+from osu_native_py.wrapper.objects import Ruleset
+
+TEST_DIR = Path(__file__).parent
+BEATMAP_PATH = TEST_DIR / "resources/5438072.osu"
+
+
+def test_session_tracks_score():
+    with Ruleset.from_id(0) as ruleset, Beatmap.from_file(
+        str(BEATMAP_PATH)
+    ) as beatmap, ModsCollection.create() as mods:
+        with LivePerformanceSession(ruleset, beatmap, mods) as session:
+            session.add("great", 10)
+            session.add("slider_tail_hit")
+            session.add("ok")
+            session.add("miss")
+            pp = session.judge("meh")
+
+            assert session.combo == 1
+            assert session.max_combo == 12
+            assert session.accuracy == pytest.approx((10 * 6 + 2 + 1) / (13 * 6))
+
+            score = session.score_info()
+            assert score.count_great == 10
+            assert score.count_ok == score.count_meh == score.count_miss == 1
+            assert score.count_slider_tail_hit == 1
+            assert score.max_combo == 12
+
+            diff_attrs = session.difficulty_attributes
+            expected = create_performance_calculator(ruleset).calculate(
+                ruleset, beatmap, mods, score, diff_attrs
+            )
+            assert pp == pytest.approx(expected.total)
+            assert session.performance() == expected
+
+            session.reset()
+            assert session.score_info().count_great == 0
+            assert session.accuracy == 1.0
+
+
+def test_sessions_share_difficulty_and_calculator():
+    with Ruleset.from_id(0) as ruleset, Beatmap.from_file(
+        str(BEATMAP_PATH)
+    ) as beatmap, ModsCollection.create() as mods:
+        diff_attrs = create_difficulty_calculator(ruleset, beatmap).calculate(mods)
+
+        with create_performance_calculator(ruleset) as calculator:
+            sessions = [
+                LivePerformanceSession(ruleset, beatmap, mods, diff_attrs, calculator)
+                for _ in range(3)
+            ]
+            for i, session in enumerate(sessions):
+                session.add("great", 20 + i)
+            totals = [session.performance_total() for session in sessions]
+            assert totals == sorted(totals)
+
+            for session in sessions:
+                session.close()
+            assert not calculator.is_closed
+
+        assert not hasattr(sessions[0], "__dict__")
+
+
+def test_session_errors():
+    with Ruleset.from_id(0) as ruleset, Beatmap.from_file(
+        str(BEATMAP_PATH)
+    ) as beatmap, ModsCollection.create() as mods:
+        with pytest.raises(TypeError):
+            LivePerformanceSession(
+                ruleset,
+                beatmap,
+                mods,
+                TaikoDifficultyAttributes(0.0, 0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0),
+            )
+
+        session = LivePerformanceSession(ruleset, beatmap, mods)
+        with pytest.raises(ValueError, match="Unknown judgement"):
+            session.judge("perfect")
+
+        session.close()
+        with pytest.raises(RuntimeError):
+            session.judge("great")
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from osu_native_py import metrics
+from osu_native_py.wrapper.objects import Ruleset
+
+
+class _Cache:
+    def stats(self):
+        return {"hits": 3, "misses": 1, "size": 2, "capacity": 8}
+
+
+class _Pool:
+    def stats(self):
+        return {"workers": 4, "active": 1, "queue_depth": 5}
+
+
+def test_handle_counts():
+    before = metrics.collect()["handles"].get("Ruleset", {"created": 0, "live": 0})
+
+    ruleset = Ruleset.from_id(0)
+    during = metrics.collect()["handles"]["Ruleset"]
+    assert during["created"] == before["created"] + 1
+    assert during["live"] == before["live"] + 1
+
+    ruleset.close()
+    after = metrics.collect()["handles"]["Ruleset"]
+    assert after["live"] == before["live"]
+    assert 'osu_native_handles_live{type="Ruleset"}' in metrics.render_prometheus()
+
+
+def test_registered_caches_and_pools():
+    cache = _Cache()
+    pool = _Pool()
+    cache_name = metrics.register_cache("test_cache", cache)
+    pool_name = metrics.register_pool("test_pool", pool)
+
+    try:
+        collected = metrics.collect()
+        assert collected["caches"][cache_name]["hit_ratio"] == 0.75
+        assert collected["pools"][pool_name]["utilisation"] == 0.25
+
+        text = metrics.render_prometheus()
+        assert f'osu_native_cache_hit_ratio{{cache="{cache_name}"}} 0.75' in text
+        assert f'osu_native_pool_queue_depth{{pool="{pool_name}"}} 5' in text
+        assert "# TYPE osu_native_cache_hits_total counter" in text
+
+        assert metrics.register_cache("test_cache", _Cache()) != cache_name
+    finally:
+        metrics.unregister(cache_name)
+        metrics.unregister(pool_name)
+
+    assert cache_name not in metrics.collect()["caches"]
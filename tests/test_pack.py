@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from osu_native_py import pack
+from osu_native_py.wrapper.objects import Beatmap
+
+TEST_DIR = Path(__file__).parent
+RESOURCES_DIR = TEST_DIR / "resources"
+FILES = sorted(RESOURCES_DIR.glob("*.osu"))
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_pack_round_trip(tmp_path, compress):
+    path = tmp_path / "library.pack"
+    assert pack.build_pack(FILES, path, compress=compress) == len(FILES)
+
+    with pack.open_pack(path) as library:
+        assert len(library) == len(FILES)
+
+        for file in FILES:
+            beatmap_id = int(file.stem)
+            assert beatmap_id in library
+            assert library.read_text(beatmap_id) == file.read_text(encoding="utf-8-sig")
+
+            with library.get(beatmap_id) as beatmap, Beatmap.from_file(str(file)) as expected:
+                assert beatmap.beatmap_id == beatmap_id
+                assert beatmap.title == expected.title
+                assert beatmap.version == expected.version
+
+        with pytest.raises(KeyError):
+            library.get(1)
+
+
+def test_pack_append(tmp_path):
+    path = tmp_path / "library.pack"
+    pack.build_pack(FILES[:1], path)
+
+    with pack.PackBuilder(path, compress=True) as builder:
+        for file in FILES[1:]:
+            builder.add_file(file)
+
+    with pack.open_pack(path) as library:
+        assert sorted(library) == sorted(int(file.stem) for file in FILES)
+        assert [entry.compressed for entry in library.entries()] == [False] + [True] * (
+            len(FILES) - 1
+        )
+
+
+def test_pack_get_by_checksum(tmp_path):
+    path = tmp_path / "library.pack"
+    pack.build_pack(FILES, path)
+
+    with pack.open_pack(path) as library:
+        entry = library.entry(int(FILES[0].stem))
+
+        with library.get_by_checksum(entry.md5.upper()) as beatmap:
+            assert beatmap.beatmap_id == entry.beatmap_id
+
+
+def test_open_pack_rejects_other_files():
+    with pytest.raises(ValueError):
+        pack.open_pack(FILES[0])
+
+
+def test_rejected_files_are_closed(tmp_path, monkeypatch):
+    opened = []
+
+    def recording_open(*args, **kwargs):
+        file = open(*args, **kwargs)
+        opened.append(file)
+        return file
+
+    monkeypatch.setattr(pack, "open", recording_open, raising=False)
+    path = tmp_path / "not_a_pack.osu"
+    path.write_bytes(FILES[0].read_bytes())
+
+    with pytest.raises(ValueError):
+        pack.open_pack(path)
+    with pytest.raises(ValueError):
+        pack.PackBuilder(path)
+
+    assert len(opened) == 2
+    assert all(file.closed for file in opened)
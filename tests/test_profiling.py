@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from osu_native_py import profiling
+from osu_native_py.native import bindings
+from osu_native_py.wrapper.calculators import create_difficulty_calculator
+from osu_native_py.wrapper.objects import Beatmap
+from osu_native_py.wrapper.objects import ModsCollection
+from osu_native_py.wrapper.objects import Ruleset
+
+TEST_DIR = Path(__file__).parent
+BEATMAP_PATH = TEST_DIR / "resources/5438072.osu"
+
+
+def test_profile_scope():
+    original = bindings.OsuDifficultyCalculator_Calculate
+    assert not profiling.is_enabled()
+
+    with profiling.profile() as scope:
+        assert profiling.is_enabled()
+        assert bindings.OsuDifficultyCalculator_Calculate is not original
+
+        beatmap = Beatmap.from_file(str(BEATMAP_PATH))
+        ruleset = Ruleset.from_id(0)
+        mods = ModsCollection.create()
+        assert beatmap.title
+
+        with create_difficulty_calculator(ruleset, beatmap) as calculator:
+            calculator.calculate(mods)
+            calculator.calculate(mods)
+
+    assert not profiling.is_enabled()
+    assert bindings.OsuDifficultyCalculator_Calculate is original
+
+    calculate = scope.stats["OsuDifficultyCalculator_Calculate"]
+    assert calculate.calls == 2
+    assert sum(calculate.buckets) == 2
+    assert 0 < calculate.min_time <= calculate.max_time
+    assert scope.stats["Beatmap_CreateFromFile"].string_bytes == len(str(BEATMAP_PATH)) + 1
+    assert scope.stats["Beatmap_GetTitle"].calls >= 1
+    assert scope.wall_time >= scope.native_time > 0
+
+
+def test_snapshot_and_reset():
+    profiling.reset()
+    profiling.enable()
+    try:
+        Ruleset.from_id(1).close()
+    finally:
+        profiling.disable()
+
+    stats = profiling.snapshot()
+    assert stats["Ruleset_CreateFromId"].calls == 1
+    assert stats["Ruleset_Destroy"].calls == 1
+
+    Ruleset.from_id(1).close()
+    assert profiling.snapshot()["Ruleset_CreateFromId"].calls == 1
+
+    profiling.reset()
+    assert profiling.snapshot() == {}
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from osu_native_py.server import BeatmapContextCache
+from osu_native_py.server import CalculationClient
+from osu_native_py.server import CalculationServer
+from osu_native_py.server import CalculationService
+from osu_native_py.server import MicroBatcher
+from osu_native_py.server import QueueFullError
+from osu_native_py.server import run_load
+from osu_native_py.wrapper.objects import ModsCollection
+
+TEST_DIR = Path(__file__).parent
+RESOURCES_DIR = TEST_DIR / "resources"
+
+
+@pytest.fixture
+def server():
+    service = CalculationService(RESOURCES_DIR, max_delay=0.005)
+    server = CalculationServer(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+def test_server_endpoints(server):
+    port = server.server_address[1]
+
+    with CalculationClient(port=port) as client:
+        difficulty = client.difficulty(5438072, ["HD", "DT"])
+        assert difficulty["star_rating"] == pytest.approx(7.498739590295447)
+
+        score = {"accuracy": 1.0, "max_combo": 183, "count_great": 140, "count_slider_tail_hit": 43}
+        performance = client.performance(5438072, score, ["HD", "DT"])
+        assert performance["total"] == pytest.approx(524.5147724726088)
+
+        with pytest.raises(RuntimeError, match="404"):
+            client.difficulty(1)
+
+        with pytest.raises(RuntimeError, match="400"):
+            client.request("POST", "/performance", {"beatmap_id": 5438072})
+
+
+def test_server_rejects_invalid_mods(server, monkeypatch):
+    created = []
+    create = ModsCollection.create
+
+    def record():
+        mods = create()
+        created.append(mods)
+        return mods
+
+    monkeypatch.setattr(ModsCollection, "create", record)
+    port = server.server_address[1]
+
+    with CalculationClient(port=port) as client:
+        with pytest.raises(RuntimeError, match="400"):
+            client.difficulty(5438072, ["HD", "XX"])
+
+        assert client.difficulty(5438072, ["HD"])["star_rating"] > 0
+
+    assert len(created) == 2
+    assert created[0].is_closed and not created[1].is_closed
+
+
+def test_server_answers_unexpected_errors(server, monkeypatch):
+    def fail(payload):
+        raise KeyError("boom")
+
+    monkeypatch.setattr(server.service, "difficulty", fail)
+    port = server.server_address[1]
+
+    with CalculationClient(port=port) as client:
+        with pytest.raises(RuntimeError, match="500"):
+            client.difficulty(5438072)
+
+
+def test_server_batches_concurrent_requests(server):
+    port = server.server_address[1]
+    score = {"accuracy": 0.98, "max_combo": 183, "count_great": 136, "count_ok": 4}
+    requests = [{"beatmap_id": 5438072, "mods": ["DT"], "score": score}] * 64
+
+    report = run_load(requests, concurrency=16, port=port)
+    assert report["errors"] == 0
+
+    with CalculationClient(port=port) as client:
+        stats = client.stats()
+
+    assert stats["batcher"]["items"] == 64
+    assert stats["batcher"]["batches"] < 64
+    assert stats["batcher"]["queue_depth"] == 0
+    # Batches running concurrently can each miss before the first load finishes.
+    assert 1 <= stats["cache"]["misses"] <= stats["batcher"]["batches"]
+
+
+def test_cache_bounds_cost_estimates(monkeypatch):
+    monkeypatch.setattr("osu_native_py.server.cache.COSTS_PER_CONTEXT", 1)
+    cache = BeatmapContextCache(RESOURCES_DIR, capacity=2)
+
+    first = cache.cost(5438072)
+    cache.cost(4289411)
+    assert cache.cost(5438072) is first
+
+    cache.cost(221923)
+    assert list(cache._costs) == [5438072, 221923]
+
+
+def test_service_routes_heavy_beatmaps_to_heavy_lane():
+    service = CalculationService(RESOURCES_DIR, max_delay=0.005, heavy_threshold=1000.0)
+
+    try:
+        assert service.cache.cost(5438072).cost < 1000.0
+        assert service.cache.cost(4289411).cost >= 1000.0
+
+        service.difficulty({"beatmap_id": 5438072})
+        service.difficulty({"beatmap_id": 4289411})
+
+        stats = service.stats()
+        assert stats["batcher"]["items"] == 1
+        assert stats["heavy_batcher"]["items"] == 1
+
+        with pytest.raises(FileNotFoundError):
+            service.difficulty({"beatmap_id": 1})
+    finally:
+        service.close()
+
+
+def test_batcher_rejects_new_batches_when_full():
+    batcher = MicroBatcher(lambda key, items: items, max_delay=60.0, max_batches=1)
+    try:
+        first = batcher.submit("a", 1)
+        joined = batcher.submit("a", 2)
+
+        with pytest.raises(QueueFullError):
+            batcher.submit("b", 3)
+        assert batcher.stats()["rejected"] == 1
+    finally:
+        batcher.close()
+
+    assert first.result() == 1
+    assert joined.result() == 2
+
+
+def test_isolated_service():
+    service = CalculationService(RESOURCES_DIR, max_delay=0.005, workers=1, isolated=True)
+
+    try:
+        response = service.difficulty({"beatmap_id": 5438072, "mods": ["DT"]})
+        assert response["attributes"]["star_rating"] > 0
+
+        stats = service.stats()
+        assert stats["isolation"]["jobs"] == 1
+        assert stats["cache"]["misses"] == 0
+    finally:
+        service.close()
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import pickle
+import sys
+from multiprocessing import resource_tracker
+from pathlib import Path
+
+import pytest
+
+from osu_native_py import shared
+from osu_native_py.shared import ResultRing
+from osu_native_py.shared import SharedRecords
+from osu_native_py.shared import calculate_into_slot
+from osu_native_py.shared import result_dtype
+from osu_native_py.shared import share_scores
+from osu_native_py.wrapper.attributes import OsuPerformanceAttributes
+from osu_native_py.wrapper.calculators import create_difficulty_calculator
+from osu_native_py.wrapper.calculators import create_performance_calculator
+from osu_native_py.wrapper.objects import Beatmap
+from osu_native_py.wrapper.objects import ModsCollection
+from osu_native_py.wrapper.objects import Ruleset
+from osu_native_py.wrapper.objects import ScoreInfo
+
+np = pytest.importorskip("numpy")
+
+TEST_DIR = Path(__file__).parent
+
+
+def _fill_slot(slot, count):
+    with SharedRecords.attach(slot.records) as records:
+        view = records.array[slot.start : slot.start + count]
+        view["total"] = np.arange(count, dtype=np.float64) + 100 * slot.number
+        view["speedDeviation"]["hasValue"] = True
+        view["speedDeviation"]["value"] = 7.0
+        del view
+    return count
+
+
+def test_share_scores_defaults_and_legacy():
+    columns = {
+        "accuracy": np.array([0.9, 0.95, 1.0]),
+        "count_miss": 1,
+        "legacy_total_score": np.array([-1, 5000, np.nan]),
+    }
+
+    with share_scores(columns) as scores:
+        assert len(scores) == 3
+        assert scores.array["accuracy"].tolist() == [0.9, 0.95, 1.0]
+        assert scores.array["count_miss"].tolist() == [1, 1, 1]
+        assert scores.array["max_combo"].tolist() == [ScoreInfo().max_combo] * 3
+        assert scores.array["legacy_total_score"].tolist() == [-1, 5000, -1]
+
+        handle = pickle.loads(pickle.dumps(scores.handle))
+        with SharedRecords.attach(handle) as attached:
+            assert attached.array["accuracy"].tolist() == [0.9, 0.95, 1.0]
+
+    with pytest.raises(ValueError, match="Unknown score columns"):
+        share_scores({"accuracy": 1.0, "pp": 1.0})
+
+
+def test_share_scores_closes_block_on_error(monkeypatch):
+    created = []
+    create = SharedRecords.create
+
+    def record(dtype, capacity):
+        block = create(dtype, capacity)
+        created.append(block)
+        return block
+
+    monkeypatch.setattr(SharedRecords, "create", record)
+    with pytest.raises(ValueError):
+        share_scores({"accuracy": np.ones(3), "count_miss": np.ones(2)})
+
+    assert len(created) == 1
+    assert created[0]._memory is None
+
+
+@pytest.mark.skipif(
+    sys.version_info >= (3, 13) or os.name != "posix",
+    reason="attaching only registers segments with the resource tracker before 3.13 on POSIX",
+)
+def test_attach_unregisters_only_with_another_tracker(monkeypatch):
+    unregistered = []
+    monkeypatch.setattr(
+        resource_tracker, "unregister", lambda name, rtype: unregistered.append(name)
+    )
+
+    with share_scores({"accuracy": np.ones(2)}) as scores:
+        handle = scores.handle
+        assert handle.tracker == shared._tracker_id()
+
+        # Forked and spawned workers share this tracker, so their registration is ours.
+        with SharedRecords.attach(handle):
+            pass
+        assert unregistered == []
+
+        with SharedRecords.attach(handle._replace(tracker=(-1, -1))):
+            pass
+        assert len(unregistered) == 1
+
+
+def test_ring_slots():
+    with ResultRing(OsuPerformanceAttributes, slots=2, slot_capacity=4) as ring:
+        first = ring.acquire()
+        second = ring.acquire()
+        assert ring.free_slots == 0
+        assert first.start == 0 and second.start == 4
+
+        with pytest.raises(RuntimeError, match="in use"):
+            ring.acquire()
+
+        ring.release(first)
+        with pytest.raises(ValueError):
+            ring.release(first)
+        assert ring.acquire().number == first.number
+
+
+def test_ring_written_by_other_processes():
+    context = multiprocessing.get_context("spawn")
+
+    with ResultRing(OsuPerformanceAttributes, slots=3, slot_capacity=5) as ring:
+        slots = [ring.acquire() for _ in range(3)]
+        with context.Pool(2) as pool:
+            counts = pool.starmap(_fill_slot, [(slot, 5 - slot.number) for slot in slots])
+
+        for slot, count in zip(slots, counts):
+            view = ring.view(slot, count)
+            assert view.dtype == result_dtype(OsuPerformanceAttributes)
+            assert view["total"].tolist() == [100.0 * slot.number + i for i in range(count)]
+            del view
+
+            columns = ring.columns(slot, count)
+            assert columns["speed_deviation"].tolist() == [7.0] * count
+            assert np.isnan(columns["score_based_estimated_miss_count"]).all()
+
+
+def test_calculate_into_slot_matches_calculate_columns():
+    ruleset = Ruleset.from_id(0)
+    beatmap = Beatmap.from_file(str(TEST_DIR / "resources/5438072.osu"))
+    mods = ModsCollection.create()
+    diff_attrs = create_difficulty_calculator(ruleset, beatmap).calculate(mods)
+    perf_calc = create_performance_calculator(ruleset)
+
+    columns = {
+        "accuracy": np.linspace(0.9, 1.0, 6),
+        "count_miss": np.array([0, 1, 2, 0, 1, 0]),
+        "max_combo": diff_attrs.max_combo,
+    }
+    expected = perf_calc.calculate_columns(ruleset, beatmap, mods, columns, diff_attrs)
+
+    with share_scores(columns) as scores, ResultRing(OsuPerformanceAttributes, 2, 8) as ring:
+        slot = ring.acquire()
+        count = calculate_into_slot(
+            perf_calc, ruleset, beatmap, mods, scores.array, diff_attrs, slot
+        )
+        assert count == 6
+
+        actual = ring.columns(slot, count)
+        for name, column in expected.items():
+            np.testing.assert_allclose(actual[name], column, equal_nan=True)
+
+        with pytest.raises(ValueError, match="do not fit"):
+            calculate_into_slot(
+                perf_calc,
+                ruleset,
+                beatmap,
+                mods,
+                {"accuracy": np.ones(9)},
+                diff_attrs,
+                slot,
+            )
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import copy
+import copyreg
+import dataclasses
+import pickle
+import tracemalloc
+import weakref
+
+import pytest
+
+from osu_native_py.wrapper.attributes import OsuDifficultyAttributes
+from osu_native_py.wrapper.attributes import TaikoPerformanceAttributes
+from osu_native_py.wrapper.objects import ScoreInfo
+from osu_native_py.wrapper.slots import slotted_dataclass
+
+
+@slotted_dataclass(frozen=True)
+class FrozenPoint:
+    x: int
+    y: int = 0
+
+
+def _osu_difficulty(*values):
+    names = [field.name for field in dataclasses.fields(OsuDifficultyAttributes)]
+    return dict(zip(names, values))
+
+
+@pytest.mark.parametrize(
+    "instance",
+    [
+        ScoreInfo(accuracy=0.98, max_combo=100, legacy_total_score=123456),
+        TaikoPerformanceAttributes(
+            total=100.0, difficulty=50.0, accuracy=40.0, estimated_unstable_rate=None
+        ),
+        OsuDifficultyAttributes(**_osu_difficulty(*range(20))),
+    ],
+)
+def test_slotted_attributes_stay_compatible(instance):
+    assert not hasattr(instance, "__dict__")
+    assert dataclasses.is_dataclass(instance) and not isinstance(instance, type)
+    assert dataclasses.asdict(instance) == {
+        field.name: getattr(instance, field.name) for field in dataclasses.fields(instance)
+    }
+
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        assert pickle.loads(pickle.dumps(instance, protocol)) == instance
+
+    assert copy.deepcopy(instance) == instance
+    assert weakref.ref(instance)() is instance
+
+    with pytest.raises(AttributeError):
+        setattr(instance, "not_a_field", 1)
+
+
+@pytest.mark.parametrize("wrap", [lambda state: state, lambda state: (None, state)])
+def test_slotted_attributes_load_old_pickles(monkeypatch, wrap):
+    # Before the classes were slotted, pickles held the instance __dict__, or on
+    # some versions the (__dict__, slots) pair.
+    def old_reduce_ex(self, protocol):
+        state = wrap(dataclasses.asdict(self))
+        return copyreg.__newobj__, (type(self),), state  # type: ignore[attr-defined]
+
+    score = ScoreInfo(accuracy=0.98, max_combo=100, count_miss=2)
+    point = FrozenPoint(1, 2)
+    monkeypatch.setattr(ScoreInfo, "__reduce_ex__", old_reduce_ex)
+    monkeypatch.setattr(FrozenPoint, "__reduce_ex__", old_reduce_ex)
+    data = [pickle.dumps(score, protocol) for protocol in range(2, pickle.HIGHEST_PROTOCOL + 1)]
+    point_data = pickle.dumps(point)
+    monkeypatch.undo()
+
+    assert all(pickle.loads(item) == score for item in data)
+    assert pickle.loads(point_data) == point
+
+
+def test_score_info_defaults_and_replace():
+    score = ScoreInfo()
+    assert score.accuracy == 1.0
+    assert score.legacy_total_score is None
+
+    score.count_miss = 2
+    assert dataclasses.replace(score, max_combo=50) == ScoreInfo(count_miss=2, max_combo=50)
+
+
+def test_frozen_slotted_dataclass():
+    point = FrozenPoint(1)
+    assert pickle.loads(pickle.dumps(point, 0)) == point
+    assert hash(point) == hash(FrozenPoint(1, 0))
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        setattr(point, "x", 2)
+
+
+def test_slotted_attributes_use_less_memory():
+    plain_type = dataclasses.make_dataclass(
+        "PlainOsuDifficultyAttributes",
+        [(field.name, field.type) for field in dataclasses.fields(OsuDifficultyAttributes)],
+    )
+    values = [float(i) for i in range(20)]
+    count = 10000
+
+    def measure(cls):
+        tracemalloc.start()
+        try:
+            instances = [cls(*values) for _ in range(count)]
+            return tracemalloc.get_traced_memory()[0] / len(instances)
+        finally:
+            tracemalloc.stop()
+
+    plain = measure(plain_type)
+    slotted = measure(OsuDifficultyAttributes)
+
+    # The margin varies by version: Python 3.13 already shrinks plain instance dicts.
+    assert slotted < plain
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List
+
+from osu_native_py.wrapper.calculators import create_difficulty_calculator
+from osu_native_py.wrapper.calculators import create_performance_calculator
+from osu_native_py.wrapper.objects import Beatmap
+from osu_native_py.wrapper.objects import Mod
+from osu_native_py.wrapper.objects import ModsCollection
+from osu_native_py.wrapper.objects import Ruleset
+from osu_native_py.wrapper.objects import ScoreInfo
+from osu_native_py.wrapper.utils import slow_log
+
+TEST_DIR = Path(__file__).parent
+BEATMAP_PATH = TEST_DIR / "resources/5438072.osu"
+
+
+def test_slow_log_records_context():
+    calls: List[slow_log.SlowCall] = []
+    log = slow_log.enable(threshold=0.0, top_n=1, callback=calls.append, log=None)
+
+    try:
+        beatmap = Beatmap.from_file(str(BEATMAP_PATH))
+        ruleset = Ruleset.from_id(0)
+        mods = ModsCollection.create()
+        mods.add(Mod.create("HD"))
+        mods.add(Mod.create("DT"))
+
+        diff_attrs = create_difficulty_calculator(ruleset, beatmap).calculate(mods)
+        create_performance_calculator(ruleset).calculate(
+            ruleset,
+            beatmap,
+            mods,
+            ScoreInfo(accuracy=1.0, max_combo=183, count_great=140),
+            diff_attrs,
+        )
+    finally:
+        slow_log.disable()
+
+    assert [call.kind for call in calls] == ["difficulty", "performance"]
+
+    call = calls[0]
+    assert call.beatmap_id == 5438072
+    assert call.title == "Erika - I Don't Know (Nightcore & Cut Ver.) [Do You Know?]"
+    assert call.ruleset == "osu"
+    assert call.mods == ("HD", "DT")
+    assert call.object_counts["max_combo"] == 183
+    assert call.duration >= 0.0
+    assert len(calls[1].worst) == 1
+
+    assert len(log.worst()) == 1
+    assert slow_log.active_log() is None
+
+
+def test_slow_log_threshold():
+    log = slow_log.SlowCallLog(threshold=10.0, log=None)
+    assert log.observe("difficulty", 0.5, None, None, None, None) is None
+    assert log.worst() == []
+
+
+def test_slow_log_keeps_kinds_apart():
+    log = slow_log.SlowCallLog(threshold=0.0, log=None)
+    log.observe("difficulty", 2.0, None, None, None, None)
+    log.observe("performance", 1.0, None, None, None, None)
+
+    assert [call.kind for call in log.worst()] == ["difficulty", "performance"]
+
+
+def test_slow_log_callback_errors_are_contained():
+    def callback(call):
+        raise ValueError("broken callback")
+
+    log = slow_log.SlowCallLog(threshold=0.0, callback=callback, log=None)
+    assert log.observe("difficulty", 1.0, None, None, None, None) is not None
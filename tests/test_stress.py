@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from osu_native_py.stress import WORKLOADS
+from osu_native_py.stress import live_handles
+from osu_native_py.stress import rss
+from osu_native_py.stress import stress
+from osu_native_py.wrapper.objects import Beatmap
+from osu_native_py.wrapper.objects import Mod
+
+TEST_DIR = Path(__file__).parent
+RESOURCES_DIR = TEST_DIR / "resources"
+
+BEATMAP_TEXT = (RESOURCES_DIR / "5438072.osu").read_text(encoding="utf-8-sig")
+
+
+@pytest.mark.parametrize("workload", list(WORKLOADS))
+def test_workload_releases_every_handle(workload):
+    report = stress(BEATMAP_TEXT, cycles=40, threads=4, workloads=[workload], warmup=5)
+
+    assert report.ok, report.failures()
+    assert report.cycles == 40
+    assert report.leaked == {}
+
+
+def test_stress_across_processes():
+    report = stress(BEATMAP_TEXT, cycles=40, threads=2, processes=2, warmup=5)
+
+    assert report.ok, report.failures()
+    assert report.cycles == 40
+
+
+def test_report_detects_leaks(monkeypatch):
+    leaked = Beatmap.from_text(BEATMAP_TEXT)
+    try:
+        assert live_handles()["Beatmap"] >= 1
+    finally:
+        leaked.close()
+
+    kept = []
+    monkeypatch.setitem(WORKLOADS, "leak", lambda workload: kept.append(Mod.create("HD")))
+    try:
+        report = stress(BEATMAP_TEXT, cycles=6, threads=2, workloads=["leak"], warmup=0)
+    finally:
+        for mod in kept:
+            mod.close()
+
+    assert not report.ok
+    assert report.errors == 0
+    assert report.leaked == {"Mod": 6}
+    assert any("Mod" in failure for failure in report.failures())
+
+
+def test_report_detects_errors():
+    report = stress(BEATMAP_TEXT, cycles=8, threads=2, workloads=["mods"], acronyms=["NOPE"])
+    assert not report.ok
+    assert report.errors >= 8
+    assert "NOPE" in report.error_samples[0]
+    assert report.failures()
+
+
+def test_rss_is_measured():
+    value = rss()
+    assert value is None or value > 0
+
+
+def test_unknown_workload():
+    with pytest.raises(ValueError):
+        stress(BEATMAP_TEXT, workloads=["nope"])
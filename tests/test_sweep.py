@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from osu_native_py.sweep import DEFAULT_RATES
+from osu_native_py.sweep import ModsCache
+from osu_native_py.sweep import sweep
+from osu_native_py.wrapper.calculators import create_difficulty_calculator
+from osu_native_py.wrapper.objects import Beatmap
+from osu_native_py.wrapper.objects import Ruleset
+
+TEST_DIR = Path(__file__).parent
+BEATMAP_PATH = TEST_DIR / "resources/5438072.osu"
+
+
+def test_default_rates():
+    assert DEFAULT_RATES[0] == 0.5
+    assert DEFAULT_RATES[-1] == 2.0
+    assert len(DEFAULT_RATES) == 31
+
+
+def test_sweep_grid():
+    with Ruleset.from_id(0) as ruleset, Beatmap.from_file(str(BEATMAP_PATH)) as beatmap:
+        result = sweep(
+            beatmap,
+            ruleset,
+            ["HD"],
+            rates=[0.75, 1.0, 1.5],
+            da_overrides={"approach_rate": [9.0, 10.0]},
+            accuracies=[0.98, 1.0],
+        )
+
+        with ModsCache() as cache:
+            mods = cache.get(["HD"])
+            unmodded = create_difficulty_calculator(ruleset, beatmap).calculate(mods)
+
+    assert result["rate"] == [0.75] * 4 + [1.0] * 4 + [1.5] * 4
+    assert result["approach_rate"] == [9.0, 9.0, 10.0, 10.0] * 3
+    assert result["accuracy"] == [0.98, 1.0] * 6
+    assert all(len(column) == 12 for column in result.values())
+
+    stars = result["star_rating"]
+    assert stars[0] < stars[4] < stars[8]
+    assert result["pp"][0] < result["pp"][1]
+    assert result["star_rating"][4] == pytest.approx(unmodded.star_rating)
+
+
+def test_mods_cache_reuses_and_evicts():
+    with ModsCache(capacity=2) as cache:
+        first = cache.get(["hd"], 1.5)
+        assert cache.get(["HD"], 1.5) is first
+        assert first.acronyms == ["HD", "DT"]
+
+        cache.get([], 0.75, (("approach_rate", 9.0),))
+        assert cache.get([], 0.75, (("approach_rate", 9.0),)).acronyms == ["HT", "DA"]
+
+        cache.get([], 1.25)
+        assert first.is_closed
+        assert len(cache) == 2
+
+
+def test_sweep_errors():
+    with Ruleset.from_id(0) as ruleset, Beatmap.from_file(str(BEATMAP_PATH)) as beatmap:
+        with pytest.raises(ValueError, match="rate mod"):
+            sweep(beatmap, ruleset, ["DT"], rates=[1.0, 1.5])
+
+        with pytest.raises(ValueError, match="Unknown Difficulty Adjust"):
+            sweep(beatmap, ruleset, da_overrides={"bpm": [200.0]})
+
+
+def test_sweep_across_processes():
+    rates = [0.8, 1.0, 1.2, 1.4]
+    overrides = {"overall_difficulty": [8.0, 9.0]}
+
+    with Ruleset.from_id(0) as ruleset, Beatmap.from_file(str(BEATMAP_PATH)) as beatmap:
+        assert sweep(beatmap, ruleset, rates=rates, da_overrides=overrides, processes=2) == sweep(
+            beatmap, ruleset, rates=rates, da_overrides=overrides
+        )
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import random
+from typing import Dict
+
+import pytest
+
+from osu_native_py.totals import ProfileTotals
+from osu_native_py.totals import TopPlays
+from osu_native_py.totals import bonus_pp
+from osu_native_py.totals import weighted_total
+
+
+def test_top_plays_matches_full_resum():
+    rng = random.Random(1234)
+    plays = TopPlays(limit=50)
+    expected: Dict[int, float] = {}
+
+    for _ in range(2000):
+        key = rng.randrange(300)
+        if key in expected and rng.random() < 0.2:
+            del expected[key]
+            total = plays.remove(key)
+        else:
+            expected[key] = round(rng.uniform(0, 800), 2)
+            total = plays.add(key, expected[key])
+
+        assert total == pytest.approx(
+            weighted_total(expected.values(), limit=50) + bonus_pp(len(expected)),
+        )
+
+    assert len(plays) == len(expected)
+    assert [pp for _, pp in plays.top(10)] == sorted(expected.values(), reverse=True)[:10]
+
+
+def test_top_plays_from_arrays():
+    pp = [100.0, 300.0, 200.0, 300.0, 50.0]
+    keys = [1, 2, 3, 4, 1]
+
+    plays = TopPlays.from_arrays(keys, pp, bonus=False)
+
+    assert plays.get(1) == 50.0
+    assert list(plays) == [2, 4, 3, 1]
+    assert plays.total == pytest.approx(300 + 300 * 0.95 + 200 * 0.95**2 + 50 * 0.95**3)
+
+    plays.add(5, 250.0)
+    assert plays.top(3) == [(2, 300.0), (4, 300.0), (5, 250.0)]
+    assert plays.total == pytest.approx(weighted_total([300, 300, 250, 200, 50]))
+
+    with pytest.raises(ValueError):
+        TopPlays.from_arrays([1], [1.0, 2.0])
+
+
+def test_profile_totals():
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(5)
+    user_ids = rng.integers(0, 20, 5000)
+    beatmap_ids = np.arange(5000)
+    pp = rng.uniform(0, 500, 5000)
+
+    totals = ProfileTotals.from_arrays(user_ids, beatmap_ids, pp)
+
+    for user_id in range(20):
+        user_pp = pp[user_ids == user_id]
+        assert totals.total(user_id) == pytest.approx(
+            weighted_total(user_pp) + bonus_pp(len(user_pp)),
+        )
+
+    best_key, best_pp = totals.player(0).top(1)[0]
+    user_pp = pp[user_ids == 0]
+    user_pp[user_pp.argmax()] = best_pp / 2
+
+    new_total = totals.add(0, best_key, best_pp / 2)
+    assert new_total == pytest.approx(weighted_total(user_pp) + bonus_pp(len(user_pp)))
+    assert totals.total(0) == new_total
+    assert totals.total(999) == 0.0
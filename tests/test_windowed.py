@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from osu_native_py.wrapper.attributes import WindowedDifficulty
+from osu_native_py.wrapper.calculators import create_difficulty_calculator
+from osu_native_py.wrapper.objects import Beatmap
+from osu_native_py.wrapper.objects import ModsCollection
+from osu_native_py.wrapper.objects import Ruleset
+from osu_native_py.wrapper.utils.osu_text import HitObjectText
+
+TEST_DIR = Path(__file__).parent
+RESOURCES_DIR = TEST_DIR / "resources"
+
+
+def test_hit_object_text():
+    text = (RESOURCES_DIR / "5438072.osu").read_text(encoding="utf-8-sig")
+    hit_objects = HitObjectText.parse(text)
+
+    assert hit_objects.head.endswith("[HitObjects]")
+    assert hit_objects.times == sorted(hit_objects.times)
+    assert hit_objects.times[0] == 11403
+    assert hit_objects.index_at(hit_objects.times[0]) == 0
+    assert hit_objects.index_at(hit_objects.times[-1] + 1) == len(hit_objects)
+
+    partial = HitObjectText.parse(hit_objects.text(0, 10))
+    assert partial.lines == hit_objects.lines[:10]
+    assert partial.head == hit_objects.head
+
+    with pytest.raises(ValueError):
+        HitObjectText.parse("osu file format v14\n[General]\n")
+
+
+@pytest.mark.parametrize(
+    "ruleset_id,file_name,skills",
+    [
+        (0, "5438072.osu", {"aim_difficulty", "speed_difficulty", "flashlight_difficulty"}),
+        (1, "221923.osu", {"colour_difficulty", "rhythm_difficulty", "stamina_difficulty"}),
+        (3, "5107047.osu", {"star_rating"}),
+    ],
+)
+def test_windowed_difficulty(ruleset_id, file_name, skills):
+    with Ruleset.from_id(ruleset_id) as ruleset, Beatmap.from_file(
+        str(RESOURCES_DIR / file_name)
+    ) as beatmap, ModsCollection.create() as mods:
+        calculator = create_difficulty_calculator(ruleset, beatmap)
+        windowed = calculator.windowed_difficulty(mods, section_length=2000.0, window=4000.0)
+        hit_objects = HitObjectText.parse(beatmap.text())
+
+    assert isinstance(windowed, WindowedDifficulty)
+    assert skills <= set(windowed.skills)
+    assert len(windowed) > 1
+    assert windowed.times[0] == hit_objects.times[0] + 2000.0
+    assert windowed.times[-1] > hit_objects.times[-1]
+    assert all(len(values) == len(windowed) for values in windowed.skills.values())
+    assert max(windowed.skills["star_rating"]) > 0
+
+    data = windowed.to_dict()
+    assert data["time"] == windowed.times.tolist()
+
+
+def test_windowed_difficulty_requires_beatmap():
+    with Ruleset.from_id(0) as ruleset, Beatmap.from_file(
+        str(RESOURCES_DIR / "5438072.osu")
+    ) as beatmap, ModsCollection.create() as mods:
+        calculator = create_difficulty_calculator(ruleset, beatmap)
+        with pytest.raises(ValueError):
+            calculator.windowed_difficulty(mods, section_length=0)
+
+        calculator._beatmap = None
+        with pytest.raises(RuntimeError):
+            calculator.windowed_difficulty(mods)
@@ -1,9 +1,19 @@
 from __future__ import annotations
 
+import pickle
+from pathlib import Path
+
+import pytest
+
 from osu_native_py.wrapper.objects import Beatmap
+from osu_native_py.wrapper.objects import BeatmapMetadata
 from osu_native_py.wrapper.objects import Mod
 from osu_native_py.wrapper.objects import ModsCollection
 from osu_native_py.wrapper.objects import Ruleset
+from osu_native_py.wrapper.objects.error_code import ErrorCode
+from osu_native_py.wrapper.utils.native_helper import NativeHelper
+
+TEST_DIR = Path(__file__).parent
 
 
 def test_ruleset():
@@ -67,3 +77,94 @@ def test_beatmap_error_handling():
         assert False, "Expected an error when loading a nonexistent beatmap"
     except RuntimeError as e:
         assert "Failed to create beatmap" in str(e)
+
+
+def test_beatmap_metadata():
+    with Beatmap.from_file(str(TEST_DIR / "resources/5438072.osu")) as beatmap:
+        metadata = beatmap.metadata()
+
+        assert isinstance(metadata, BeatmapMetadata)
+        assert beatmap.metadata() is metadata
+        assert metadata.title == beatmap.title == "I Don't Know (Nightcore & Cut Ver.)"
+        assert metadata.artist == "Erika"
+        assert metadata.version == "Do You Know?"
+        assert metadata.beatmap_id == beatmap.beatmap_id == 5438072
+        assert metadata.ruleset_id == 0
+        assert metadata.overall_difficulty == pytest.approx(beatmap.overall_difficulty)
+
+    with pytest.raises(AttributeError):
+        metadata.title = "changed"
+
+    assert not hasattr(metadata, "__dict__")
+    assert pickle.loads(pickle.dumps(metadata)) == metadata
+    assert metadata.to_dict()["artist"] == "Erika"
+
+
+def test_beatmap_pickle(tmp_path):
+    path = tmp_path / "5438072.osu"
+    path.write_bytes((TEST_DIR / "resources/5438072.osu").read_bytes())
+
+    with Beatmap.from_file(str(path)) as beatmap:
+        title = beatmap.title
+        checksum = beatmap.checksum()
+        data = pickle.dumps(beatmap)
+
+    restored = pickle.loads(data)
+    assert restored.checksum() == checksum
+    assert restored.title == title
+    assert restored._native is None
+
+    assert restored.beatmap_id == 5438072
+    assert restored._native is not None
+    restored.close()
+    assert restored.is_closed
+
+    stale = pickle.loads(data)
+    path.write_bytes(path.read_bytes() + b"\n")
+    with pytest.raises(RuntimeError, match="changed since the beatmap was loaded"):
+        stale.beatmap_id
+    stale.close()
+
+
+def test_beatmap_rejects_file_changed_after_load(tmp_path):
+    path = tmp_path / "5438072.osu"
+    path.write_bytes((TEST_DIR / "resources/5438072.osu").read_bytes())
+
+    with Beatmap.from_file(str(path)) as beatmap:
+        assert beatmap._checksum is None
+        path.write_bytes(path.read_bytes() + b"\n")
+
+        with pytest.raises(RuntimeError, match="changed since the beatmap was loaded"):
+            beatmap.checksum()
+        with pytest.raises(RuntimeError, match="changed since the beatmap was loaded"):
+            pickle.dumps(beatmap)
+
+    with Beatmap.from_file(str(path)) as beatmap:
+        checksum = beatmap.checksum()
+        path.write_bytes(path.read_bytes() + b"\n")
+        assert beatmap.checksum() == checksum
+
+
+def test_beatmap_pickle_from_text():
+    text = (TEST_DIR / "resources/5438072.osu").read_text(encoding="utf-8-sig")
+
+    with Beatmap.from_text(text) as beatmap:
+        restored = pickle.loads(pickle.dumps(beatmap))
+
+    with restored:
+        assert restored.beatmap_id == 5438072
+        assert restored.checksum() == beatmap.checksum()
+
+
+def test_get_string_stops_at_first_nul():
+    value = b"title\x00stale"
+
+    def getter(handle, buffer, size):
+        if buffer is None:
+            size._obj.value = len(value)
+            return ErrorCode.BUFFER_SIZE_QUERY
+        for i, byte in enumerate(value):
+            buffer[i] = byte
+        return ErrorCode.SUCCESS
+
+    assert NativeHelper.get_string(None, getter) == "title"